@@ -44,6 +44,7 @@ in data privacy practices."""
     contractual_risks = [
         {
             "title": "Unlimited Indemnification Liability",
+            "category": "Contracts",
             "severity": "Critical",
             "description": "Three major customer contracts contain unlimited indemnification clauses with no cap on liability.",
             "evidence": "Contracts DOC-101, DOC-103, DOC-105 - Section 8.2 in each",
@@ -52,6 +53,7 @@ in data privacy practices."""
         },
         {
             "title": "Weak IP Protection Clauses",
+            "category": "Contracts",
             "severity": "High",
             "description": "Customer agreements allow creation of derivative works without clear ownership provisions.",
             "evidence": "Master Services Agreement template - Section 6.4",
@@ -70,6 +72,7 @@ in data privacy practices."""
     regulatory_risks = [
         {
             "title": "GDPR Compliance Gaps",
+            "category": "Regulatory",
             "severity": "Critical",
             "description": "Data processing practices do not fully comply with GDPR requirements for EU customer data.",
             "evidence": "Privacy Policy DOC-203, Data Processing Addendum DOC-204",
@@ -85,17 +88,12 @@ in data privacy practices."""
     )
 
     # Add risk matrix summary
+    # Each risk already carries its category, so the matrix only needs a
+    # single pass to fill in the documents column
     all_risks = contractual_risks + regulatory_risks
-    generator.add_risk_matrix_table(
-        [
-            {
-                **risk,
-                "category": "Contracts" if risk in contractual_risks else "Regulatory",
-                "documents": "DOC-101, DOC-103",
-            }
-            for risk in all_risks
-        ]
-    )
+    for risk in all_risks:
+        risk.setdefault("documents", "DOC-101, DOC-103")
+    generator.add_risk_matrix_table(all_risks)
 
     # Save the document
     output_path = "./outputs/sample_legal_risk_report.docx"
@@ -165,8 +163,7 @@ def generate_sample_dashboard():
         },
     ]
 
-    for risk in risks:
-        generator.add_risk(risk)
+    generator.add_risks(risks)
 
     # Save the dashboard
     output_path = "./outputs/sample_risk_dashboard.html"
@@ -8,6 +8,7 @@ import os
 from pathlib import Path
 
 from lawdit.agents import create_legal_risk_agent, run_analysis
+from lawdit.agents._log import banner
 from lawdit.tools import initialize_document_store
 
 
@@ -22,25 +23,19 @@ def main():
     # Ensure directories exist
     Path(OUTPUT_DIR).mkdir(parents=True, exist_ok=True)
 
-    # Step 1: Initialize the document store
-    print("Step 1: Initializing document store...")
-    initialize_document_store(INDEX_PATH, WORKING_DIR)
-    print("✓ Document store initialized\n")
-
-    # Step 2: Load the data room index
-    print("Step 2: Loading data room index...")
     if not Path(INDEX_PATH).exists():
         print(f"Error: Index file not found at {INDEX_PATH}")
         print("Please run the indexer first: lawdit-index --credentials ... --folder-id ...")
         return
 
-    with open(INDEX_PATH, "r") as f:
-        data_room_index = f.read()
-
-    print(f"✓ Loaded index ({len(data_room_index)} characters)\n")
+    # Step 1: Initialize the document store and load the data room index
+    print("Step 1: Initializing document store...")
+    data_room_index = initialize_document_store(INDEX_PATH, WORKING_DIR)
+    print("✓ Document store initialized")
+    print(f"✓ Loaded index ({os.path.getsize(INDEX_PATH):,} bytes)\n")
 
-    # Step 3: Create the legal risk analysis agent
-    print("Step 3: Creating legal risk analysis agent...")
+    # Step 2: Create the legal risk analysis agent
+    print("Step 2: Creating legal risk analysis agent...")
     try:
         agent = create_legal_risk_agent(use_deep_agents=True)
         print("✓ Agent system created\n")
@@ -49,8 +44,8 @@ def main():
         print("Deep Agents framework not available. Please install it.")
         return
 
-    # Step 4: Run the analysis
-    print("Step 4: Running legal risk analysis...")
+    # Step 3: Run the analysis
+    print("Step 3: Running legal risk analysis...")
     print("This may take several minutes depending on the size of the data room...")
     print("-" * 70)
 
@@ -64,11 +59,7 @@ def main():
             output_dir=OUTPUT_DIR,
         )
 
-        print("\n" + "=" * 70)
-        print("ANALYSIS COMPLETE")
-        print("=" * 70)
-        print("\nResults:")
-        print(result)
+        banner("ANALYSIS COMPLETE", ["Results:", str(result)], leading_blank=True)
 
     except Exception as e:
         print(f"\nError during analysis: {e}")
@@ -4,13 +4,20 @@ Lawdit - Legal Due Diligence Intelligence Tool
 A comprehensive AI-powered legal risk analysis system for due diligence.
 """
 
+import importlib
+from typing import Any
+
 __version__ = "0.1.0"
 __author__ = "Lawdit Team"
 
-from lawdit.indexer.data_room_indexer import DataRoomIndexer
-from lawdit.indexer.google_drive_client import GoogleDriveClient
-from lawdit.indexer.pdf_processor import PDFProcessor
-from lawdit.indexer.vision_summarizer import VisionSummarizer
+# The indexer classes pull in the Google API client, pdf2image and the OpenAI
+# SDK, so they are only imported when first accessed (PEP 562).
+_LAZY_EXPORTS = {
+    "DataRoomIndexer": "lawdit.indexer.data_room_indexer",
+    "GoogleDriveClient": "lawdit.indexer.google_drive_client",
+    "PDFProcessor": "lawdit.indexer.pdf_processor",
+    "VisionSummarizer": "lawdit.indexer.vision_summarizer",
+}
 
 __all__ = [
     "DataRoomIndexer",
@@ -18,3 +25,17 @@ __all__ = [
     "PDFProcessor",
     "VisionSummarizer",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import the indexer classes on first access."""
+    if name in _LAZY_EXPORTS:
+        obj = getattr(importlib.import_module(_LAZY_EXPORTS[name]), name)
+        globals()[name] = obj
+        return obj
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list:
+    """Include the lazily imported names in ``dir(lawdit)``."""
+    return sorted(list(globals()) + __all__)
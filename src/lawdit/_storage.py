@@ -0,0 +1,28 @@
+"""
+Data Room Storage Layout
+
+File names and encoding shared by the indexer, which writes the processed
+data room, and the document tools, which read it. Kept free of third-party
+imports so the tools can be loaded without the indexer's dependencies.
+
+Page images are base64-encoded once per page at indexing time and again for
+every vision request. pybase64 encodes with SIMD instructions and produces
+the same output as the standard library, so it is used when installed.
+"""
+
+try:
+    from pybase64 import b64encode
+except ImportError:
+    from base64 import b64encode
+
+# All document records of the last build, one JSON object per line, written
+# next to the per-document directories so every record loads with one read
+RECORDS_INDEX_NAME = "index.jsonl"
+
+# Base64 encodings of a document's pages, concatenated, and the JSON index of
+# page number -> [offset, length] into that blob. Written next to the page
+# images so the document tools can serve encoded pages without re-encoding.
+PAGES_B64_BLOB = "pages.b64"
+PAGES_B64_INDEX = "pages_b64_index.json"
+
+__all__ = ["PAGES_B64_BLOB", "PAGES_B64_INDEX", "RECORDS_INDEX_NAME", "b64encode"]
@@ -0,0 +1,35 @@
+"""
+Console Output Helpers
+
+Shared helpers for the status banners printed by the analysis entry points.
+"""
+
+import sys
+from typing import Iterable
+
+BANNER_WIDTH = 70
+
+
+def banner(title: str, lines: Iterable[str] = (), leading_blank: bool = False) -> None:
+    """Write a framed status banner to stdout in a single write.
+
+    The banner is assembled into one string and flushed once, rather than
+    issuing a separate ``print`` (and stdout lock/flush) per line.
+
+    Args:
+        title: Banner heading, framed by ``=`` rules
+        lines: Optional lines printed after a blank line below the heading
+        leading_blank: Whether to emit a blank line before the banner
+    """
+    rule = "=" * BANNER_WIDTH
+    parts = [rule, title, rule]
+    if leading_blank:
+        parts.insert(0, "")
+
+    lines = list(lines)
+    if lines:
+        parts.append("")
+        parts.extend(lines)
+
+    sys.stdout.write("\n".join(parts) + "\n\n")
+    sys.stdout.flush()
@@ -5,20 +5,16 @@ Command-line interface for running legal risk analysis.
 """
 
 import argparse
+import functools
 import os
 import sys
 from pathlib import Path
 
 from lawdit.agents import create_legal_risk_agent, run_analysis
+from lawdit.agents._log import banner
 from lawdit.tools import initialize_document_store
 
-
-def main():
-    """Main entry point for the analysis CLI."""
-    parser = argparse.ArgumentParser(
-        description="Run legal risk analysis on a data room index",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+_EPILOG = """
 Examples:
   # Run full analysis
   lawdit-analyze --index ./data_room_index.txt
@@ -31,7 +27,19 @@ Examples:
 
   # Specify working directory
   lawdit-analyze --index ./index.txt --working-dir ./data_room
-        """,
+        """
+
+
+@functools.lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the analysis CLI.
+
+    The parser is deterministic, so it is built once per process.
+    """
+    parser = argparse.ArgumentParser(
+        description="Run legal risk analysis on a data room index",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=_EPILOG,
     )
 
     parser.add_argument(
@@ -70,7 +78,12 @@ Examples:
         help="Use simplified agent system (if Deep Agents not available)",
     )
 
-    args = parser.parse_args()
+    return parser
+
+
+def main():
+    """Main entry point for the analysis CLI."""
+    args = _build_parser().parse_args()
 
     # Validate index file exists
     if not os.path.exists(args.index):
@@ -86,29 +99,25 @@ Examples:
     # Ensure output directory exists
     Path(args.output_dir).mkdir(parents=True, exist_ok=True)
 
-    print("=" * 70)
-    print("LAWDIT LEGAL RISK ANALYSIS")
-    print("=" * 70)
-    print(f"\nIndex file: {args.index}")
-    print(f"Working directory: {args.working_dir}")
-    print(f"Output directory: {args.output_dir}")
-    print(f"Focus areas: {', '.join(args.focus)}")
-    print()
+    banner(
+        "LAWDIT LEGAL RISK ANALYSIS",
+        [
+            f"Index file: {args.index}",
+            f"Working directory: {args.working_dir}",
+            f"Output directory: {args.output_dir}",
+            f"Focus areas: {', '.join(args.focus)}",
+        ],
+    )
 
     try:
-        # Step 1: Initialize document store
+        # Step 1: Initialize document store and load the data room index
         print("Step 1: Initializing document store...")
-        initialize_document_store(args.index, args.working_dir)
-        print("✓ Document store initialized\n")
+        data_room_index = initialize_document_store(args.index, args.working_dir)
+        print("✓ Document store initialized")
+        print(f"✓ Loaded index ({os.path.getsize(args.index):,} bytes)\n")
 
-        # Step 2: Load data room index
-        print("Step 2: Loading data room index...")
-        with open(args.index, "r") as f:
-            data_room_index = f.read()
-        print(f"✓ Loaded index ({len(data_room_index)} characters)\n")
-
-        # Step 3: Create agent system
-        print("Step 3: Creating legal risk analysis agent...")
+        # Step 2: Create agent system
+        print("Step 2: Creating legal risk analysis agent...")
         use_deep_agents = not args.no_deep_agents
         try:
             agent = create_legal_risk_agent(use_deep_agents=use_deep_agents)
@@ -120,8 +129,8 @@ Examples:
             print("\nFalling back to simplified analysis...")
             return 1
 
-        # Step 4: Run analysis
-        print("Step 4: Running legal risk analysis...")
+        # Step 3: Run analysis
+        print("Step 3: Running legal risk analysis...")
         print("This may take several minutes depending on the size of the data room...")
         print("-" * 70)
 
@@ -134,13 +143,15 @@ Examples:
             output_dir=args.output_dir,
         )
 
-        print("\n" + "=" * 70)
-        print("ANALYSIS COMPLETE")
-        print("=" * 70)
-        print("\nCheck the output directory for deliverables:")
-        print(f"  - Word Report: {args.output_dir}/legal_risk_analysis_report.docx")
-        print(f"  - HTML Dashboard: {args.output_dir}/risk_dashboard.html")
-        print()
+        banner(
+            "ANALYSIS COMPLETE",
+            [
+                "Check the output directory for deliverables:",
+                f"  - Word Report: {args.output_dir}/legal_risk_analysis_report.docx",
+                f"  - HTML Dashboard: {args.output_dir}/risk_dashboard.html",
+            ],
+            leading_blank=True,
+        )
 
         return 0
 
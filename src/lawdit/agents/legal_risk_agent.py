@@ -13,25 +13,17 @@ from lawdit.agents.prompts import (
 )
 from lawdit.tools.document_tools import get_document, get_document_pages, internet_search, web_fetch
 
-
 # ==============================================================================
 # SUBAGENT CONFIGURATIONS
 # ==============================================================================
 
+# Subagent configurations are static, so they are built once at import time.
+# The factories below hand out shallow copies (with their own tools list) so
+# callers can adjust a configuration without affecting later agents.
 
-def create_document_analyst_subagent() -> Dict[str, Any]:
-    """Create the document analyst subagent configuration.
-
-    This subagent specializes in detailed document retrieval and legal risk analysis.
-    It has access to tools for retrieving documents and pages, and can research
-    legal standards and precedents.
-
-    Returns:
-        Subagent configuration dictionary
-    """
-    return {
-        "name": "document-analyst",
-        "description": """Specialized subagent for detailed document retrieval and legal risk analysis.
+_DOCUMENT_ANALYST_SUBAGENT: Dict[str, Any] = {
+    "name": "document-analyst",
+    "description": """Specialized subagent for detailed document retrieval and legal risk analysis.
 
 Use this subagent when you need to:
 - Retrieve and analyze specific documents from the data room
@@ -42,10 +34,37 @@ Use this subagent when you need to:
 
 This subagent has access to data room retrieval tools and can conduct
 thorough document-by-document analysis without cluttering your context.""",
-        "system_prompt": DOCUMENT_ANALYST_PROMPT,
-        "tools": [get_document, get_document_pages, internet_search, web_fetch],
-        "model": "claude-sonnet-4-5-20250929",
-    }
+    "system_prompt": DOCUMENT_ANALYST_PROMPT,
+    "tools": [get_document, get_document_pages, internet_search, web_fetch],
+    "model": "claude-sonnet-4-5-20250929",
+}
+
+_DELIVERABLE_CREATOR_SUBAGENT: Dict[str, Any] = {
+    "name": "deliverable-creator",
+    "description": """Specialized subagent for creating polished legal deliverables from analysis findings.
+
+Use this subagent when you need to transform synthesized legal risk analysis into professional deliverables including Word documents and interactive web dashboards.
+
+This subagent specializes in document formatting, visual presentation, and creating user-friendly interfaces for complex legal information. It has access to the filesystem to read synthesis files and detailed findings, and it knows how to create properly structured Word documents and interactive React dashboards.
+
+Delegate to this subagent after you have completed your synthesis of all findings and saved your comprehensive risk assessment to the filesystem. The subagent will handle all the technical work of creating professional deliverables.""",
+    "system_prompt": DELIVERABLE_CREATOR_PROMPT,
+    "tools": [],  # Uses filesystem tools which are provided by default
+    "model": "claude-sonnet-4-5-20250929",
+}
+
+
+def create_document_analyst_subagent() -> Dict[str, Any]:
+    """Create the document analyst subagent configuration.
+
+    This subagent specializes in detailed document retrieval and legal risk analysis.
+    It has access to tools for retrieving documents and pages, and can research
+    legal standards and precedents.
+
+    Returns:
+        Subagent configuration dictionary
+    """
+    return {**_DOCUMENT_ANALYST_SUBAGENT, "tools": list(_DOCUMENT_ANALYST_SUBAGENT["tools"])}
 
 
 def create_deliverable_creator_subagent() -> Dict[str, Any]:
@@ -57,19 +76,7 @@ def create_deliverable_creator_subagent() -> Dict[str, Any]:
     Returns:
         Subagent configuration dictionary
     """
-    return {
-        "name": "deliverable-creator",
-        "description": """Specialized subagent for creating polished legal deliverables from analysis findings.
-
-Use this subagent when you need to transform synthesized legal risk analysis into professional deliverables including Word documents and interactive web dashboards.
-
-This subagent specializes in document formatting, visual presentation, and creating user-friendly interfaces for complex legal information. It has access to the filesystem to read synthesis files and detailed findings, and it knows how to create properly structured Word documents and interactive React dashboards.
-
-Delegate to this subagent after you have completed your synthesis of all findings and saved your comprehensive risk assessment to the filesystem. The subagent will handle all the technical work of creating professional deliverables.""",
-        "system_prompt": DELIVERABLE_CREATOR_PROMPT,
-        "tools": [],  # Uses filesystem tools which are provided by default
-        "model": "claude-sonnet-4-5-20250929",
-    }
+    return {**_DELIVERABLE_CREATOR_SUBAGENT, "tools": list(_DELIVERABLE_CREATOR_SUBAGENT["tools"])}
 
 
 # ==============================================================================
@@ -77,9 +84,7 @@ Delegate to this subagent after you have completed your synthesis of all finding
 # ==============================================================================
 
 
-def create_legal_risk_agent(
-    use_deep_agents: bool = True, **kwargs
-) -> Any:
+def create_legal_risk_agent(use_deep_agents: bool = True, **kwargs) -> Any:
     """Create the legal risk analysis agent system.
 
     This function creates either a full Deep Agents-based multi-agent system
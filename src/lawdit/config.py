@@ -4,8 +4,9 @@ Configuration Management
 Centralized configuration using pydantic-settings.
 """
 
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -41,9 +42,32 @@ class Settings(BaseSettings):
 
     # Processing Configuration
     pdf_dpi: int = Field(200, description="DPI for PDF to image conversion", ge=72, le=600)
+    pdf_backend: Literal["pdf2image", "pymupdf", "pypdfium2"] = Field(
+        "pdf2image",
+        description="Rasterizer for PDF pages (pymupdf and pypdfium2 need their packages)",
+    )
+    page_image_format: Literal["png", "jpeg"] = Field(
+        "png", description="Image format for rendered pages sent to the vision model"
+    )
+    png_encoder: Literal["pillow", "pyvips"] = Field(
+        "pillow", description="Encoder for PNG pages (pyvips needs its package)"
+    )
+    jpeg_quality: int = Field(85, description="JPEG quality for rendered pages", ge=1, le=95)
+    max_image_side: Optional[int] = Field(
+        None, description="Downscale rendered pages so their longest side fits", ge=256
+    )
+    pdf_render_workers: int = Field(
+        1, description="Worker processes used to rasterize PDF pages", ge=1, le=32
+    )
     max_parallel_processes: int = Field(
         4, description="Maximum parallel processes for document analysis", ge=1, le=20
     )
+    vision_page_batch_size: int = Field(
+        1, description="Pages sent per vision request (1 disables batching)", ge=1, le=16
+    )
+    cache_enabled: bool = Field(
+        True, description="Reuse cached vision summaries for unchanged page images"
+    )
 
     # Model Configuration
     vision_model: str = Field(
@@ -52,31 +76,42 @@ class Settings(BaseSettings):
     analysis_model: str = Field(
         "claude-sonnet-4-5-20250929", description="Model to use for analysis tasks"
     )
+    openai_http2: bool = Field(
+        False, description="Multiplex vision requests over HTTP/2 (requires httpx[http2])"
+    )
 
     # Rate Limiting (optional)
     openai_max_requests_per_minute: int = Field(60, description="Max OpenAI requests per minute")
     openai_max_tokens_per_minute: int = Field(90000, description="Max OpenAI tokens per minute")
 
-    def __init__(self, **kwargs):
-        """Initialize settings and create directories if they don't exist."""
-        super().__init__(**kwargs)
+    def ensure_dirs(self) -> None:
+        """Create the working and output directories if they don't exist."""
         self.working_dir.mkdir(parents=True, exist_ok=True)
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
 
 # Global settings instance
 settings: Optional[Settings] = None
+_settings_lock = threading.Lock()
 
 
 def get_settings() -> Settings:
     """Get or create the global settings instance.
 
+    The instance is created (and its directories ensured) once; later calls
+    return it without taking the lock.
+
     Returns:
         Settings instance loaded from environment variables
     """
     global settings
     if settings is None:
-        settings = Settings()
+        with _settings_lock:
+            if settings is None:
+                # Fields come from the environment, which mypy cannot see
+                new_settings = Settings()  # type: ignore[call-arg]
+                new_settings.ensure_dirs()
+                settings = new_settings
     return settings
 
 
@@ -87,5 +122,8 @@ def reload_settings() -> Settings:
         Fresh Settings instance
     """
     global settings
-    settings = Settings()
+    new_settings = Settings()  # type: ignore[call-arg]
+    new_settings.ensure_dirs()
+    with _settings_lock:
+        settings = new_settings
     return settings
@@ -0,0 +1,62 @@
+"""
+Indexer Logging Setup
+
+Routes the indexer's log records through a queue so that worker threads only
+enqueue records, while a single background listener formats and writes them.
+"""
+
+import atexit
+import logging
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+LOGGER_NAME = "lawdit.indexer"
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+_listener: Optional[QueueListener] = None
+_listener_lock = threading.Lock()
+
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """Send indexer log records to stderr through a background listener.
+
+    Safe to call more than once (e.g. on every Streamlit rerun): the queue
+    handler and listener are only installed the first time, and later calls
+    just update the level.
+
+    Args:
+        level: Minimum level for the ``lawdit.indexer`` loggers; per-page
+            progress is logged at DEBUG
+    """
+    global _listener
+
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(level)
+
+    with _listener_lock:
+        if _listener is not None:
+            return
+
+        log_queue: queue.Queue = queue.Queue(-1)
+        stream_handler = logging.StreamHandler(sys.stderr)
+        stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+        logger.addHandler(QueueHandler(log_queue))
+        logger.propagate = False
+
+        _listener = QueueListener(log_queue, stream_handler)
+        _listener.start()
+        atexit.register(_stop_listener)
+
+
+def _stop_listener() -> None:
+    """Flush queued records and stop the background listener."""
+    global _listener
+
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
@@ -5,14 +5,47 @@ Command-line interface for building data room indexes.
 """
 
 import argparse
+import logging
 import os
 import sys
 
+from pydantic import ValidationError
+
+from lawdit.config import Settings, get_settings
+from lawdit.indexer._log import configure_logging
 from lawdit.indexer.data_room_indexer import DataRoomIndexer
 
 
+def _load_settings() -> Settings:
+    """Load the settings that supply the CLI's defaults.
+
+    A key given with --api-key satisfies the required OPENAI_API_KEY setting,
+    and a malformed value in the environment or .env exits with a message
+    naming the offending setting.
+
+    Returns:
+        Settings instance loaded from environment variables
+    """
+    pre_parser = argparse.ArgumentParser(add_help=False)
+    pre_parser.add_argument("--api-key", "-k")
+    known, _ = pre_parser.parse_known_args()
+    if known.api_key:
+        os.environ.setdefault("OPENAI_API_KEY", known.api_key)
+
+    try:
+        return get_settings()
+    except ValidationError as e:
+        if any(error["loc"] == ("openai_api_key",) for error in e.errors()):
+            print("Error: OpenAI API key not provided (use --api-key or OPENAI_API_KEY env var)")
+        else:
+            print(f"Error: Invalid configuration: {e}")
+        sys.exit(1)
+
+
 def main():
     """Main entry point for the indexing CLI."""
+    settings = _load_settings()
+
     parser = argparse.ArgumentParser(
         description="Build a data room index from Google Drive documents"
     )
@@ -20,12 +53,17 @@ def main():
     parser.add_argument(
         "--credentials",
         "-c",
-        required=True,
-        help="Path to Google Cloud credentials JSON file",
+        default=settings.google_credentials_path,
+        required=settings.google_credentials_path is None,
+        help="Path to Google Cloud credentials JSON file (default: GOOGLE_CREDENTIALS_PATH)",
     )
 
     parser.add_argument(
-        "--folder-id", "-f", required=True, help="Google Drive folder ID to index"
+        "--folder-id",
+        "-f",
+        default=settings.google_drive_folder_id,
+        required=settings.google_drive_folder_id is None,
+        help="Google Drive folder ID to index (default: GOOGLE_DRIVE_FOLDER_ID)",
     )
 
     parser.add_argument(
@@ -38,28 +76,116 @@ def main():
     parser.add_argument(
         "--working-dir",
         "-w",
-        default="./data_room_processing",
-        help="Working directory for temporary files (default: ./data_room_processing)",
+        default=str(settings.working_dir),
+        help="Working directory for temporary files (default: %(default)s)",
     )
 
     parser.add_argument(
         "--api-key",
         "-k",
-        help="OpenAI API key (default: uses OPENAI_API_KEY env var)",
+        help="OpenAI API key (default: OPENAI_API_KEY from the environment or .env)",
+    )
+
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=settings.max_parallel_processes,
+        help="Maximum concurrent vision requests per document (default: %(default)s)",
+    )
+
+    parser.add_argument(
+        "--max-document-workers",
+        type=int,
+        default=1,
+        help="Maximum documents processed concurrently (default: 1)",
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        default=not settings.cache_enabled,
+        help=(
+            "Reprocess every document and page instead of reusing earlier results "
+            "(default when CACHE_ENABLED=false)"
+        ),
+    )
+
+    parser.add_argument(
+        "--pdf-backend",
+        choices=["pdf2image", "pymupdf", "pypdfium2"],
+        default=settings.pdf_backend,
+        help=(
+            "Rasterizer for PDF pages; pymupdf and pypdfium2 render in-process and "
+            "need the matching package (default: %(default)s)"
+        ),
+    )
+
+    parser.add_argument(
+        "--image-format",
+        choices=["png", "jpeg"],
+        default=settings.page_image_format,
+        help="Format of page images sent to the vision model (default: %(default)s)",
+    )
+
+    parser.add_argument(
+        "--png-encoder",
+        choices=["pillow", "pyvips"],
+        default=settings.png_encoder,
+        help="Encoder for PNG pages; pyvips is faster on high-DPI pages (default: %(default)s)",
+    )
+
+    parser.add_argument(
+        "--jpeg-quality",
+        type=int,
+        default=settings.jpeg_quality,
+        help="JPEG quality when --image-format=jpeg (default: %(default)s)",
+    )
+
+    parser.add_argument(
+        "--max-image-side",
+        type=int,
+        default=settings.max_image_side,
+        help="Downscale page images so their longest side fits this many pixels",
+    )
+
+    parser.add_argument(
+        "--render-workers",
+        type=int,
+        default=settings.pdf_render_workers,
+        help="Worker processes used to rasterize PDF pages (default: %(default)s; 1 is in-process)",
+    )
+
+    parser.add_argument(
+        "--page-batch-size",
+        type=int,
+        default=settings.vision_page_batch_size,
+        help="Pages sent per vision request; 1 disables batching (default: %(default)s)",
+    )
+
+    parser.add_argument(
+        "--http2",
+        action="store_true",
+        default=settings.openai_http2,
+        help="Multiplex vision requests over HTTP/2 (requires httpx[http2])",
+    )
+
+    parser.add_argument(
+        "--verbose",
+        "-v",
+        action="store_true",
+        help="Log per-page progress (DEBUG level)",
     )
 
     args = parser.parse_args()
+    configure_logging(logging.DEBUG if args.verbose else logging.INFO)
 
     # Validate credentials file exists
     if not os.path.exists(args.credentials):
         print(f"Error: Credentials file not found: {args.credentials}")
         sys.exit(1)
 
-    # Get API key from args or environment
-    api_key = args.api_key or os.environ.get("OPENAI_API_KEY")
-    if not api_key:
-        print("Error: OpenAI API key not provided (use --api-key or OPENAI_API_KEY env var)")
-        sys.exit(1)
+    # Get API key from args, falling back to the environment or .env
+    api_key = args.api_key or settings.openai_api_key
 
     # Initialize and run the indexer
     try:
@@ -67,11 +193,23 @@ def main():
             google_credentials_path=args.credentials,
             openai_api_key=api_key,
             working_dir=args.working_dir,
+            max_workers=args.max_workers,
+            max_document_workers=args.max_document_workers,
+            cache_enabled=not args.no_cache,
+            pdf_backend=args.pdf_backend,
+            image_format=args.image_format,
+            jpeg_quality=args.jpeg_quality,
+            png_encoder=args.png_encoder,
+            max_image_side=args.max_image_side,
+            page_batch_size=args.page_batch_size,
+            http2=args.http2,
+            render_workers=args.render_workers,
         )
 
-        index_text = indexer.build_data_room_index(
-            folder_id=args.folder_id, output_path=args.output
-        )
+        with indexer:
+            indexer.build_data_room_index(
+                folder_id=args.folder_id, output_path=args.output, return_text=False
+            )
 
         print(f"\n{'='*70}")
         print("INDEX BUILT SUCCESSFULLY")
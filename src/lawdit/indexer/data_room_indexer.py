@@ -4,13 +4,43 @@ Data Room Indexer - Main Orchestration Module
 Coordinates the complete pipeline from Google Drive to structured index.
 """
 
-import json
+import logging
+import os
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+import orjson
+
+from lawdit._storage import RECORDS_INDEX_NAME
 from lawdit.indexer.google_drive_client import GoogleDriveClient
 from lawdit.indexer.pdf_processor import PDFProcessor
-from lawdit.indexer.vision_summarizer import VisionSummarizer
+from lawdit.indexer.vision_summarizer import (
+    DOCUMENT_ERROR_PREFIX,
+    PAGE_ERROR_PREFIX,
+    VisionSummarizer,
+)
+
+logger = logging.getLogger(__name__)
+
+# Drive metadata that identifies an unchanged file between indexing runs
+FINGERPRINT_FIELDS = ("md5Checksum", "modifiedTime", "version")
+
+# Characters that are not safe in a directory name on every filesystem
+_SLUG_RE = re.compile(r"[^A-Za-z0-9._-]+")
+_SLUG_MAX_LENGTH = 120
+
+# Google Workspace types that Drive can export as PDF
+_EXPORTABLE_MIMES = frozenset(
+    {
+        "application/vnd.google-apps.document",
+        "application/vnd.google-apps.spreadsheet",
+        "application/vnd.google-apps.presentation",
+    }
+)
+_SUPPORTED_MIMES = _EXPORTABLE_MIMES | {"application/pdf"}
 
 
 class DataRoomIndexer:
@@ -27,6 +57,17 @@ class DataRoomIndexer:
         google_credentials_path: str,
         openai_api_key: str = None,
         working_dir: str = "./data_room_processing",
+        max_workers: int = 4,
+        max_document_workers: int = 1,
+        cache_enabled: bool = True,
+        pdf_backend: str = "pdf2image",
+        image_format: str = "png",
+        jpeg_quality: int = 85,
+        max_image_side: int | None = None,
+        page_batch_size: int = 1,
+        http2: bool = False,
+        render_workers: int = 1,
+        png_encoder: str = "pillow",
     ):
         """Initialize the data room indexer.
 
@@ -34,12 +75,55 @@ class DataRoomIndexer:
             google_credentials_path: Path to Google Cloud credentials
             openai_api_key: OpenAI API key (optional, can use env var)
             working_dir: Directory for storing temporary files during processing
+            max_workers: Maximum number of concurrent vision requests per document
+            max_document_workers: Maximum number of documents processed concurrently
+            cache_enabled: Whether to reuse cached page summaries and skip documents
+                          unchanged since the last run (see index_manifest.json)
+            pdf_backend: Rasterizer used by the PDF processor ("pdf2image", "pymupdf"
+                        or "pypdfium2")
+            image_format: Page image format sent to the vision model ("png" or "jpeg")
+            jpeg_quality: JPEG quality used when image_format is "jpeg"
+            max_image_side: Optional cap on the longest side of page images in pixels
+            page_batch_size: Pages sent per vision request; 1 summarizes pages individually
+            http2: Whether the vision client multiplexes requests over HTTP/2
+            render_workers: Worker processes used to rasterize pages; with more than
+                           one, rendering runs outside the process issuing vision calls
+            png_encoder: Encoder for PNG pages re-encoded in Python ("pillow" or "pyvips")
         """
-        self.drive_client = GoogleDriveClient(google_credentials_path)
-        self.pdf_processor = PDFProcessor(dpi=200)
-        self.vision_summarizer = VisionSummarizer(openai_api_key)
         self.working_dir = Path(working_dir)
         self.working_dir.mkdir(parents=True, exist_ok=True)
+        self.drive_client = GoogleDriveClient(google_credentials_path)
+        self.pdf_processor = PDFProcessor(
+            dpi=200,
+            backend=pdf_backend,
+            image_format=image_format,
+            jpeg_quality=jpeg_quality,
+            max_side=max_image_side,
+            render_workers=render_workers,
+            png_encoder=png_encoder,
+        )
+        self.vision_summarizer = VisionSummarizer(
+            openai_api_key,
+            cache_dir=str(self.working_dir / "vision_cache") if cache_enabled else None,
+            http2=http2,
+        )
+        self.max_workers = max(1, max_workers)
+        self.max_document_workers = max(1, max_document_workers)
+        self.page_batch_size = max(1, page_batch_size)
+        self.cache_enabled = cache_enabled
+        self.manifest_path = self.working_dir / "index_manifest.json"
+        self.records_index_path = self.working_dir / RECORDS_INDEX_NAME
+
+    def close(self) -> None:
+        """Release the vision client's connections and the PDF render workers."""
+        self.vision_summarizer.close()
+        self.pdf_processor.close()
+
+    def __enter__(self) -> "DataRoomIndexer":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
 
     def process_document(
         self, file_id: str, file_name: str, mime_type: str
@@ -58,57 +142,51 @@ class DataRoomIndexer:
         Returns:
             Dictionary containing document metadata and summaries
         """
-        print(f"\n{'='*70}")
-        print(f"Processing: {file_name}")
-        print(f"{'='*70}")
+        # Skip unsupported types before touching the working directory
+        if mime_type not in _SUPPORTED_MIMES:
+            logger.info("Skipping %s: unsupported file type %s", file_name, mime_type)
+            return None
+
+        logger.info("Processing: %s", file_name)
 
         # Create a unique directory for this document
-        doc_slug = file_name.replace(" ", "_").replace("/", "_")
-        doc_dir = self.working_dir / doc_slug
+        doc_dir = self._document_dir(file_id, file_name)
         doc_dir.mkdir(parents=True, exist_ok=True)
 
-        pdf_path = doc_dir / f"{doc_slug}.pdf"
+        pdf_path = doc_dir / f"{doc_dir.name}.pdf"
 
         # Step 1: Download or export the document as PDF
-        print("Step 1: Downloading document...")
-        if mime_type == "application/pdf":
-            # Already a PDF, just download it
-            success = self.drive_client.download_file(file_id, str(pdf_path))
-        elif mime_type in [
-            "application/vnd.google-apps.document",
-            "application/vnd.google-apps.spreadsheet",
-            "application/vnd.google-apps.presentation",
-        ]:
+        logger.debug("%s: downloading document", file_name)
+        if mime_type in _EXPORTABLE_MIMES:
             # Google Workspace document, export as PDF
             success = self.drive_client.export_as_pdf(file_id, str(pdf_path))
         else:
-            print(f"Unsupported file type: {mime_type}")
-            return None
+            # Already a PDF, just download it
+            success = self.drive_client.download_file(file_id, str(pdf_path))
 
         if not success:
-            print(f"Failed to download {file_name}")
+            logger.error("Failed to download %s", file_name)
             return None
 
-        # Step 2: Extract pages as images
-        print("Step 2: Extracting pages as images...")
-        pages_dir = doc_dir / "pages"
-        image_paths = self.pdf_processor.extract_pages_as_images(str(pdf_path), str(pages_dir))
+        # Step 2: Extract pages and analyze each one with vision
+        logger.debug("%s: extracting pages and analyzing them with vision", file_name)
+        try:
+            image_paths, summaries = self._summarize_pages(str(pdf_path), str(doc_dir / "pages"))
+        except Exception as e:
+            logger.error("Error extracting pages from %s: %s", file_name, e)
+            image_paths = []
 
         if not image_paths:
-            print(f"Failed to extract pages from {file_name}")
+            logger.error("Failed to extract pages from %s", file_name)
             return None
 
-        # Step 3: Analyze each page with vision
-        print(f"Step 3: Analyzing {len(image_paths)} pages with vision...")
-        page_summaries = []
-        for page_num, image_path in enumerate(image_paths, start=1):
-            summary = self.vision_summarizer.summarize_page_image(image_path, page_num)
-            page_summaries.append(
-                {"page_num": page_num, "summary": summary, "image_path": image_path}
-            )
-
-        # Step 4: Create document-level summary
-        print("Step 4: Creating document-level summary...")
+        page_summaries = [
+            {"page_num": page_num, "summary": summary}
+            for page_num, summary in enumerate(summaries, start=1)
+        ]
+
+        # Step 3: Create document-level summary
+        logger.debug("%s: creating document-level summary", file_name)
         document_summary = self.vision_summarizer.summarize_document_from_pages(
             page_summaries, file_name
         )
@@ -123,23 +201,148 @@ class DataRoomIndexer:
             "pages": page_summaries,
         }
 
-        # Save the document record to JSON for reference
+        # Save the document record to JSON for reference. Image paths are
+        # only attached to the returned record afterwards, since they are not
+        # needed in the JSON and would otherwise have to be filtered out.
         record_path = doc_dir / "document_record.json"
-        with open(record_path, "w") as f:
-            # Remove image_path from pages before saving (not needed in JSON)
-            record_for_json = {
-                **document_record,
-                "pages": [
-                    {k: v for k, v in p.items() if k != "image_path"}
-                    for p in document_record["pages"]
-                ],
-            }
-            json.dump(record_for_json, f, indent=2)
+        record_path.write_bytes(orjson.dumps(document_record, option=orjson.OPT_INDENT_2))
+        for page, image_path in zip(page_summaries, image_paths):
+            page["image_path"] = image_path
 
-        print(f"Completed processing: {file_name}")
+        logger.info("Completed processing: %s", file_name)
         return document_record
 
-    def build_data_room_index(self, folder_id: str, output_path: str = None) -> str:
+    def _summarize_pages(self, pdf_path: str, pages_dir: str) -> Tuple[List[str], List[str]]:
+        """Render a PDF and summarize its pages as they come off the renderer.
+
+        Page calls are independent and network-bound, so pages (or batches of
+        pages) are submitted to a thread pool as soon as they are rendered and
+        their in-memory bytes go straight to the vision API. The number of
+        queued pages is bounded so a long document is not held in memory.
+
+        Args:
+            pdf_path: Path to the downloaded PDF
+            pages_dir: Directory where page images are saved
+
+        Returns:
+            Tuple of (image paths, page summaries), both in page order
+        """
+        image_paths: List[str] = []
+        futures: List[Future] = []
+        in_flight = threading.BoundedSemaphore(self.max_workers * 2)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+
+            def submit(fn: Callable[..., Any], *args: Any) -> None:
+                in_flight.acquire()
+                future = pool.submit(fn, *args)
+                future.add_done_callback(lambda _: in_flight.release())
+                futures.append(future)
+
+            summarize_page = self.vision_summarizer.summarize_page_image
+            summarize_batch = self.vision_summarizer.summarize_page_batch
+            batch: List[bytes] = []
+            for image_path, image_bytes in self.pdf_processor.iter_pages(pdf_path, pages_dir):
+                image_paths.append(image_path)
+                page_num = len(image_paths)
+                if self.page_batch_size == 1:
+                    submit(summarize_page, image_bytes, page_num)
+                    continue
+                batch.append(image_bytes)
+                if len(batch) == self.page_batch_size:
+                    submit(summarize_batch, batch, page_num - len(batch) + 1)
+                    batch = []
+            if batch:
+                submit(summarize_batch, batch, len(image_paths) - len(batch) + 1)
+
+        summaries: List[str] = []
+        for future in futures:
+            if self.page_batch_size == 1:
+                summaries.append(future.result())
+            else:
+                summaries.extend(future.result())
+        return image_paths, summaries
+
+    def _document_dir(self, file_id: str, file_name: str) -> Path:
+        """Return the working directory used for a document's files.
+
+        The file name is reduced to a length-capped, filesystem-safe slug and
+        suffixed with the start of the Drive file ID, so distinct files never
+        share a directory even when their slugs collide.
+        """
+        doc_slug = _SLUG_RE.sub("_", file_name)[:_SLUG_MAX_LENGTH]
+        return self.working_dir / f"{doc_slug}-{file_id[:8]}"
+
+    @staticmethod
+    def _fingerprint(file: Dict[str, Any]) -> Dict[str, Any] | None:
+        """Return the Drive fingerprint of a file, or None if Drive sent none."""
+        fingerprint = {field: file.get(field) for field in FINGERPRINT_FIELDS}
+        if not any(fingerprint.values()):
+            return None
+        return fingerprint
+
+    @staticmethod
+    def _has_errors(record: Dict[str, Any]) -> bool:
+        """Return whether a record holds a failed page or document summary."""
+        if str(record.get("document_summary", "")).startswith(DOCUMENT_ERROR_PREFIX):
+            return True
+        return any(
+            str(page.get("summary", "")).startswith(PAGE_ERROR_PREFIX)
+            for page in record.get("pages", [])
+        )
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        """Load the manifest of previously indexed documents."""
+        if not self.manifest_path.exists():
+            return {}
+        try:
+            manifest: Dict[str, Any] = orjson.loads(self.manifest_path.read_bytes())
+            return manifest
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable index manifest %s: %s", self.manifest_path, e)
+            return {}
+
+    def _load_unchanged_record(
+        self, file: Dict[str, Any], entry: Dict[str, Any] | None
+    ) -> Dict[str, Any] | None:
+        """Return the saved record for a file whose fingerprint is unchanged."""
+        fingerprint = self._fingerprint(file)
+        if not entry or fingerprint is None or entry.get("fingerprint") != fingerprint:
+            return None
+        try:
+            record: Dict[str, Any] = orjson.loads(Path(entry["record_path"]).read_bytes())
+            return record
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write_records_index(self, record_paths: List[Tuple[Dict[str, Any], str]]) -> None:
+        """Write every document record to the merged JSON Lines index.
+
+        Each line is the record as saved in its document_record.json, plus
+        "record_dir", the name of the record's directory inside working_dir.
+        The file is replaced atomically so readers never see a partial index.
+
+        Args:
+            record_paths: (record, path of its document_record.json) pairs
+        """
+        tmp_path = self.records_index_path.with_suffix(".jsonl.tmp")
+        with open(tmp_path, "wb") as f:
+            for record, record_path in record_paths:
+                line = {
+                    **record,
+                    "pages": [
+                        {"page_num": page["page_num"], "summary": page["summary"]}
+                        for page in record["pages"]
+                    ],
+                    "record_dir": Path(record_path).parent.name,
+                }
+                f.write(orjson.dumps(line))
+                f.write(b"\n")
+        os.replace(tmp_path, self.records_index_path)
+
+    def build_data_room_index(
+        self, folder_id: str, output_path: str = None, return_text: bool = True
+    ) -> str:
         """Build a complete data room index from a Google Drive folder.
 
         This is the main entry point for the indexing pipeline. It processes
@@ -150,50 +353,110 @@ class DataRoomIndexer:
             folder_id: Google Drive folder ID containing the data room documents
             output_path: Optional path to save the index. If not provided,
                         saves to working_dir/data_room_index.txt
+            return_text: Whether to also keep the index in memory and return it.
+                        When False the index is only streamed to disk and the
+                        output path is returned instead.
 
         Returns:
-            The formatted data room index as a string
+            The formatted data room index as a string, or the path it was
+            written to when return_text is False
         """
-        print(f"\n{'='*70}")
-        print("BUILDING DATA ROOM INDEX")
-        print(f"{'='*70}\n")
+        logger.info("Building data room index for folder %s", folder_id)
 
         # Step 1: List all files in the folder
-        print("Step 1: Listing files in Google Drive folder...")
+        logger.info("Step 1: Listing files in Google Drive folder...")
         files = self.drive_client.list_folder_contents(folder_id)
-        print(f"Found {len(files)} files to process\n")
+        logger.info("Found %d files to process", len(files))
 
         # Step 2: Process each document
-        print("Step 2: Processing documents...")
-        document_records = []
-        for idx, file in enumerate(files, start=1):
-            print(f"\nProcessing file {idx}/{len(files)}")
-            record = self.process_document(file["id"], file["name"], file["mimeType"])
-            if record:
-                document_records.append(record)
+        # Files whose Drive fingerprint matches the manifest reuse their saved
+        # record. The rest run on a worker pool; records are kept in folder
+        # listing order regardless of completion order.
+        logger.info("Step 2: Processing documents...")
+        manifest = self._load_manifest() if self.cache_enabled else {}
+        records: List[Dict[str, Any] | None] = [None] * len(files)
+        pending = []
+        for idx, file in enumerate(files):
+            records[idx] = self._load_unchanged_record(file, manifest.get(file["id"]))
+            if records[idx] is None:
+                pending.append(idx)
+        logger.info("Reusing %d unchanged documents", len(files) - len(pending))
+
+        self.pdf_processor.start_render_pool()
+        with ThreadPoolExecutor(max_workers=self.max_document_workers) as pool:
+            futures = {
+                pool.submit(
+                    self.process_document,
+                    files[idx]["id"],
+                    files[idx]["name"],
+                    files[idx]["mimeType"],
+                ): idx
+                for idx in pending
+            }
+            for completed, future in enumerate(as_completed(futures), start=1):
+                idx = futures[future]
+                records[idx] = future.result()
+                logger.info("Finished file %d/%d: %s", completed, len(pending), files[idx]["name"])
+        document_records = [record for record in records if record]
+
+        # Remember what was indexed so the next run can skip unchanged files
+        processed = set(pending)
+        new_manifest = {}
+        record_paths: List[Tuple[Dict[str, Any], str]] = []
+        for idx, file in enumerate(files):
+            record = records[idx]
+            if not record:
+                continue
+            if idx in processed:
+                doc_dir = self._document_dir(file["id"], file["name"])
+                record_path = str(doc_dir / "document_record.json")
+            else:
+                record_path = manifest[file["id"]]["record_path"]
+            record_paths.append((record, record_path))
+
+            # Records with failed vision requests are left out so they are retried
+            fingerprint = self._fingerprint(file)
+            if fingerprint is not None and not self._has_errors(record):
+                new_manifest[file["id"]] = {
+                    "fingerprint": fingerprint,
+                    "record_path": record_path,
+                }
+
+        # An empty listing may be a Drive error, so it never replaces what the
+        # last run cached
+        if files:
+            self.manifest_path.write_bytes(orjson.dumps(new_manifest, option=orjson.OPT_INDENT_2))
+            self._write_records_index(record_paths)
+        else:
+            logger.warning("No files listed in folder %s; keeping the existing manifest", folder_id)
 
         # Step 3: Format the index
-        print(f"\n{'='*70}")
-        print("Step 3: Formatting data room index...")
-        print(f"{'='*70}\n")
+        logger.info("Step 3: Formatting data room index...")
 
-        index_lines = ["# Data Room Index\n"]
-
-        # List all documents in a simple format
-        for doc in document_records:
-            index_lines.append(f"- **{doc['doc_id']}**: {doc['file_name']}")
-            index_lines.append(f"  Summary: {doc['document_summary']}\n")
-
-        index_text = "\n".join(index_lines)
-
-        # Save the index
+        # Save the index, streaming one document entry at a time
         if output_path is None:
             output_path = self.working_dir / "data_room_index.txt"
 
-        with open(output_path, "w") as f:
-            f.write(index_text)
-
-        print(f"Data room index saved to: {output_path}")
-        print(f"Total documents indexed: {len(document_records)}")
-
-        return index_text
+        parts: Optional[List[str]] = [] if return_text else None
+        # Summaries are routinely non-ASCII (accents, currency signs), so pin the
+        # encoding and newlines instead of using the platform defaults
+        with open(output_path, "w", encoding="utf-8", newline="\n", buffering=1 << 20) as f:
+            header = "# Data Room Index\n"
+            f.write(header)
+            if parts is not None:
+                parts.append(header)
+
+            # List all documents in a simple format
+            for doc in document_records:
+                entry = (
+                    f"\n- **{doc['doc_id']}**: {doc['file_name']}\n"
+                    f"  Summary: {doc['document_summary']}\n"
+                )
+                f.write(entry)
+                if parts is not None:
+                    parts.append(entry)
+
+        logger.info("Data room index saved to: %s", output_path)
+        logger.info("Total documents indexed: %d", len(document_records))
+
+        return "".join(parts) if parts is not None else str(output_path)
@@ -4,12 +4,60 @@ PDF Processing Module
 Handles conversion of PDF documents to images for vision-based analysis.
 """
 
-import base64
+import io
+import logging
+import mmap
+import multiprocessing
 import os
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple, Union, cast
 
+import orjson
 import pdf2image
+from PIL import Image
+
+from lawdit._storage import PAGES_B64_BLOB, PAGES_B64_INDEX, b64encode
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_BACKENDS = ("pdf2image", "pymupdf", "pypdfium2")
+SUPPORTED_FORMATS = ("png", "jpeg")
+SUPPORTED_PNG_ENCODERS = ("pillow", "pyvips")
+
+# zlib level for PNG pages encoded by Pillow or libvips. Level 1 roughly halves encode
+# CPU against the default of 6 for a modest size increase; the bytes are only
+# base64-embedded in vision requests.
+PNG_COMPRESS_LEVEL = 1
+_PNG_SAVE_OPTIONS: Dict[str, Any] = {"compress_level": PNG_COMPRESS_LEVEL}
+
+# Pages rendered per task when rasterization runs in worker processes. Larger
+# ranges amortize the Poppler start-up; smaller ones get the first page to the
+# vision model sooner.
+RENDER_CHUNK_PAGES = 4
+
+
+def _render_page_range(
+    options: Dict[str, Any], pdf_path: str, first_page: int, last_page: int
+) -> List[bytes]:
+    """Render a range of pages in a worker process.
+
+    Module-level so it can be pickled by ProcessPoolExecutor.
+
+    Args:
+        options: Keyword arguments used to rebuild the PDFProcessor
+        pdf_path: Path to the PDF file
+        first_page: First page to render (1-based)
+        last_page: Last page to render (inclusive)
+
+    Returns:
+        Encoded page images in page order
+    """
+    processor = PDFProcessor(**options)
+    return list(processor._render_page_bytes(pdf_path, first_page, last_page))
 
 
 class PDFProcessor:
@@ -21,7 +69,16 @@ class PDFProcessor:
     balance file size (which affects token costs) against readability.
     """
 
-    def __init__(self, dpi: int = 200):
+    def __init__(
+        self,
+        dpi: int = 200,
+        backend: str = "pdf2image",
+        image_format: str = "png",
+        jpeg_quality: int = 85,
+        max_side: Optional[int] = None,
+        render_workers: int = 1,
+        png_encoder: str = "pillow",
+    ):
         """Initialize the PDF processor.
 
         Args:
@@ -29,15 +86,79 @@ class PDFProcessor:
                 better quality images but increases file size and token costs.
                 200 DPI provides good readability for most text documents
                 while keeping costs reasonable.
+            backend: Rasterizer to use. "pdf2image" shells out to Poppler;
+                "pymupdf" renders in-process with PyMuPDF, avoiding the
+                subprocess and the intermediate PIL images; "pypdfium2"
+                renders in-process with PDFium, one page at a time.
+            image_format: "png" (lossless) or "jpeg". JPEG pages are several
+                times smaller, which cuts upload time and vision token cost.
+            jpeg_quality: JPEG quality used when image_format is "jpeg"
+            max_side: Optional cap on the longest side of a page image in
+                pixels; larger pages are downscaled before saving.
+            render_workers: Number of worker processes used by iter_pages to
+                rasterize and encode pages. With more than one, page ranges
+                render in parallel outside this process, so CPU-bound work
+                does not compete with the vision API threads for the GIL.
+            png_encoder: Encoder for PNG pages that are re-encoded in Python
+                (downscaled pages and the in-process backends). "pillow" uses
+                Pillow's zlib encoder; "pyvips" uses libvips, which encodes
+                large high-DPI pages several times faster.
+
+        Raises:
+            ValueError: If the backend, image format or PNG encoder is not
+                supported
         """
+        if backend not in SUPPORTED_BACKENDS:
+            raise ValueError(
+                f"Unsupported PDF backend {backend!r}; expected one of {SUPPORTED_BACKENDS}"
+            )
+        if image_format not in SUPPORTED_FORMATS:
+            raise ValueError(
+                f"Unsupported image format {image_format!r}; expected one of {SUPPORTED_FORMATS}"
+            )
+        if png_encoder not in SUPPORTED_PNG_ENCODERS:
+            raise ValueError(
+                f"Unsupported PNG encoder {png_encoder!r}; "
+                f"expected one of {SUPPORTED_PNG_ENCODERS}"
+            )
         self.dpi = dpi
+        self.backend = backend
+        self.image_format = image_format
+        self.jpeg_quality = jpeg_quality
+        self.max_side = max_side
+        self.extension = "jpg" if image_format == "jpeg" else "png"
+        # Pillow save arguments are fixed per processor, so build them once
+        if image_format == "jpeg":
+            self._save_format = "JPEG"
+            self._save_options = {"quality": jpeg_quality, "optimize": True, "progressive": True}
+        else:
+            self._save_format = "PNG"
+            self._save_options = _PNG_SAVE_OPTIONS
+        self.render_workers = max(1, render_workers)
+        self.png_encoder = png_encoder
+        self._render_pool: Optional[ProcessPoolExecutor] = None
+        self._render_pool_lock = threading.Lock()
+
+    def close(self) -> None:
+        """Shut down the render worker processes, if any were started."""
+        with self._render_pool_lock:
+            if self._render_pool is not None:
+                self._render_pool.shutdown()
+                self._render_pool = None
+
+    def __enter__(self) -> "PDFProcessor":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
 
     def extract_pages_as_images(self, pdf_path: str, output_dir: str) -> List[str]:
         """Extract all pages from a PDF as individual image files.
 
-        This method converts each page of the PDF into a separate PNG image.
-        We use PNG format because it provides lossless compression, ensuring
-        text remains crisp and readable for OCR and vision analysis.
+        This method converts each page of the PDF into a separate image.
+        PNG (the default) is lossless, ensuring text remains crisp and
+        readable for OCR and vision analysis; JPEG trades a little fidelity
+        for much smaller uploads.
 
         Args:
             pdf_path: Path to the PDF file to process
@@ -50,25 +171,351 @@ class PDFProcessor:
             # Create output directory if it doesn't exist
             Path(output_dir).mkdir(parents=True, exist_ok=True)
 
-            # Convert PDF pages to PIL Image objects
-            # pdf2image internally uses poppler to render PDF pages
-            images = pdf2image.convert_from_path(pdf_path, dpi=self.dpi, fmt="png")
+            if self.backend == "pymupdf":
+                return self._extract_with_pymupdf(pdf_path, output_dir)
+            if self.backend == "pdf2image":
+                return self._extract_with_pdf2image(pdf_path, output_dir)
 
             image_paths = []
-            for page_num, image in enumerate(images, start=1):
+            for page_num, image in enumerate(self._iter_pdfium_images(pdf_path), start=1):
                 # Save each page with a numbered filename
                 # Zero-padding ensures correct alphabetical sorting
-                image_path = os.path.join(output_dir, f"page_{page_num:04d}.png")
-                image.save(image_path, "PNG")
+                image_path = os.path.join(output_dir, f"page_{page_num:04d}.{self.extension}")
+                self._save_page(image, image_path)
                 image_paths.append(image_path)
-                print(f"Extracted page {page_num} to {image_path}")
+                logger.debug("Extracted page %d to %s", page_num, image_path)
 
             return image_paths
 
         except Exception as e:
-            print(f"Error extracting pages from {pdf_path}: {e}")
+            logger.error("Error extracting pages from %s: %s", pdf_path, e)
             return []
 
+    def _extract_with_pdf2image(self, pdf_path: str, output_dir: str) -> List[str]:
+        """Render pages with Poppler to disk, then finish them on a thread pool.
+
+        Poppler writes each page to a scratch directory instead of piping every
+        page into memory at once, and only the pages being encoded are ever
+        loaded, so peak memory no longer grows with the page count.
+        """
+        # Scratch files live next to the output so finished pages are renames
+        with tempfile.TemporaryDirectory(dir=output_dir) as render_dir:
+            rendered = pdf2image.convert_from_path(
+                pdf_path, dpi=self.dpi, fmt="png", output_folder=render_dir, paths_only=True
+            )
+            image_paths = [
+                os.path.join(output_dir, f"page_{page_num:04d}.{self.extension}")
+                for page_num in range(1, len(rendered) + 1)
+            ]
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+                list(pool.map(self._finish_rendered_page, rendered, image_paths))
+
+        for page_num, image_path in enumerate(image_paths, start=1):
+            logger.debug("Extracted page %d to %s", page_num, image_path)
+        return image_paths
+
+    def _finish_rendered_page(self, rendered_path: str, image_path: str) -> None:
+        """Move or re-encode a page rendered by Poppler into its final location."""
+        if self.image_format == "png" and not self.max_side:
+            # Poppler's PNG already is the final page image
+            os.replace(rendered_path, image_path)
+            return
+        with Image.open(rendered_path) as image:
+            self._save_page(image, image_path)
+
+    def _extract_with_pymupdf(self, pdf_path: str, output_dir: str) -> List[str]:
+        """Render pages in-process with PyMuPDF and write them as image files.
+
+        Raises:
+            ImportError: If PyMuPDF is not installed
+        """
+        fitz = self._import_fitz()
+
+        image_paths = []
+        with fitz.open(pdf_path) as doc:
+            for page_num, page in enumerate(doc, start=1):
+                image_path = os.path.join(output_dir, f"page_{page_num:04d}.{self.extension}")
+                pixmap = page.get_pixmap(dpi=self.dpi, alpha=False)
+                if self.image_format == "png" and not self.max_side:
+                    pixmap.save(image_path)
+                else:
+                    image = Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples)
+                    self._save_page(image, image_path)
+                image_paths.append(image_path)
+                logger.debug("Extracted page %d to %s", page_num, image_path)
+
+        return image_paths
+
+    def iter_pages(self, pdf_path: str, output_dir: str) -> Iterator[Tuple[str, bytes]]:
+        """Render a PDF page by page, yielding each encoded image as it is ready.
+
+        Every page is encoded once in memory, written to output_dir (the
+        document tools serve page images from there) and handed to the caller
+        as bytes, so nothing has to read the image back from disk. The pages'
+        base64 encodings are also appended to PAGES_B64_BLOB, indexed by
+        PAGES_B64_INDEX once the last page has been rendered.
+
+        Args:
+            pdf_path: Path to the PDF file to process
+            output_dir: Directory where page images should be saved
+
+        Yields:
+            (image_path, image_bytes) tuples, ordered by page number
+
+        Raises:
+            Exception: Any rendering error, since pages may already have been
+                consumed by the caller
+        """
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+        if self.render_workers > 1:
+            pages = self._render_pages_in_pool(pdf_path)
+        else:
+            pages = self._render_page_bytes(pdf_path)
+
+        # Drop any index from an earlier run so it never describes a partial blob
+        index_path = Path(output_dir) / PAGES_B64_INDEX
+        index_path.unlink(missing_ok=True)
+        offsets: Dict[str, List[int]] = {}
+        offset = 0
+
+        # The blob is written beside the old one and swapped in, never truncated
+        # in place: a document store may still have the old blob memory-mapped
+        blob_path = Path(output_dir) / PAGES_B64_BLOB
+        blob_tmp_path = blob_path.with_name(PAGES_B64_BLOB + ".tmp")
+        try:
+            with open(blob_tmp_path, "wb") as blob:
+                for page_num, image_bytes in enumerate(pages, start=1):
+                    image_path = os.path.join(output_dir, f"page_{page_num:04d}.{self.extension}")
+                    with open(image_path, "wb") as f:
+                        f.write(image_bytes)
+
+                    encoded = b64encode(image_bytes)
+                    blob.write(encoded)
+                    offsets[str(page_num)] = [offset, len(encoded)]
+                    offset += len(encoded)
+
+                    logger.debug("Extracted page %d to %s", page_num, image_path)
+                    yield image_path, image_bytes
+        except BaseException:
+            blob_tmp_path.unlink(missing_ok=True)
+            raise
+        os.replace(blob_tmp_path, blob_path)
+
+        index_tmp_path = index_path.with_name(PAGES_B64_INDEX + ".tmp")
+        index_tmp_path.write_bytes(orjson.dumps(offsets))
+        os.replace(index_tmp_path, index_path)
+
+    def _render_pages_in_pool(self, pdf_path: str) -> Iterator[bytes]:
+        """Render page ranges in worker processes, yielding pages in order.
+
+        At most two ranges per worker are in flight, so a long document does
+        not pile up rendered pages faster than the vision calls consume them.
+        """
+        page_count = self._page_count(pdf_path)
+        ranges = deque(
+            (first, min(first + RENDER_CHUNK_PAGES - 1, page_count))
+            for first in range(1, page_count + 1, RENDER_CHUNK_PAGES)
+        )
+        pool = self._get_render_pool()
+        options = self._options()
+        in_flight: deque = deque()
+
+        while ranges or in_flight:
+            while ranges and len(in_flight) < self.render_workers * 2:
+                first, last = ranges.popleft()
+                in_flight.append(pool.submit(_render_page_range, options, pdf_path, first, last))
+            yield from in_flight.popleft().result()
+
+    def start_render_pool(self) -> None:
+        """Create the render pool now, if render workers are enabled.
+
+        Call before starting threads that use this processor, so the pool is
+        not first created from inside one of them.
+        """
+        if self.render_workers > 1:
+            self._get_render_pool()
+
+    def _get_render_pool(self) -> ProcessPoolExecutor:
+        """Return the shared render pool, starting it on first use.
+
+        Workers are spawned rather than forked: the pool is used from a
+        process running vision, HTTP and logging threads, and a forked child
+        can inherit one of their locks mid-acquire and deadlock.
+        """
+        with self._render_pool_lock:
+            if self._render_pool is None:
+                self._render_pool = ProcessPoolExecutor(
+                    max_workers=self.render_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._render_pool
+
+    def _options(self) -> Dict[str, Any]:
+        """Constructor arguments for rebuilding this processor in a worker."""
+        return {
+            "dpi": self.dpi,
+            "backend": self.backend,
+            "image_format": self.image_format,
+            "jpeg_quality": self.jpeg_quality,
+            "max_side": self.max_side,
+            "png_encoder": self.png_encoder,
+        }
+
+    def _page_count(self, pdf_path: str) -> int:
+        """Return the number of pages in a PDF."""
+        if self.backend == "pymupdf":
+            with self._import_fitz().open(pdf_path) as doc:
+                return int(doc.page_count)
+        if self.backend == "pypdfium2":
+            doc = self._import_pdfium().PdfDocument(pdf_path)
+            try:
+                return len(doc)
+            finally:
+                doc.close()
+        return int(pdf2image.pdfinfo_from_path(pdf_path)["Pages"])
+
+    def _render_page_bytes(
+        self, pdf_path: str, first_page: Optional[int] = None, last_page: Optional[int] = None
+    ) -> Iterator[bytes]:
+        """Yield pages of a PDF encoded in the configured image format.
+
+        first_page and last_page (1-based, inclusive) limit rendering to a
+        range; by default every page is rendered.
+        """
+        if self.backend == "pymupdf":
+            fitz = self._import_fitz()
+            with fitz.open(pdf_path) as doc:
+                start = first_page - 1 if first_page else 0
+                stop = last_page if last_page else doc.page_count
+                for index in range(start, stop):
+                    page = doc[index]
+                    pixmap = page.get_pixmap(dpi=self.dpi, alpha=False)
+                    if self.image_format == "png" and not self.max_side:
+                        yield pixmap.tobytes("png")
+                    else:
+                        yield self._encode_page(
+                            Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples)
+                        )
+            return
+
+        if self.backend == "pypdfium2":
+            for image in self._iter_pdfium_images(pdf_path, first_page, last_page):
+                yield self._encode_page(image)
+            return
+
+        with tempfile.TemporaryDirectory() as render_dir:
+            if first_page:
+                rendered = pdf2image.convert_from_path(
+                    pdf_path,
+                    dpi=self.dpi,
+                    fmt="png",
+                    output_folder=render_dir,
+                    paths_only=True,
+                    first_page=first_page,
+                    last_page=last_page if last_page else self._page_count(pdf_path),
+                )
+            else:
+                rendered = pdf2image.convert_from_path(
+                    pdf_path, dpi=self.dpi, fmt="png", output_folder=render_dir, paths_only=True
+                )
+            # With paths_only, pdf2image returns the paths of the rendered files
+            for rendered_path in cast(List[str], rendered):
+                if self.image_format == "png" and not self.max_side:
+                    yield Path(rendered_path).read_bytes()
+                else:
+                    with Image.open(rendered_path) as image:
+                        yield self._encode_page(image)
+
+    def _iter_pdfium_images(
+        self, pdf_path: str, first_page: Optional[int] = None, last_page: Optional[int] = None
+    ) -> Iterator[Image.Image]:
+        """Render pages with PDFium, closing each page once the caller moves on.
+
+        Only one rendered page is alive at a time, which bounds peak memory
+        regardless of document length.
+        """
+        pdfium = self._import_pdfium()
+        doc = pdfium.PdfDocument(pdf_path)
+        try:
+            start = first_page - 1 if first_page else 0
+            stop = last_page if last_page else len(doc)
+            for index in range(start, stop):
+                page = doc[index]
+                try:
+                    yield page.render(scale=self.dpi / 72).to_pil()
+                finally:
+                    page.close()
+        finally:
+            doc.close()
+
+    @staticmethod
+    def _import_pdfium() -> Any:
+        """Import pypdfium2, raising a helpful error if it is missing."""
+        try:
+            import pypdfium2
+        except ImportError:
+            raise ImportError(
+                "pypdfium2 is not installed. Install it with 'pip install lawdit[pypdfium2]' "
+                "or use the pdf2image backend"
+            )
+        return pypdfium2
+
+    @staticmethod
+    def _import_pyvips() -> Any:
+        """Import pyvips, raising a helpful error if it is missing."""
+        try:
+            import pyvips
+        except ImportError:
+            raise ImportError(
+                "pyvips is not installed. Install it with 'pip install lawdit[pyvips]' "
+                "or use the pillow PNG encoder"
+            )
+        return pyvips
+
+    @staticmethod
+    def _import_fitz() -> Any:
+        """Import PyMuPDF, raising a helpful error if it is missing."""
+        try:
+            import fitz
+        except ImportError:
+            raise ImportError(
+                "PyMuPDF is not installed. Install it with 'pip install lawdit[pymupdf]' "
+                "or use the pdf2image backend"
+            )
+        return fitz
+
+    def _encode_page(self, image: Image.Image) -> bytes:
+        """Encode a rendered page in memory in the configured format."""
+        buffer = io.BytesIO()
+        self._save_page(image, buffer)
+        return buffer.getvalue()
+
+    def _save_page(self, image: Image.Image, target: Union[str, IO[bytes]]) -> None:
+        """Downscale a rendered page if needed and save it in the configured format."""
+        if self.max_side:
+            image.thumbnail((self.max_side, self.max_side), Image.Resampling.LANCZOS)
+        if self.image_format == "png" and self.png_encoder == "pyvips":
+            data = self._encode_png_with_vips(image)
+            if isinstance(target, str):
+                with open(target, "wb") as f:
+                    f.write(data)
+            else:
+                target.write(data)
+        else:
+            image.save(target, self._save_format, **self._save_options)
+
+    def _encode_png_with_vips(self, image: Image.Image) -> bytes:
+        """Encode a page as PNG with libvips."""
+        pyvips = self._import_pyvips()
+        if image.mode not in ("L", "LA", "RGB", "RGBA"):
+            image = image.convert("RGB")
+        vips_image = pyvips.Image.new_from_memory(
+            image.tobytes(), image.width, image.height, len(image.getbands()), "uchar"
+        )
+        data: bytes = vips_image.pngsave_buffer(compression=PNG_COMPRESS_LEVEL)
+        return data
+
     def image_to_base64(self, image_path: str) -> str:
         """Convert an image file to base64-encoded string.
 
@@ -84,8 +531,13 @@ class PDFProcessor:
         """
         try:
             with open(image_path, "rb") as image_file:
-                encoded_string = base64.b64encode(image_file.read()).decode("utf-8")
-            return encoded_string
+                if os.fstat(image_file.fileno()).st_size == 0:
+                    return ""
+                # Encode straight from the page cache, without first copying
+                # the whole image into a bytes object
+                with mmap.mmap(image_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    encoded: bytes = b64encode(mapped)
+                return encoded.decode("ascii")
         except Exception as e:
-            print(f"Error encoding image {image_path}: {e}")
+            logger.error("Error encoding image %s: %s", image_path, e)
             return ""
@@ -4,11 +4,42 @@ Vision-Based Document Summarization
 Uses OpenAI's vision capabilities to analyze and summarize document pages.
 """
 
-import base64
+import hashlib
+import logging
 import os
-from typing import Any, Dict, List
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-from openai import OpenAI
+import orjson
+from openai import (
+    APIConnectionError,
+    DefaultHttpxClient,
+    InternalServerError,
+    OpenAI,
+    RateLimitError,
+)
+
+from lawdit._storage import b64encode
+
+logger = logging.getLogger(__name__)
+
+# JPEG files start with an SOI marker; anything else is sent as PNG
+_JPEG_MAGIC = b"\xff\xd8\xff"
+
+# Transient API failures (429, 5xx, connection errors) are retried with
+# exponential backoff and full jitter, honouring Retry-After when present
+_RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, InternalServerError)
+MAX_RETRIES = 5
+_BACKOFF_INITIAL = 1.0
+_BACKOFF_MAX = 30.0
+
+# Summaries returned in place of a page or document whose request failed, so
+# callers can tell failed results apart from real summaries
+PAGE_ERROR_PREFIX = "Error processing page"
+DOCUMENT_ERROR_PREFIX = "Error summarizing document"
 
 
 class VisionSummarizer:
@@ -20,17 +51,131 @@ class VisionSummarizer:
     and need cost-efficient analysis.
     """
 
-    def __init__(self, api_key: str = None):
+    def __init__(
+        self, api_key: Optional[str] = None, cache_dir: Optional[str] = None, http2: bool = False
+    ):
         """Initialize the vision summarizer.
 
+        The OpenAI client keeps a pool of keep-alive connections and is safe to
+        share between threads, so one summarizer serves all concurrent page
+        requests without repeating TLS handshakes.
+
         Args:
             api_key: OpenAI API key. If not provided, will look for
                     OPENAI_API_KEY environment variable.
+            cache_dir: Optional directory for caching page summaries by image
+                      content hash. Caching is disabled when not provided.
+            http2: Multiplex concurrent requests over HTTP/2 connections.
+                  Requires the h2 package (pip install 'httpx[http2]').
         """
-        self.client = OpenAI(api_key=api_key or os.environ.get("OPENAI_API_KEY"))
+        api_key = api_key or os.environ.get("OPENAI_API_KEY")
+        # Retries are handled by _create_completion; leaving the SDK's own
+        # retries on would multiply the attempts made against a rate limit
+        if http2:
+            self.client = OpenAI(
+                api_key=api_key, max_retries=0, http_client=DefaultHttpxClient(http2=True)
+            )
+        else:
+            self.client = OpenAI(api_key=api_key, max_retries=0)
+        self.max_retries = MAX_RETRIES
         self.model = "gpt-5-nano"  # Cost-optimized model for vision tasks
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+
+    def close(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        self.client.close()
+
+    def __enter__(self) -> "VisionSummarizer":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _create_completion(self, **kwargs: Any) -> Any:
+        """Call the chat completions API, retrying transient failures.
 
-    def summarize_page_image(self, image_path: str, page_number: int) -> str:
+        Without this a single rate-limit response would turn a page into an
+        error summary, which is far more expensive to redo than a short wait.
+
+        Args:
+            **kwargs: Arguments for client.chat.completions.create
+
+        Returns:
+            The chat completion response
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self.client.chat.completions.create(**kwargs)
+            except _RETRYABLE_ERRORS as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self._retry_delay(e, attempt)
+                logger.warning("Vision API %s, retrying in %.1fs", type(e).__name__, delay)
+                time.sleep(delay)
+
+    @staticmethod
+    def _retry_delay(error: Exception, attempt: int) -> float:
+        """Return the wait before the next attempt, preferring Retry-After."""
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), _BACKOFF_MAX)
+            except ValueError:
+                pass
+        return random.uniform(0, min(_BACKOFF_MAX, _BACKOFF_INITIAL * 2**attempt))
+
+    def _cache_path(self, image_bytes: bytes, page_number: int) -> Path:
+        """Return the cache file for a page image.
+
+        The key covers the image content, the model and the page number,
+        since the page number is part of the prompt. Only called when caching
+        is enabled.
+        """
+        assert self.cache_dir is not None
+        digest = hashlib.sha256(image_bytes)
+        digest.update(f"\0{self.model}\0{page_number}".encode("utf-8"))
+        key = digest.hexdigest()
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _read_cache(self, cache_path: Path) -> Optional[str]:
+        """Return a cached summary, or None on a miss or unreadable entry."""
+        try:
+            summary = orjson.loads(cache_path.read_bytes())["summary"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return summary if isinstance(summary, str) else None
+
+    def _write_cache(self, cache_path: Path, summary: str) -> None:
+        """Atomically store a summary so concurrent writers never see partial files."""
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(orjson.dumps({"summary": summary}))
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning("Could not write vision cache entry %s: %s", cache_path, e)
+
+    @staticmethod
+    def _read_image(image: Union[str, bytes]) -> bytes:
+        """Return the encoded image bytes, reading them from disk if given a path."""
+        if isinstance(image, bytes):
+            return image
+        with open(image, "rb") as image_file:
+            return image_file.read()
+
+    @staticmethod
+    def _image_part(image_bytes: bytes) -> Dict[str, Any]:
+        """Build the image_url message part for a page image."""
+        base64_image = b64encode(image_bytes).decode("utf-8")
+        media_type = "image/jpeg" if image_bytes.startswith(_JPEG_MAGIC) else "image/png"
+        return {
+            "type": "image_url",
+            "image_url": {"url": f"data:{media_type};base64,{base64_image}"},
+        }
+
+    def summarize_page_image(self, image: Union[str, bytes], page_number: int) -> str:
         """Analyze a page image and generate a summary description.
 
         This method sends a page image to GPT-4 Vision with instructions to
@@ -39,16 +184,23 @@ class VisionSummarizer:
         remaining concise.
 
         Args:
-            image_path: Path to the page image file
+            image: Path to the page image file, or the encoded image bytes
             page_number: The page number (for context in the prompt)
 
         Returns:
             A text summary of the page contents
         """
         try:
-            # Read and encode the image
-            with open(image_path, "rb") as image_file:
-                base64_image = base64.b64encode(image_file.read()).decode("utf-8")
+            # Read the image and check the content-hash cache before calling the API
+            image_bytes = self._read_image(image)
+
+            cache_path = None
+            if self.cache_dir is not None:
+                cache_path = self._cache_path(image_bytes, page_number)
+                cached = self._read_cache(cache_path)
+                if cached is not None:
+                    logger.debug("Summarized page %d (cached)", page_number)
+                    return cached
 
             # Construct the prompt for page analysis
             # This prompt guides the model to extract structured information
@@ -65,19 +217,14 @@ Be specific and factual. Focus on information that would be relevant for legal r
 Keep your summary to 2-3 sentences unless the page contains complex information requiring more detail."""
 
             # Call OpenAI's vision API
-            response = self.client.chat.completions.create(
+            response = self._create_completion(
                 model=self.model,
                 messages=[
                     {
                         "role": "user",
                         "content": [
                             {"type": "text", "text": prompt},
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/png;base64,{base64_image}"
-                                },
-                            },
+                            self._image_part(image_bytes),
                         ],
                     }
                 ],
@@ -85,14 +232,104 @@ Keep your summary to 2-3 sentences unless the page contains complex information
             )
 
             # Extract the text summary from the response
-            summary = response.choices[0].message.content
+            summary: str = response.choices[0].message.content or ""
 
-            print(f"Summarized page {page_number}: {summary[:100]}...")
+            if cache_path is not None and summary:
+                self._write_cache(cache_path, summary)
+
+            logger.debug("Summarized page %d: %.100s...", page_number, summary)
             return summary
 
         except Exception as e:
-            print(f"Error summarizing page {page_number} from {image_path}: {e}")
-            return f"Error processing page {page_number}"
+            source = image if isinstance(image, str) else "in-memory image"
+            logger.error("Error summarizing page %d from %s: %s", page_number, source, e)
+            return f"{PAGE_ERROR_PREFIX} {page_number}"
+
+    def summarize_page_batch(
+        self, images: List[Union[str, bytes]], start_page_num: int
+    ) -> List[str]:
+        """Summarize several consecutive pages in a single vision request.
+
+        Sending a handful of pages per request saves round-trips and lets the
+        model use neighbouring pages as context. The model is asked for a JSON
+        object with one summary per page; cached pages are not resent, and any
+        page missing from the response falls back to summarize_page_image.
+
+        Args:
+            images: Paths to consecutive page images, or their encoded bytes
+            start_page_num: Page number of the first image
+
+        Returns:
+            One text summary per image, in the same order as images
+        """
+        # Every slot is filled below, from the cache, the batch response or a
+        # single-page fallback
+        summaries = [""] * len(images)
+        pending: List[Tuple[int, int, bytes, Optional[Path]]] = []
+        for idx, image in enumerate(images):
+            page_number = start_page_num + idx
+            try:
+                image_bytes = self._read_image(image)
+            except OSError as e:
+                logger.error("Error summarizing page %d from %s: %s", page_number, image, e)
+                summaries[idx] = f"{PAGE_ERROR_PREFIX} {page_number}"
+                continue
+
+            cache_path = None
+            if self.cache_dir is not None:
+                cache_path = self._cache_path(image_bytes, page_number)
+                cached = self._read_cache(cache_path)
+                if cached is not None:
+                    summaries[idx] = cached
+                    continue
+            pending.append((idx, page_number, image_bytes, cache_path))
+
+        if not pending:
+            return summaries
+
+        page_list = ", ".join(str(page_number) for _, page_number, _, _ in pending)
+        prompt = f"""You are analyzing pages {page_list} of a legal document.
+For each page, provide a concise summary that captures:
+
+1. The type of content on the page (e.g., contract clause, financial table, signature block, exhibit)
+2. Key information present (parties, dates, amounts, obligations, terms)
+3. Any notable or concerning provisions
+4. References to other documents or sections
+
+Be specific and factual. Keep each summary to 2-3 sentences unless the page is complex.
+Respond with a JSON object of the form {{"pages": [{{"n": <page number>, "summary": "<summary>"}}]}}."""
+
+        content: List[Dict[str, Any]] = [{"type": "text", "text": prompt}]
+        for idx, page_number, image_bytes, _ in pending:
+            content.append({"type": "text", "text": f"Page {page_number}:"})
+            content.append(self._image_part(image_bytes))
+
+        try:
+            response = self._create_completion(
+                model=self.model,
+                messages=[{"role": "user", "content": content}],
+                response_format={"type": "json_object"},
+                max_tokens=300 * len(pending),
+            )
+            parsed = orjson.loads(response.choices[0].message.content)
+            by_page = {int(page["n"]): page["summary"] for page in parsed["pages"]}
+        except Exception as e:
+            logger.warning(
+                "Error summarizing pages %s, retrying one page at a time: %s", page_list, e
+            )
+            by_page = {}
+
+        for idx, page_number, _, cache_path in pending:
+            summary = by_page.get(page_number)
+            if not summary:
+                summaries[idx] = self.summarize_page_image(images[idx], page_number)
+                continue
+            if cache_path is not None:
+                self._write_cache(cache_path, summary)
+            logger.debug("Summarized page %d: %.100s...", page_number, summary)
+            summaries[idx] = summary
+
+        return summaries
 
     def summarize_document_from_pages(
         self, page_summaries: List[Dict[str, Any]], document_name: str
@@ -140,17 +377,17 @@ Focus on information that would help a legal analyst understand this document's
 significance without reading every page."""
 
             # Call OpenAI API for document-level summarization
-            response = self.client.chat.completions.create(
+            response = self._create_completion(
                 model="gpt-5-nano",
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=500,
             )
 
-            summary = response.choices[0].message.content
+            summary: str = response.choices[0].message.content or ""
 
-            print(f"Created document summary for {document_name}")
+            logger.info("Created document summary for %s", document_name)
             return summary
 
         except Exception as e:
-            print(f"Error creating document summary for {document_name}: {e}")
-            return f"Error summarizing document {document_name}"
+            logger.error("Error creating document summary for %s: %s", document_name, e)
+            return f"{DOCUMENT_ERROR_PREFIX} {document_name}"
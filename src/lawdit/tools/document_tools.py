@@ -4,15 +4,200 @@ Document Retrieval Tools
 Tools for accessing indexed documents and their content.
 """
 
-import base64
-import json
+import functools
+import mmap
 import os
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
+from html import unescape
 from pathlib import Path
-from typing import Any, Dict, List, Literal
+from typing import Any, Dict, Iterator, List, Literal, Optional, Tuple, Union
 
+import orjson
 import requests
 from langchain_core.tools import tool
+from requests.adapters import HTTPAdapter
 from tavily import TavilyClient
+from urllib3.util.retry import Retry
+
+from lawdit._storage import PAGES_B64_BLOB, PAGES_B64_INDEX, RECORDS_INDEX_NAME, b64encode
+
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
+# Patterns used by web_fetch to strip a page down to its text when selectolax
+# is not installed
+_SCRIPT_RE = re.compile(r"<script[^>]*>.*?</script>", re.DOTALL)
+_STYLE_RE = re.compile(r"<style[^>]*>.*?</style>", re.DOTALL)
+_TAG_RE = re.compile(r"<[^>]+>")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Most HTML bytes web_fetch reads before stripping; pages are cut to 10,000
+# characters of text, and markup and scripts rarely exceed this ahead of that
+WEB_FETCH_MAX_BYTES = 512 * 1024
+
+# Threads reading legacy per-document record files at startup
+RECORD_LOAD_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# File extensions the indexer saves page images with
+PAGE_IMAGE_EXTENSIONS = ("png", "jpg")
+
+# Raw bytes behind the 100-character base64 preview shown for each page
+PREVIEW_RAW_BYTES = 75
+
+
+def _html_to_text(html: str) -> str:
+    """Strip a page's markup, scripts and styles down to whitespace-collapsed text.
+
+    Uses selectolax's C HTML parser when it is installed, and otherwise falls
+    back to regular expressions.
+
+    Args:
+        html: Decoded HTML of the page
+
+    Returns:
+        Visible text of the page with entities unescaped
+    """
+    if HTMLParser is not None:
+        tree = HTMLParser(html)
+        for node in tree.css("script, style"):
+            node.decompose()
+        root = tree.body or tree.root
+        if root is None:
+            return ""
+        return " ".join(root.text(separator=" ").split())
+
+    text = _SCRIPT_RE.sub("", html)
+    text = _STYLE_RE.sub("", text)
+    text = _TAG_RE.sub(" ", text)
+    text = _WHITESPACE_RE.sub(" ", text)
+    return unescape(text).strip()
+
+
+@functools.lru_cache(maxsize=4)
+def _tavily_client(api_key: str) -> TavilyClient:
+    """Return a Tavily client for an API key, reused across tool calls."""
+    return TavilyClient(api_key=api_key)
+
+
+@functools.lru_cache(maxsize=None)
+def _http_session() -> requests.Session:
+    """Return the shared HTTP session used by web_fetch.
+
+    Reusing one session keeps connections to recently fetched hosts alive, so
+    repeated fetches skip the TCP and TLS handshakes. Connection failures and
+    transient server errors are retried twice with a short backoff.
+    """
+    retry = Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _iter_record_files(working_dir: Path) -> Iterator[str]:
+    """Yield the path of each document directory's document_record.json.
+
+    Scans the working directory once with ``os.scandir``, whose entries carry
+    their file type, instead of globbing into every subdirectory.
+
+    Args:
+        working_dir: Data room working directory
+
+    Yields:
+        Paths of the record files, in directory order
+    """
+    with os.scandir(working_dir) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                record_file = os.path.join(entry.path, "document_record.json")
+                if os.path.exists(record_file):
+                    yield record_file
+
+
+def _read_bytes(path: str) -> bytes:
+    """Read a whole file."""
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _encoded_length(size: int) -> int:
+    """Return the length of the padded base64 encoding of size bytes."""
+    return 4 * ((size + 2) // 3)
+
+
+def _list_page_files(pages_dir: Path) -> Dict[int, str]:
+    """Map page numbers to the page image files present in a pages directory.
+
+    Pages are saved as ``page_NNNN.png`` or, when indexed as JPEG,
+    ``page_NNNN.jpg``.
+
+    Args:
+        pages_dir: Directory holding a document's page images
+
+    Returns:
+        Path of each page image keyed by page number
+    """
+    page_files: Dict[int, str] = {}
+    with os.scandir(pages_dir) as entries:
+        for entry in entries:
+            stem, _, extension = entry.name.rpartition(".")
+            number = stem[len("page_") :]
+            if (
+                extension in PAGE_IMAGE_EXTENSIONS
+                and stem.startswith("page_")
+                and number.isdigit()
+                and entry.is_file()
+            ):
+                page_files[int(number)] = entry.path
+    return page_files
+
+
+def _page_preview(page_file: Union[str, Path]) -> Optional[Tuple[bytes, int]]:
+    """Return the base64 preview and full encoded length of a page image.
+
+    Only the first PREVIEW_RAW_BYTES bytes are read and encoded; the encoded
+    length is computed from the file size, so the page is never read whole.
+
+    Args:
+        page_file: Path to the page image
+
+    Returns:
+        (preview, encoded_length), or None if the file does not exist
+    """
+    try:
+        with open(page_file, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            head = f.read(PREVIEW_RAW_BYTES)
+    except FileNotFoundError:
+        return None
+    return b64encode(head), _encoded_length(size)
+
+
+def _page_data(page_file: Union[str, Path]) -> Optional[Tuple[bytes, int]]:
+    """Return the full base64 encoding of a page image and its length.
+
+    The file is encoded straight from a read-only mapping rather than first
+    being copied into a bytes object.
+
+    Args:
+        page_file: Path to the page image
+
+    Returns:
+        (encoded, encoded_length), or None if the file does not exist
+    """
+    try:
+        with open(page_file, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b"", 0
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                encoded = b64encode(mapped)
+    except FileNotFoundError:
+        return None
+    return encoded, len(encoded)
 
 
 class DocumentStore:
@@ -28,28 +213,109 @@ class DocumentStore:
         self.index_path = Path(index_path)
         self.working_dir = Path(working_dir)
         self.documents: Dict[str, Dict[str, Any]] = {}
+        # doc_id -> (mapped base64 blob, page offsets), or None if not available
+        self._page_blobs: Dict[str, Optional[Tuple[mmap.mmap, Dict[str, List[int]]]]] = {}
+        # doc_id -> formatted summary; records do not change after loading
+        self._summary_cache: Dict[str, str] = {}
         self._load_documents()
 
+    def read_index(self) -> str:
+        """Read the data room index text.
+
+        The index file is memory-mapped and decoded straight from the mapping,
+        so the returned string is the only copy allocated on the Python heap.
+
+        Returns:
+            The contents of the index file
+        """
+        if not self.index_path.stat().st_size:
+            return ""
+        with open(self.index_path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mm:
+            return str(mm, "utf-8")
+
     def _load_documents(self) -> None:
-        """Load document records from the working directory."""
+        """Load document records from the working directory.
+
+        Records are read from the merged index.jsonl in a single pass. Working
+        directories built before that index existed are loaded record by
+        record instead, and the merged index is written for the next start.
+        """
         if not self.working_dir.exists():
             print(f"Warning: Working directory not found: {self.working_dir}")
             return
 
-        # Find all document_record.json files
-        for record_file in self.working_dir.glob("*/document_record.json"):
+        records_index = self.working_dir / RECORDS_INDEX_NAME
+        if records_index.exists():
             try:
-                with open(record_file, "r") as f:
-                    doc_record = json.load(f)
+                self._load_records_index(records_index)
+            except Exception as e:
+                print(f"Error loading records index {records_index}: {e}")
+                self.documents = {}
+            else:
+                self._index_pages()
+                print(f"Loaded {len(self.documents)} documents from {self.working_dir}")
+                return
+
+        self._load_record_files()
+        self._write_records_index(records_index)
+        self._index_pages()
+        print(f"Loaded {len(self.documents)} documents from {self.working_dir}")
+
+    def _index_pages(self) -> None:
+        """Map each loaded record's page numbers to their summaries for constant-time lookup."""
+        for doc_record in self.documents.values():
+            doc_record["_page_summaries"] = {
+                page["page_num"]: page["summary"] for page in doc_record.get("pages", [])
+            }
+
+    def _load_records_index(self, records_index: Path) -> None:
+        """Load every document record from the merged JSON Lines index."""
+        with open(records_index, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                doc_record = orjson.loads(line)
+                doc_record["_dir_path"] = str(self.working_dir / doc_record.pop("record_dir"))
+                self.documents[doc_record["doc_id"]] = doc_record
+
+    def _write_records_index(self, records_index: Path) -> None:
+        """Write the loaded records as a merged index, migrating a legacy working dir."""
+        if not self.documents:
+            return
+        tmp_path = records_index.with_suffix(".jsonl.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                for doc_record in self.documents.values():
+                    line = {k: v for k, v in doc_record.items() if not k.startswith("_")}
+                    line["record_dir"] = Path(doc_record["_dir_path"]).name
+                    f.write(orjson.dumps(line))
+                    f.write(b"\n")
+            os.replace(tmp_path, records_index)
+        except OSError as e:
+            print(f"Warning: could not write records index {records_index}: {e}")
+
+    def _load_record_files(self) -> None:
+        """Load document records from each document's document_record.json."""
+        record_files = list(_iter_record_files(self.working_dir))
+        if not record_files:
+            return
+
+        # Overlap the file reads; results are consumed in directory order
+        workers = min(len(record_files), RECORD_LOAD_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            reads = [pool.submit(_read_bytes, record_file) for record_file in record_files]
+            for record_file, read in zip(record_files, reads):
+                try:
+                    doc_record = orjson.loads(read.result())
                     doc_id = doc_record.get("doc_id")
                     if doc_id:
                         # Store path to the document directory
-                        doc_record["_dir_path"] = str(record_file.parent)
+                        doc_record["_dir_path"] = os.path.dirname(record_file)
                         self.documents[doc_id] = doc_record
-            except Exception as e:
-                print(f"Error loading document record {record_file}: {e}")
-
-        print(f"Loaded {len(self.documents)} documents from {self.working_dir}")
+                except Exception as e:
+                    print(f"Error loading document record {record_file}: {e}")
 
     def get_document_summary(self, doc_id: str) -> str:
         """Get the complete summary of a document.
@@ -62,6 +328,8 @@ class DocumentStore:
         """
         if doc_id not in self.documents:
             return f"Error: Document {doc_id} not found in store"
+        if doc_id in self._summary_cache:
+            return self._summary_cache[doc_id]
 
         doc = self.documents[doc_id]
         summary_parts = [
@@ -76,79 +344,172 @@ class DocumentStore:
         for page in doc.get("pages", []):
             summary_parts.append(f"\nPage {page['page_num']}: {page['summary']}")
 
-        return "\n".join(summary_parts)
+        summary = self._summary_cache[doc_id] = "\n".join(summary_parts)
+        return summary
 
-    def get_document_pages(self, doc_id: str, page_nums: List[int]) -> str:
+    def _page_blob(
+        self, doc_id: str, pages_dir: Path
+    ) -> Optional[Tuple[mmap.mmap, Dict[str, List[int]]]]:
+        """Return the memory-mapped base64 page blob of a document, if indexed.
+
+        The blob is written at indexing time (see PDFProcessor.iter_pages) and
+        mapped on first use, so serving a page is a slice of the mapping rather
+        than a file read plus a base64 encode.
+        """
+        if doc_id not in self._page_blobs:
+            try:
+                offsets = orjson.loads((pages_dir / PAGES_B64_INDEX).read_bytes())
+                with open(pages_dir / PAGES_B64_BLOB, "rb") as f:
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                self._page_blobs[doc_id] = None
+            else:
+                # Pages are requested in no particular order; skip readahead
+                if hasattr(mmap, "MADV_RANDOM"):
+                    mm.madvise(mmap.MADV_RANDOM)
+                self._page_blobs[doc_id] = (mm, offsets)
+        return self._page_blobs[doc_id]
+
+    def close(self) -> None:
+        """Unmap the page blobs mapped so far.
+
+        The store stays usable; a blob is mapped again when next needed.
+        """
+        for page_blob in self._page_blobs.values():
+            if page_blob is not None:
+                page_blob[0].close()
+        self._page_blobs.clear()
+
+    def get_document_pages(
+        self, doc_id: str, page_nums: List[int], preview_only: bool = True
+    ) -> str:
         """Get images of specific pages from a document.
 
         Args:
             doc_id: Document identifier
             page_nums: List of page numbers to retrieve
+            preview_only: Return only the first 100 base64 characters and the
+                full encoded length of each page, without encoding the whole
+                image; pass False to include the complete base64 data
 
         Returns:
             Base64-encoded images with metadata
         """
+        return "\n".join(self._iter_document_pages(doc_id, page_nums, preview_only))
+
+    def _iter_document_pages(
+        self, doc_id: str, page_nums: List[int], preview_only: bool = True
+    ) -> Iterator[str]:
+        """Yield the sections of a get_document_pages response one at a time.
+
+        Callers that can consume the sections incrementally avoid holding
+        every page's section in a list before a final join.
+
+        Args:
+            doc_id: Document identifier
+            page_nums: List of page numbers to retrieve
+            preview_only: Whether to emit only a preview of each page's base64
+
+        Yields:
+            The response header, then one section per requested page
+        """
         if doc_id not in self.documents:
-            return f"Error: Document {doc_id} not found in store"
+            yield f"Error: Document {doc_id} not found in store"
+            return
 
         doc = self.documents[doc_id]
         doc_dir = Path(doc.get("_dir_path", ""))
 
         if not doc_dir.exists():
-            return f"Error: Document directory not found for {doc_id}"
+            yield f"Error: Document directory not found for {doc_id}"
+            return
 
         pages_dir = doc_dir / "pages"
         if not pages_dir.exists():
-            return f"Error: Pages directory not found for {doc_id}"
+            yield f"Error: Pages directory not found for {doc_id}"
+            return
 
-        result_parts = [f"Document: {doc['file_name']}", f"Requested pages: {page_nums}\n"]
+        page_summaries = doc.get("_page_summaries", {})
+        yield f"Document: {doc['file_name']}"
+        yield f"Requested pages: {page_nums}\n"
+        page_blob = self._page_blob(doc_id, pages_dir)
+
+        # Pages that were not pre-encoded are read from disk; issue all of
+        # those reads at once instead of one after another
+        file_pages = {
+            page_num
+            for page_num in page_nums
+            if page_blob is None or str(page_num) not in page_blob[1]
+        }
+        read_page = _page_preview if preview_only else _page_data
+        file_reads: Dict[int, Future] = {}
+        if file_pages:
+            # One directory listing answers which page files exist, instead of
+            # probing the filesystem separately for each page
+            page_files = _list_page_files(pages_dir)
+            present = file_pages & page_files.keys()
+            if present:
+                with ThreadPoolExecutor(max_workers=min(len(present), 8)) as pool:
+                    for page_num in present:
+                        file_reads[page_num] = pool.submit(read_page, page_files[page_num])
 
         for page_num in page_nums:
-            # Find the page image file
-            page_file = pages_dir / f"page_{page_num:04d}.png"
-
-            if not page_file.exists():
-                result_parts.append(f"\nPage {page_num}: Not found")
+            if page_num in file_pages and page_num not in file_reads:
+                yield f"\nPage {page_num}: Not found"
                 continue
-
-            try:
-                # Read and encode the image
-                with open(page_file, "rb") as f:
-                    image_data = base64.b64encode(f.read()).decode("utf-8")
-
-                # Get the summary for this page if available
-                page_summary = ""
-                for page in doc.get("pages", []):
-                    if page["page_num"] == page_num:
-                        page_summary = page["summary"]
-                        break
-
-                result_parts.append(
-                    f"\nPage {page_num}:\n"
-                    f"Summary: {page_summary}\n"
-                    f"Image (base64, first 100 chars): {image_data[:100]}..."
-                    f"\n[Full image data: {len(image_data)} characters]"
-                )
-
-            except Exception as e:
-                result_parts.append(f"\nPage {page_num}: Error reading image - {e}")
-
-        return "\n".join(result_parts)
+            if page_num not in file_reads:
+                # Pre-encoded at indexing time: only the part being returned is
+                # copied out of the mapping, the length comes from the index
+                assert page_blob is not None
+                mm, offsets = page_blob
+                offset, length = offsets[str(page_num)]
+                image_b64 = mm[offset : offset + (min(length, 100) if preview_only else length)]
+            else:
+                try:
+                    page_image = file_reads[page_num].result()
+                except Exception as e:
+                    yield f"\nPage {page_num}: Error reading image - {e}"
+                    continue
+                if page_image is None:
+                    yield f"\nPage {page_num}: Not found"
+                    continue
+                image_b64, length = page_image
+
+            # Get the summary for this page if available
+            page_summary = page_summaries.get(page_num, "")
+
+            if preview_only:
+                image_line = f"Image (base64, first 100 chars): {image_b64.decode('ascii')}..."
+            else:
+                image_line = f"Image (base64): {image_b64.decode('ascii')}"
+
+            yield (
+                f"\nPage {page_num}:\n"
+                f"Summary: {page_summary}\n"
+                f"{image_line}"
+                f"\n[Full image data: {length} characters]"
+            )
 
 
 # Global document store instance
 _document_store: DocumentStore = None
 
 
-def initialize_document_store(index_path: str, working_dir: str = "./data_room_processing"):
+def initialize_document_store(index_path: str, working_dir: str = "./data_room_processing") -> str:
     """Initialize the global document store.
 
     Args:
         index_path: Path to the data room index file
         working_dir: Directory containing processed documents
+
+    Returns:
+        The data room index text, so callers do not need to read the file again
     """
     global _document_store
+    if _document_store is not None:
+        _document_store.close()
     _document_store = DocumentStore(index_path, working_dir)
+    return _document_store.read_index()
 
 
 def get_document_store() -> DocumentStore:
@@ -193,7 +554,7 @@ def get_document(doc_id: str) -> str:
 
 
 @tool
-def get_document_pages(doc_id: str, page_nums: List[int]) -> str:
+def get_document_pages(doc_id: str, page_nums: List[int], preview_only: bool = True) -> str:
     """Retrieve images of specific pages from a document for detailed review.
 
     This tool returns the actual page images for detailed examination when the
@@ -203,6 +564,8 @@ def get_document_pages(doc_id: str, page_nums: List[int]) -> str:
     Args:
         doc_id: The unique identifier for the document
         page_nums: List of page numbers to retrieve (e.g., [1, 5, 12])
+        preview_only: Return only a 100-character preview and the size of each
+            image (default); set to False to include the complete base64 data
 
     Returns:
         Base64-encoded images of the requested pages with metadata
@@ -217,7 +580,7 @@ def get_document_pages(doc_id: str, page_nums: List[int]) -> str:
     """
     try:
         store = get_document_store()
-        return store.get_document_pages(doc_id, page_nums)
+        return store.get_document_pages(doc_id, page_nums, preview_only)
     except Exception as e:
         return f"Error retrieving pages from document {doc_id}: {e}"
 
@@ -246,10 +609,8 @@ def internet_search(
         if not tavily_api_key:
             return "Error: TAVILY_API_KEY environment variable not set. Please configure your Tavily API key."
 
-        tavily_client = TavilyClient(api_key=tavily_api_key)
-
         # Perform the search
-        search_results = tavily_client.search(
+        search_results = _tavily_client(tavily_api_key).search(
             query=query,
             max_results=max_results,
             topic=topic,
@@ -296,39 +657,37 @@ def web_fetch(url: str) -> str:
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
 
-        # Fetch the web page
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-
-        # Try to use Tavily's extract endpoint for better content extraction
-        tavily_api_key = os.environ.get("TAVILY_API_KEY")
-        if tavily_api_key:
-            try:
-                tavily_client = TavilyClient(api_key=tavily_api_key)
-                extract_result = tavily_client.extract(urls=[url])
-
-                if extract_result and "results" in extract_result and extract_result["results"]:
-                    content = extract_result["results"][0].get("raw_content", "")
-                    if content:
-                        return f"Content from {url}:\n\n{content}"
-            except Exception:
-                # Fall back to basic extraction if Tavily extract fails
-                pass
-
-        # Basic fallback: return raw HTML with a note
-        from html import unescape
-        import re
-
-        # Remove script and style elements
-        text = re.sub(r"<script[^>]*>.*?</script>", "", response.text, flags=re.DOTALL)
-        text = re.sub(r"<style[^>]*>.*?</style>", "", text, flags=re.DOTALL)
-
-        # Remove HTML tags
-        text = re.sub(r"<[^>]+>", " ", text)
-
-        # Clean up whitespace
-        text = re.sub(r"\s+", " ", text)
-        text = unescape(text).strip()
+        # Fetch the web page; the body is only read if it is needed below
+        response = _http_session().get(url, headers=headers, timeout=10, stream=True)
+        try:
+            response.raise_for_status()
+
+            # Try to use Tavily's extract endpoint for better content extraction
+            tavily_api_key = os.environ.get("TAVILY_API_KEY")
+            if tavily_api_key:
+                try:
+                    extract_result = _tavily_client(tavily_api_key).extract(urls=[url])
+
+                    if (
+                        extract_result
+                        and "results" in extract_result
+                        and extract_result["results"]
+                    ):
+                        content = extract_result["results"][0].get("raw_content", "")
+                        if content:
+                            return f"Content from {url}:\n\n{content}"
+                except Exception:
+                    # Fall back to basic extraction if Tavily extract fails
+                    pass
+
+            # Only the start of the page can survive truncation, so stop reading there
+            raw = response.raw.read(WEB_FETCH_MAX_BYTES, decode_content=True)
+        finally:
+            response.close()
+        html = raw.decode(response.encoding or "utf-8", errors="replace")
+
+        # Basic fallback: strip the page down to its text
+        text = _html_to_text(html)
 
         # Limit length to avoid overwhelming context
         max_length = 10000
@@ -4,212 +4,46 @@ Document Generation Utilities
 Utilities for creating Word documents and HTML dashboards.
 """
 
+import os
+from collections import Counter
 from datetime import datetime
+from html import escape
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import IO, Any, Dict, Iterable, Iterator, List, Union
 
+import orjson
 from docx import Document
 from docx.enum.style import WD_STYLE_TYPE
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.shared import Inches, Pt, RGBColor
 
+# Font colors for the severity label of each risk in the Word report
+_SEVERITY_COLORS = {
+    "critical": RGBColor(192, 0, 0),
+    "high": RGBColor(255, 102, 0),
+    "medium": RGBColor(255, 192, 0),
+}
+
+# Markup for a single dashboard risk card. Kept at module scope so it is built
+# once and each risk only pays for a ``str.format`` call.
+_RISK_CARD_TEMPLATE = """
+            <div class="risk-card {severity_class}" data-category="{category}" data-severity="{severity}">
+                <div class="risk-header">
+                    <div class="risk-title">{title}</div>
+                    <span class="risk-severity severity-{severity_class}">{severity_label}</span>
+                </div>
+                <div class="risk-category">{category_label}</div>
+                <div class="risk-description">{description}</div>
+            </div>
+            """
 
-class WordDocumentGenerator:
-    """Generator for creating professional Word documents."""
-
-    def __init__(self):
-        """Initialize the document generator."""
-        self.doc = Document()
-        self._setup_styles()
-
-    def _setup_styles(self):
-        """Set up custom styles for the document."""
-        styles = self.doc.styles
-
-        # Title style
-        if "CustomTitle" not in styles:
-            title_style = styles.add_style("CustomTitle", WD_STYLE_TYPE.PARAGRAPH)
-            title_style.font.size = Pt(24)
-            title_style.font.bold = True
-            title_style.font.color.rgb = RGBColor(0, 51, 102)
-
-        # Heading styles are built-in, just configure them
-        for level in range(1, 4):
-            heading_style = styles[f"Heading {level}"]
-            heading_style.font.color.rgb = RGBColor(0, 51, 102)
-
-    def add_cover_page(self, title: str, subtitle: str = None):
-        """Add a cover page to the document.
-
-        Args:
-            title: Main title
-            subtitle: Optional subtitle
-        """
-        # Add title
-        title_para = self.doc.add_paragraph(title)
-        title_para.style = "CustomTitle"
-        title_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-        # Add space
-        self.doc.add_paragraph()
-
-        # Add subtitle if provided
-        if subtitle:
-            subtitle_para = self.doc.add_paragraph(subtitle)
-            subtitle_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            subtitle_para.runs[0].font.size = Pt(14)
-
-        # Add date
-        self.doc.add_paragraph()
-        date_para = self.doc.add_paragraph(f"Generated: {datetime.now().strftime('%B %d, %Y')}")
-        date_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-        # Page break
-        self.doc.add_page_break()
-
-    def add_executive_summary(self, summary_text: str):
-        """Add an executive summary section.
-
-        Args:
-            summary_text: The summary content
-        """
-        self.doc.add_heading("Executive Summary", level=1)
-        self.doc.add_paragraph(summary_text)
-        self.doc.add_page_break()
-
-    def add_table_of_contents(self):
-        """Add a placeholder for table of contents.
-
-        Note: Word table of contents must be generated within Word itself.
-        """
-        self.doc.add_heading("Table of Contents", level=1)
-        self.doc.add_paragraph(
-            "To generate the table of contents:\n"
-            "1. Click here\n"
-            "2. Go to References > Table of Contents\n"
-            "3. Choose a style"
-        )
-        self.doc.add_page_break()
-
-    def add_risk_section(
-        self, category: str, risks: List[Dict[str, Any]], overview: str = None
-    ):
-        """Add a risk category section.
-
-        Args:
-            category: Risk category name
-            risks: List of risk dictionaries
-            overview: Optional category overview
-        """
-        self.doc.add_heading(category, level=1)
-
-        if overview:
-            self.doc.add_paragraph(overview)
-            self.doc.add_paragraph()
-
-        for idx, risk in enumerate(risks, 1):
-            # Risk title
-            self.doc.add_heading(risk.get("title", f"Risk {idx}"), level=2)
-
-            # Severity
-            severity = risk.get("severity", "Unknown")
-            severity_para = self.doc.add_paragraph(f"Severity: ")
-            severity_run = severity_para.add_run(severity)
-            severity_run.bold = True
-
-            # Color code by severity
-            if severity.lower() == "critical":
-                severity_run.font.color.rgb = RGBColor(192, 0, 0)
-            elif severity.lower() == "high":
-                severity_run.font.color.rgb = RGBColor(255, 102, 0)
-            elif severity.lower() == "medium":
-                severity_run.font.color.rgb = RGBColor(255, 192, 0)
-
-            # Description
-            if "description" in risk:
-                self.doc.add_heading("Description", level=3)
-                self.doc.add_paragraph(risk["description"])
-
-            # Supporting Evidence
-            if "evidence" in risk:
-                self.doc.add_heading("Supporting Evidence", level=3)
-                self.doc.add_paragraph(risk["evidence"])
-
-            # Impact
-            if "impact" in risk:
-                self.doc.add_heading("Potential Impact", level=3)
-                self.doc.add_paragraph(risk["impact"])
-
-            # Recommendations
-            if "recommendations" in risk:
-                self.doc.add_heading("Recommendations", level=3)
-                self.doc.add_paragraph(risk["recommendations"])
-
-            self.doc.add_paragraph()  # Spacing
-
-    def add_risk_matrix_table(self, risks: List[Dict[str, Any]]):
-        """Add a summary risk matrix table.
-
-        Args:
-            risks: List of all risks
-        """
-        self.doc.add_heading("Risk Matrix Summary", level=2)
-
-        # Create table
-        table = self.doc.add_table(rows=1, cols=4)
-        table.style = "Light Grid Accent 1"
-
-        # Header row
-        header_cells = table.rows[0].cells
-        header_cells[0].text = "Risk"
-        header_cells[1].text = "Category"
-        header_cells[2].text = "Severity"
-        header_cells[3].text = "Documents"
-
-        # Add risks
-        for risk in risks:
-            row_cells = table.add_row().cells
-            row_cells[0].text = risk.get("title", "")
-            row_cells[1].text = risk.get("category", "")
-            row_cells[2].text = risk.get("severity", "")
-            row_cells[3].text = risk.get("documents", "")
-
-    def save(self, output_path: str):
-        """Save the document to a file.
-
-        Args:
-            output_path: Path to save the document
-        """
-        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-        self.doc.save(output_path)
-
-
-class DashboardGenerator:
-    """Generator for creating interactive HTML dashboards."""
-
-    def __init__(self):
-        """Initialize the dashboard generator."""
-        self.risks: List[Dict[str, Any]] = []
-        self.categories: List[str] = []
-        self.severities: List[str] = ["Critical", "High", "Medium", "Low"]
-
-    def add_risk(self, risk: Dict[str, Any]):
-        """Add a risk to the dashboard.
-
-        Args:
-            risk: Risk dictionary with title, category, severity, etc.
-        """
-        self.risks.append(risk)
-        if risk.get("category") and risk["category"] not in self.categories:
-            self.categories.append(risk["category"])
-
-    def generate_html(self) -> str:
-        """Generate the complete HTML dashboard.
+# The risk data is embedded in an inline <script>; escaping these characters as
+# JSON unicode escapes keeps risk text from closing the script element
+_SCRIPT_JSON_ESCAPES = str.maketrans({"<": "\\u003c", ">": "\\u003e", "&": "\\u0026"})
 
-        Returns:
-            HTML string for the dashboard
-        """
-        html = f"""<!DOCTYPE html>
+# Page markup for the dashboard; CSS and JavaScript braces are doubled for
+# ``str.format``, which fills in the counts, filter options, cards and data.
+_DASHBOARD_TEMPLATE = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -376,19 +210,19 @@ class DashboardGenerator:
 
         <div class="stats">
             <div class="stat-card">
-                <div class="stat-value" id="total-risks">{len(self.risks)}</div>
+                <div class="stat-value" id="total-risks">{total_risks}</div>
                 <div class="stat-label">Total Risks Identified</div>
             </div>
             <div class="stat-card">
-                <div class="stat-value" id="critical-count">{self._count_by_severity('Critical')}</div>
+                <div class="stat-value" id="critical-count">{critical_count}</div>
                 <div class="stat-label">Critical Risks</div>
             </div>
             <div class="stat-card">
-                <div class="stat-value" id="high-count">{self._count_by_severity('High')}</div>
+                <div class="stat-value" id="high-count">{high_count}</div>
                 <div class="stat-label">High Risks</div>
             </div>
             <div class="stat-card">
-                <div class="stat-value" id="category-count">{len(self.categories)}</div>
+                <div class="stat-value" id="category-count">{category_count}</div>
                 <div class="stat-label">Risk Categories</div>
             </div>
         </div>
@@ -398,14 +232,14 @@ class DashboardGenerator:
                 <label for="category-filter">Filter by Category:</label>
                 <select id="category-filter" onchange="filterRisks()">
                     <option value="">All Categories</option>
-                    {''.join(f'<option value="{cat}">{cat}</option>' for cat in self.categories)}
+                    {category_options}
                 </select>
             </div>
             <div class="filter-group">
                 <label for="severity-filter">Filter by Severity:</label>
                 <select id="severity-filter" onchange="filterRisks()">
                     <option value="">All Severities</option>
-                    {''.join(f'<option value="{sev}">{sev}</option>' for sev in self.severities)}
+                    {severity_options}
                 </select>
             </div>
             <div class="filter-group">
@@ -415,12 +249,12 @@ class DashboardGenerator:
         </div>
 
         <div class="risks-grid" id="risks-container">
-            {self._generate_risk_cards()}
+            {risk_cards}
         </div>
     </div>
 
     <script>
-        const risks = {self._risks_to_json()};
+        const risks = {risks_json};
 
         function filterRisks() {{
             const category = document.getElementById('category-filter').value.toLowerCase();
@@ -448,34 +282,301 @@ class DashboardGenerator:
     </script>
 </body>
 </html>"""
-        return html
+
+# The page is written in pieces around the risk cards and the risk data so a
+# large dashboard is never held as one string; the static pieces after the
+# head are formatted once here to undo their doubled braces.
+_DASHBOARD_HEAD, _rest = _DASHBOARD_TEMPLATE.split("{risk_cards}")
+_DASHBOARD_SCRIPT, _DASHBOARD_TAIL = (part.format() for part in _rest.split("{risks_json}"))
+del _rest
+
+
+class WordDocumentGenerator:
+    """Generator for creating professional Word documents."""
+
+    def __init__(self):
+        """Initialize the document generator."""
+        self.doc = Document()
+        self._generated_date = datetime.now().strftime("%B %d, %Y")
+        self._setup_styles()
+
+    def _setup_styles(self):
+        """Set up custom styles for the document."""
+        styles = self.doc.styles
+
+        # Title style
+        if "CustomTitle" not in styles:
+            title_style = styles.add_style("CustomTitle", WD_STYLE_TYPE.PARAGRAPH)
+            title_style.font.size = Pt(24)
+            title_style.font.bold = True
+            title_style.font.color.rgb = RGBColor(0, 51, 102)
+
+        # Heading styles are built-in, just configure them
+        for level in range(1, 4):
+            heading_style = styles[f"Heading {level}"]
+            heading_style.font.color.rgb = RGBColor(0, 51, 102)
+
+    def add_cover_page(self, title: str, subtitle: str = None):
+        """Add a cover page to the document.
+
+        Args:
+            title: Main title
+            subtitle: Optional subtitle
+        """
+        # Add title
+        title_para = self.doc.add_paragraph(title)
+        title_para.style = "CustomTitle"
+        title_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+        # Add space
+        self.doc.add_paragraph()
+
+        # Add subtitle if provided
+        if subtitle:
+            subtitle_para = self.doc.add_paragraph(subtitle)
+            subtitle_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            subtitle_para.runs[0].font.size = Pt(14)
+
+        # Add date
+        self.doc.add_paragraph()
+        date_para = self.doc.add_paragraph(f"Generated: {self._generated_date}")
+        date_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+        # Page break
+        self.doc.add_page_break()
+
+    def add_executive_summary(self, summary_text: str):
+        """Add an executive summary section.
+
+        Args:
+            summary_text: The summary content
+        """
+        self.doc.add_heading("Executive Summary", level=1)
+        self.doc.add_paragraph(summary_text)
+        self.doc.add_page_break()
+
+    def add_table_of_contents(self):
+        """Add a placeholder for table of contents.
+
+        Note: Word table of contents must be generated within Word itself.
+        """
+        self.doc.add_heading("Table of Contents", level=1)
+        self.doc.add_paragraph(
+            "To generate the table of contents:\n"
+            "1. Click here\n"
+            "2. Go to References > Table of Contents\n"
+            "3. Choose a style"
+        )
+        self.doc.add_page_break()
+
+    def add_risk_section(
+        self, category: str, risks: List[Dict[str, Any]], overview: str = None
+    ):
+        """Add a risk category section.
+
+        Args:
+            category: Risk category name
+            risks: List of risk dictionaries
+            overview: Optional category overview
+        """
+        self.doc.add_heading(category, level=1)
+
+        if overview:
+            self.doc.add_paragraph(overview)
+            self.doc.add_paragraph()
+
+        for idx, risk in enumerate(risks, 1):
+            # Risk title
+            self.doc.add_heading(risk.get("title", f"Risk {idx}"), level=2)
+
+            # Severity
+            severity = risk.get("severity", "Unknown")
+            severity_para = self.doc.add_paragraph(f"Severity: ")
+            severity_run = severity_para.add_run(severity)
+            severity_run.bold = True
+
+            # Color code by severity
+            color = _SEVERITY_COLORS.get(severity.lower())
+            if color is not None:
+                severity_run.font.color.rgb = color
+
+            # Description
+            if "description" in risk:
+                self.doc.add_heading("Description", level=3)
+                self.doc.add_paragraph(risk["description"])
+
+            # Supporting Evidence
+            if "evidence" in risk:
+                self.doc.add_heading("Supporting Evidence", level=3)
+                self.doc.add_paragraph(risk["evidence"])
+
+            # Impact
+            if "impact" in risk:
+                self.doc.add_heading("Potential Impact", level=3)
+                self.doc.add_paragraph(risk["impact"])
+
+            # Recommendations
+            if "recommendations" in risk:
+                self.doc.add_heading("Recommendations", level=3)
+                self.doc.add_paragraph(risk["recommendations"])
+
+            self.doc.add_paragraph()  # Spacing
+
+    def add_risk_matrix_table(self, risks: List[Dict[str, Any]]):
+        """Add a summary risk matrix table.
+
+        Args:
+            risks: List of all risks
+        """
+        self.doc.add_heading("Risk Matrix Summary", level=2)
+
+        # Create table
+        table = self.doc.add_table(rows=1, cols=4)
+        table.style = "Light Grid Accent 1"
+
+        # Header row
+        header_cells = table.rows[0].cells
+        header_cells[0].text = "Risk"
+        header_cells[1].text = "Category"
+        header_cells[2].text = "Severity"
+        header_cells[3].text = "Documents"
+
+        # Add risks
+        for risk in risks:
+            title_cell, category_cell, severity_cell, documents_cell = table.add_row().cells
+            title_cell.text = risk.get("title", "")
+            category_cell.text = risk.get("category", "")
+            severity_cell.text = risk.get("severity", "")
+            documents_cell.text = risk.get("documents", "")
+
+    def save(self, output_path: Union[str, os.PathLike, IO[bytes]]):
+        """Save the document to a file or a writable binary stream.
+
+        Passing a stream (e.g. an HTTP response body or ``io.BytesIO``) writes
+        the package straight through without a temporary file on disk.
+
+        Args:
+            output_path: Path to save the document, or a binary stream
+        """
+        if isinstance(output_path, (str, os.PathLike)):
+            output_path = os.fspath(output_path)
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        self.doc.save(output_path)
+
+
+def _escape_field(risk: Dict[str, Any], key: str, default: str = "") -> str:
+    """HTML-escape a risk field, which may be missing, None or not a string."""
+    value = risk.get(key)
+    return escape(default if value is None else str(value))
+
+
+class DashboardGenerator:
+    """Generator for creating interactive HTML dashboards."""
+
+    def __init__(self):
+        """Initialize the dashboard generator."""
+        self.risks: List[Dict[str, Any]] = []
+        self.categories: List[str] = []
+        self.severities: List[str] = ["Critical", "High", "Medium", "Low"]
+        self._cards: List[str] = []
+        self._severity_counts: Counter = Counter()
+
+    def add_risk(self, risk: Dict[str, Any]):
+        """Add a risk to the dashboard.
+
+        The risk card markup is rendered and the severity tallied once here,
+        so generating the dashboard only has to join the pre-rendered cards.
+
+        Args:
+            risk: Risk dictionary with title, category, severity, etc.
+        """
+        self.risks.append(risk)
+        self._cards.append(self._render_risk_card(risk))
+        self._severity_counts[risk.get("severity")] += 1
+        if risk.get("category") and risk["category"] not in self.categories:
+            self.categories.append(risk["category"])
+
+    def add_risks(self, risks: Iterable[Dict[str, Any]]) -> None:
+        """Add several risks to the dashboard in one call.
+
+        Args:
+            risks: Iterable of risk dictionaries
+        """
+        new_risks = list(risks)
+        self.risks.extend(new_risks)
+        self._cards.extend(self._render_risk_card(risk) for risk in new_risks)
+        self._severity_counts.update(risk.get("severity") for risk in new_risks)
+
+        seen = set(self.categories)
+        for risk in new_risks:
+            category = risk.get("category")
+            if category and category not in seen:
+                seen.add(category)
+                self.categories.append(category)
+
+    def generate_html(self) -> str:
+        """Generate the complete HTML dashboard.
+
+        Returns:
+            HTML string for the dashboard
+        """
+        return "".join(self._iter_html_chunks())
+
+    def _iter_html_chunks(self) -> Iterator[str]:
+        """Yield the dashboard HTML in order: head, each risk card, then the script.
+
+        Yields:
+            Consecutive pieces of the dashboard page
+        """
+        category_options = "".join(
+            f'<option value="{category}">{category}</option>'
+            for category in (escape(str(category)) for category in self.categories)
+        )
+        yield _DASHBOARD_HEAD.format(
+            total_risks=len(self.risks),
+            critical_count=self._count_by_severity("Critical"),
+            high_count=self._count_by_severity("High"),
+            category_count=len(self.categories),
+            category_options=category_options,
+            severity_options="".join(
+                f'<option value="{sev}">{sev}</option>' for sev in self.severities
+            ),
+        )
+        for i, card in enumerate(self._cards):
+            if i:
+                yield "\n"
+            yield card
+        yield _DASHBOARD_SCRIPT
+        yield self._risks_to_json()
+        yield _DASHBOARD_TAIL
 
     def _count_by_severity(self, severity: str) -> int:
         """Count risks by severity level."""
-        return sum(1 for r in self.risks if r.get("severity") == severity)
+        return self._severity_counts[severity]
+
+    @staticmethod
+    def _render_risk_card(risk: Dict[str, Any]) -> str:
+        """Render the HTML card for a single risk, escaping its text fields."""
+        severity = _escape_field(risk, "severity")
+        category = _escape_field(risk, "category")
+        severity_label = severity or "Unknown"
+        return _RISK_CARD_TEMPLATE.format(
+            severity_class=severity_label.lower(),
+            category=category,
+            severity=severity,
+            title=_escape_field(risk, "title", "Untitled Risk"),
+            severity_label=severity_label,
+            category_label=category or "Uncategorized",
+            description=_escape_field(risk, "description", "No description available."),
+        )
 
     def _generate_risk_cards(self) -> str:
         """Generate HTML for all risk cards."""
-        cards = []
-        for risk in self.risks:
-            severity = risk.get("severity", "Unknown").lower()
-            cards.append(f"""
-            <div class="risk-card {severity}" data-category="{risk.get('category', '')}" data-severity="{risk.get('severity', '')}">
-                <div class="risk-header">
-                    <div class="risk-title">{risk.get('title', 'Untitled Risk')}</div>
-                    <span class="risk-severity severity-{severity}">{risk.get('severity', 'Unknown')}</span>
-                </div>
-                <div class="risk-category">{risk.get('category', 'Uncategorized')}</div>
-                <div class="risk-description">{risk.get('description', 'No description available.')}</div>
-            </div>
-            """)
-        return '\n'.join(cards)
+        return "\n".join(self._cards)
 
     def _risks_to_json(self) -> str:
-        """Convert risks to JSON for JavaScript."""
-        import json
-
-        return json.dumps(self.risks)
+        """Convert risks to JSON for JavaScript, safe to embed in a script element."""
+        return orjson.dumps(self.risks).decode("utf-8").translate(_SCRIPT_JSON_ESCAPES)
 
     def save(self, output_path: str):
         """Save the dashboard to an HTML file.
@@ -484,6 +585,5 @@ class DashboardGenerator:
             output_path: Path to save the HTML file
         """
         Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-        html = self.generate_html()
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(html)
+        with open(output_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+            f.writelines(self._iter_html_chunks())
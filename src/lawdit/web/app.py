@@ -3,13 +3,15 @@ Streamlit Web Interface for Lawdit
 AI-Powered Legal Due Diligence Intelligence Tool
 """
 
-import os
-import sys
-from pathlib import Path
-from typing import Optional
+import importlib
+import threading
+from typing import Callable, Dict, Tuple
 
 import streamlit as st
 
+from lawdit.web import pages
+from lawdit.web.outputs import scan_outputs
+
 # Page configuration
 st.set_page_config(
     page_title="Lawdit - Legal Due Diligence Intelligence",
@@ -18,55 +20,56 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
-# Add custom CSS
-st.markdown(
-    """
-    <style>
-    .main-header {
-        font-size: 2.5rem;
-        font-weight: bold;
-        color: #1f77b4;
-        text-align: center;
-        margin-bottom: 1rem;
-    }
-    .sub-header {
-        font-size: 1.2rem;
-        color: #666;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    .status-box {
-        padding: 1rem;
-        border-radius: 0.5rem;
-        margin: 1rem 0;
-    }
-    .status-success {
-        background-color: #d4edda;
-        border-left: 4px solid #28a745;
-    }
-    .status-warning {
-        background-color: #fff3cd;
-        border-left: 4px solid #ffc107;
-    }
-    .status-error {
-        background-color: #f8d7da;
-        border-left: 4px solid #dc3545;
-    }
-    .status-info {
-        background-color: #d1ecf1;
-        border-left: 4px solid #17a2b8;
-    }
-    .metric-card {
-        background-color: #f8f9fa;
-        padding: 1.5rem;
-        border-radius: 0.5rem;
-        border-left: 4px solid #1f77b4;
-        margin: 0.5rem 0;
-    }
-    </style>
-    """,
-    unsafe_allow_html=True,
-)
+# Custom CSS. Streamlit drops any element a rerun does not emit again, so the
+# style block is written on every run rather than cached; it is kept as a
+# module constant so each run only sends the same string.
+CUSTOM_CSS = """
+<style>
+.main-header {
+    font-size: 2.5rem;
+    font-weight: bold;
+    color: #1f77b4;
+    text-align: center;
+    margin-bottom: 1rem;
+}
+.sub-header {
+    font-size: 1.2rem;
+    color: #666;
+    text-align: center;
+    margin-bottom: 2rem;
+}
+.status-box {
+    padding: 1rem;
+    border-radius: 0.5rem;
+    margin: 1rem 0;
+}
+.status-success {
+    background-color: #d4edda;
+    border-left: 4px solid #28a745;
+}
+.status-warning {
+    background-color: #fff3cd;
+    border-left: 4px solid #ffc107;
+}
+.status-error {
+    background-color: #f8d7da;
+    border-left: 4px solid #dc3545;
+}
+.status-info {
+    background-color: #d1ecf1;
+    border-left: 4px solid #17a2b8;
+}
+.metric-card {
+    background-color: #f8f9fa;
+    padding: 1.5rem;
+    border-radius: 0.5rem;
+    border-left: 4px solid #1f77b4;
+    margin: 0.5rem 0;
+}
+</style>
+"""
+
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 
 def main() -> None:
@@ -80,17 +83,7 @@ def main() -> None:
 
     # Sidebar navigation
     st.sidebar.title("Navigation")
-    page = st.sidebar.radio(
-        "Go to",
-        [
-            "🏠 Home",
-            "⚙️ Configuration",
-            "📥 Index Documents",
-            "🔍 Analyze Documents",
-            "📊 View Results",
-            "📄 Reports",
-        ],
-    )
+    page = st.sidebar.radio("Go to", PAGES)
 
     # Initialize session state
     if "config_valid" not in st.session_state:
@@ -101,18 +94,11 @@ def main() -> None:
         st.session_state.analysis_complete = False
 
     # Route to appropriate page
+    PAGE_DISPATCH[page]()
+
+    # Load the other pages while the user reads the home page
     if page == "🏠 Home":
-        show_home()
-    elif page == "⚙️ Configuration":
-        show_configuration()
-    elif page == "📥 Index Documents":
-        show_indexer()
-    elif page == "🔍 Analyze Documents":
-        show_analyzer()
-    elif page == "📊 View Results":
-        show_results()
-    elif page == "📄 Reports":
-        show_reports()
+        _prewarm_pages()
 
 
 def show_home() -> None:
@@ -177,12 +163,8 @@ def show_home() -> None:
         st.metric("Analysis Status", status)
 
     with col4:
-        output_dir = Path("./outputs")
-        report_count = (
-            len(list(output_dir.glob("*.docx"))) + len(list(output_dir.glob("*.html")))
-            if output_dir.exists()
-            else 0
-        )
+        outputs = scan_outputs("./outputs")
+        report_count = len(outputs.word_reports) + len(outputs.html_dashboards)
         st.metric("Reports Available", report_count)
 
     # Quick actions
@@ -207,39 +189,55 @@ def show_home() -> None:
             st.rerun()
 
 
-def show_configuration() -> None:
-    """Display configuration page for API keys and settings."""
-    from lawdit.web.pages import configuration
-
-    configuration.show()
-
-
-def show_indexer() -> None:
-    """Display indexer page for processing documents."""
-    from lawdit.web.pages import indexer
+def _lazy_page(module_name: str) -> Callable[[], None]:
+    """Return a renderer that imports a page module only when it is first shown.
 
-    indexer.show()
+    Args:
+        module_name: Module name within ``lawdit.web.pages``
 
+    Returns:
+        Function rendering the page via the module's ``show()``
+    """
 
-def show_analyzer() -> None:
-    """Display analyzer page for legal risk analysis."""
-    from lawdit.web.pages import analyzer
-
-    analyzer.show()
+    def show() -> None:
+        importlib.import_module(f"lawdit.web.pages.{module_name}").show()
 
+    return show
 
-def show_results() -> None:
-    """Display results page with visualizations."""
-    from lawdit.web.pages import results
 
-    results.show()
+def _import_pages() -> None:
+    """Import every page module, ignoring failures until the page is opened."""
+    for module_name in pages.__all__:
+        try:
+            importlib.import_module(f"lawdit.web.pages.{module_name}")
+        except Exception:
+            pass
 
 
-def show_reports() -> None:
-    """Display reports page for downloading deliverables."""
-    from lawdit.web.pages import reports
+@st.cache_resource
+def _prewarm_pages() -> threading.Thread:
+    """Import the page modules on a background thread, once per server process.
 
-    reports.show()
+    The first visit to each page then skips its cold import (and the indexer
+    and document libraries it pulls in).
+    """
+    thread = threading.Thread(target=_import_pages, name="lawdit-page-prewarm", daemon=True)
+    thread.start()
+    return thread
+
+
+# Sidebar label -> page renderer
+PAGE_DISPATCH: Dict[str, Callable[[], None]] = {
+    "🏠 Home": show_home,
+    "⚙️ Configuration": _lazy_page("configuration"),
+    "📥 Index Documents": _lazy_page("indexer"),
+    "🔍 Analyze Documents": _lazy_page("analyzer"),
+    "📊 View Results": _lazy_page("results"),
+    "📄 Reports": _lazy_page("reports"),
+}
+
+# Sidebar navigation options, in display order
+PAGES: Tuple[str, ...] = tuple(PAGE_DISPATCH)
 
 
 if __name__ == "__main__":
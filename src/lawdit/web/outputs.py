@@ -0,0 +1,101 @@
+"""Cached listings of the analysis output directory."""
+
+import functools
+import os
+import time
+from typing import List, NamedTuple, Tuple
+
+import streamlit as st
+
+# (file name, modification time, size in bytes) of one output file
+OutputEntry = Tuple[str, float, int]
+
+
+class OutputFiles(NamedTuple):
+    """Analysis outputs by kind, each most recently modified first."""
+
+    word_reports: Tuple[OutputEntry, ...]
+    html_dashboards: Tuple[OutputEntry, ...]
+    analysis_texts: Tuple[OutputEntry, ...]
+
+
+@st.cache_data(ttl=5)
+def scan_outputs(output_dir: str) -> OutputFiles:
+    """List the Word reports, HTML dashboards and analysis texts in a directory.
+
+    Every widget interaction reruns the page, so the listing is cached for a
+    few seconds instead of scanning the directory on every rerun. The files
+    are bucketed in one ``os.scandir`` pass, stat-ing each file once.
+    Call ``scan_outputs.clear()`` after writing new outputs to see them at once.
+
+    Args:
+        output_dir: Directory holding the analysis outputs
+
+    Returns:
+        The output files by kind; all empty if the directory does not exist
+    """
+    word_reports: List[OutputEntry] = []
+    html_dashboards: List[OutputEntry] = []
+    analysis_texts: List[OutputEntry] = []
+
+    try:
+        with os.scandir(output_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.endswith(".docx"):
+                    bucket = word_reports
+                elif name.endswith(".html"):
+                    bucket = html_dashboards
+                elif name.endswith(".txt") and "analysis" in name:
+                    bucket = analysis_texts
+                else:
+                    continue
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+                bucket.append((name, stat.st_mtime, stat.st_size))
+    except FileNotFoundError:
+        pass
+
+    def newest_first(bucket: List[OutputEntry]) -> Tuple[OutputEntry, ...]:
+        return tuple(sorted(bucket, key=lambda entry: entry[1], reverse=True))
+
+    return OutputFiles(
+        newest_first(word_reports), newest_first(html_dashboards), newest_first(analysis_texts)
+    )
+
+
+def format_mtime(mtime: float) -> str:
+    """Format a file modification time as local ``YYYY-MM-DD HH:MM``.
+
+    Args:
+        mtime: Modification time in seconds since the epoch
+
+    Returns:
+        The formatted time, to the minute
+    """
+    return _format_minute(int(mtime // 60) * 60)
+
+
+@functools.lru_cache(maxsize=512)
+def _format_minute(minute: int) -> str:
+    """Format a whole-minute timestamp; files written together share an entry."""
+    return time.strftime("%Y-%m-%d %H:%M", time.localtime(minute))
+
+
+@st.cache_data(max_entries=32)
+def read_output_bytes(path: str, mtime: float) -> bytes:
+    """Read an output file for a download button.
+
+    Download buttons are rebuilt on every rerun, so the bytes are cached and
+    a file is only read again once its modification time changes.
+
+    Args:
+        path: Path of the output file
+        mtime: Modification time of the file; part of the cache key
+
+    Returns:
+        The file contents
+    """
+    with open(path, "rb") as f:
+        return f.read()
@@ -2,12 +2,28 @@
 
 import os
 import subprocess
+import tempfile
+import threading
 import time
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 import streamlit as st
 
+from lawdit.web.outputs import format_mtime, read_output_bytes, scan_outputs
+
+# (marker printed by lawdit-analyze, progress %, status message) for each
+# stage of an analysis run, in the order the CLI reaches them
+ANALYSIS_STAGES = (
+    ("Step 1:", 20, "📖 Loading document index..."),
+    ("Step 2:", 30, "🤖 Creating legal risk analysis agents..."),
+    ("Step 3:", 45, "⚖️ Analyzing legal risks..."),
+    ("ANALYSIS COMPLETE", 95, "📊 Deliverables generated..."),
+)
+
+# Bytes of output shown from the end of a failed analysis run
+OUTPUT_TAIL_BYTES = 8192
+
 
 def show() -> None:
     """Display analyzer page."""
@@ -19,13 +35,16 @@ def show() -> None:
         """
     )
 
+    session_state = st.session_state
+    selected_index = session_state.get("index_file")
+
     # Check if index exists
-    if not st.session_state.get("index_file"):
+    if not selected_index:
         st.warning(
             "⚠️ No index file selected. Please index documents first.", icon="⚠️"
         )
         if st.button("Go to Indexer"):
-            st.session_state.page = "📥 Index Documents"
+            session_state.page = "📥 Index Documents"
             st.rerun()
         return
 
@@ -38,7 +57,7 @@ def show() -> None:
         # Index file selection
         index_file = st.text_input(
             "Index File",
-            value=st.session_state.get("index_file", "./data_room_index.txt"),
+            value=selected_index,
             help="Path to the data room index file",
         )
 
@@ -109,7 +128,17 @@ def show() -> None:
     # Start analysis button
     st.markdown("---")
 
-    if not any([focus_contracts, focus_compliance, focus_litigation, focus_governance]):
+    focus_areas = [
+        area
+        for selected, area in (
+            (focus_contracts, "contracts"),
+            (focus_compliance, "compliance"),
+            (focus_litigation, "litigation"),
+            (focus_governance, "governance"),
+        )
+        if selected
+    ]
+    if not focus_areas:
         st.error("❌ Please select at least one focus area")
         return
 
@@ -120,20 +149,10 @@ def show() -> None:
             "🚀 Start Analysis",
             type="primary",
             use_container_width=True,
-            disabled=st.session_state.get("analysis_in_progress", False),
+            disabled=session_state.get("analysis_in_progress", False),
         )
 
     if start_button:
-        focus_areas = []
-        if focus_contracts:
-            focus_areas.append("contracts")
-        if focus_compliance:
-            focus_areas.append("compliance")
-        if focus_litigation:
-            focus_areas.append("litigation")
-        if focus_governance:
-            focus_areas.append("governance")
-
         run_analysis(
             index_file,
             output_dir,
@@ -144,163 +163,228 @@ def show() -> None:
             generate_dashboard,
         )
 
+    # Show the running or just-finished analysis
+    run = session_state.get("analysis_run")
+    if run is not None:
+        if run.finished:
+            # Shown once; the next rerun returns to the usual page
+            del session_state.analysis_run
+            session_state.analysis_in_progress = False
+            show_analysis_result(run)
+        else:
+            show_analysis_progress()
+
     # Show previous analysis results
     st.markdown("---")
     show_previous_analyses(output_dir)
 
 
-def run_analysis(
-    index_file: str,
-    output_dir: str,
-    focus_areas: list,
-    use_web_search: bool,
-    max_iterations: int,
-    generate_word: bool,
-    generate_dashboard: bool,
-) -> None:
-    """Run the legal risk analysis with progress tracking."""
-    st.session_state.analysis_in_progress = True
+class AnalysisRun:
+    """A lawdit-analyze process running in the background.
 
-    try:
-        # Create progress indicators
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        time_metric = st.empty()
+    A reader thread consumes the process output and records how far the run
+    has got, so the Streamlit script thread never blocks on the process and
+    the page stays interactive. The thread only updates this object; the
+    page polls it to render progress.
+    """
 
-        log_container = st.expander("📝 Analysis Log", expanded=True)
+    def __init__(self, cmd: List[str], output_dir: str, log_header: List[str]) -> None:
+        """Start the analysis process and its reader thread.
 
-        # Build command
-        cmd = [
-            "lawdit-analyze",
-            "--index",
-            index_file,
-            "--output-dir",
-            output_dir,
-        ]
+        Args:
+            cmd: lawdit-analyze command line
+            output_dir: Directory the analysis writes its deliverables to
+            log_header: Lines describing the run, shown above its progress
+        """
+        self.output_dir = output_dir
+        self.log_header = log_header
+        self.start_time = time.time()
+        self.end_time: Optional[float] = None
+        # The output is only shown if the run fails, so it is spooled to an
+        # anonymous temp file instead of being held in memory
+        self._spool = tempfile.TemporaryFile()
+        self.stage = 0  # number of ANALYSIS_STAGES reached so far
+        self.returncode: Optional[int] = None
+
+        # The child's output is unbuffered so its lines arrive as printed, and
+        # UTF-8 whatever the locale, as the CLI prints emoji
+        self.process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1,
+            cwd=os.getcwd(),
+            env={**os.environ, "PYTHONUNBUFFERED": "1", "PYTHONIOENCODING": "utf-8"},
+        )
+        self._reader = threading.Thread(target=self._read_output, daemon=True)
+        self._reader.start()
+
+    @property
+    def finished(self) -> bool:
+        """Whether the process has exited and its output has been read."""
+        return self.returncode is not None
 
-        if focus_areas:
-            cmd.extend(["--focus"] + focus_areas)
+    @property
+    def elapsed(self) -> float:
+        """Seconds the run has taken so far, or in total once finished."""
+        return (self.end_time or time.time()) - self.start_time
 
-        with log_container:
-            st.write(f"🚀 Starting analysis...")
-            st.write(f"📁 Index: {index_file}")
-            st.write(f"📂 Output: {output_dir}")
-            st.write(f"🎯 Focus areas: {', '.join(focus_areas)}")
-            st.write(f"🔍 Web search: {'Enabled' if use_web_search else 'Disabled'}")
-            st.write("---")
+    def output_tail(self, max_bytes: int = OUTPUT_TAIL_BYTES) -> str:
+        """Return the end of the process output and release the spool file.
 
-        start_time = time.time()
+        Call once the run has finished.
 
-        # Update progress
-        progress_bar.progress(10)
-        status_text.text("🤖 Initializing AI agents...")
+        Args:
+            max_bytes: Most bytes of output to return, counted from the end
 
+        Returns:
+            The last ``max_bytes`` bytes of output, decoded
+        """
+        with self._spool:
+            size = self._spool.seek(0, os.SEEK_END)
+            self._spool.seek(max(0, size - max_bytes))
+            return self._spool.read().decode("utf-8", errors="replace")
+
+    def _read_output(self) -> None:
+        """Collect the process output and advance the stage as markers appear.
+
+        The run is marked finished even if reading fails, with a return code
+        of -1, so the page stops polling and a new run can be started.
+        """
+        returncode = -1
         try:
-            # Create output directory
-            Path(output_dir).mkdir(parents=True, exist_ok=True)
-
-            # Note: In production, you'd want to run this asynchronously
-            # and stream the output. For now, we'll use subprocess
-            with log_container:
-                st.write("⏳ Running analysis (this may take several minutes)...")
-                st.write("")
-
-                # Show simulated progress
-                progress_messages = [
-                    (20, "📖 Loading document index..."),
-                    (30, "🔍 Main agent analyzing document structure..."),
-                    (45, "📄 Document analyst retrieving documents..."),
-                    (60, "⚖️ Analyzing contract risks..."),
-                    (70, "📋 Analyzing compliance issues..."),
-                    (80, "⚡ Analyzing litigation risks..."),
-                    (85, "🏛️ Analyzing governance matters..."),
-                    (90, "🌐 Performing web research..." if use_web_search else "✍️ Synthesizing findings..."),
-                    (95, "📊 Generating deliverables..."),
-                ]
-
-                progress_placeholder = st.empty()
-
-                # Run the actual command
-                # Note: This is a simplified version. In production, you'd want
-                # better process management and real-time output streaming
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    cwd=os.getcwd(),
-                )
+            with self.process:
+                stdout = self.process.stdout
+                assert stdout is not None
+                for line in stdout:
+                    self._spool.write(line.encode("utf-8", errors="replace"))
+                    for stage in range(self.stage, len(ANALYSIS_STAGES)):
+                        if ANALYSIS_STAGES[stage][0] in line:
+                            self.stage = stage + 1
+                            break
+                returncode = self.process.wait()
+        finally:
+            self.end_time = time.time()
+            self.returncode = returncode
 
-                # Simulate progress updates during execution
-                for prog, msg in progress_messages:
-                    progress_bar.progress(prog)
-                    status_text.text(msg)
-                    progress_placeholder.write(f"• {msg}")
-                    elapsed = time.time() - start_time
-                    time_metric.metric("Time Elapsed", f"{elapsed:.1f}s")
-                    time.sleep(0.5)
-
-            progress_bar.progress(100)
-            elapsed_time = time.time() - start_time
-
-            if result.returncode == 0:
-                # Success
-                status_text.text("")
-                st.success(
-                    f"✅ Analysis complete! Results saved to {output_dir}", icon="✅"
-                )
 
-                with log_container:
-                    st.write("---")
-                    st.write(f"✓ Analysis completed in {elapsed_time:.1f} seconds")
-                    st.write(f"✓ Output directory: {output_dir}")
-
-                    # Show generated files
-                    output_path = Path(output_dir)
-                    if output_path.exists():
-                        files = list(output_path.glob("*"))
-                        if files:
-                            st.write(f"✓ Generated {len(files)} file(s):")
-                            for file in files:
-                                st.write(f"  • {file.name}")
-
-                # Update session state
-                st.session_state.analysis_complete = True
-                st.balloons()
-
-            else:
-                # Error
-                progress_bar.progress(0)
-                status_text.text("")
-                st.error(f"❌ Analysis failed with exit code {result.returncode}")
-
-                with log_container:
-                    st.error("Error output:")
-                    st.code(result.stderr)
-
-        except Exception as e:
-            progress_bar.progress(0)
-            status_text.text("")
-            st.error(f"❌ Analysis failed: {str(e)}")
-            with log_container:
-                st.error(f"Error details: {str(e)}")
-
-    finally:
-        st.session_state.analysis_in_progress = False
+def run_analysis(
+    index_file: str,
+    output_dir: str,
+    focus_areas: list,
+    use_web_search: bool,
+    max_iterations: int,
+    generate_word: bool,
+    generate_dashboard: bool,
+) -> None:
+    """Start the legal risk analysis in the background and track its progress."""
+    # Build command
+    cmd = [
+        "lawdit-analyze",
+        "--index",
+        index_file,
+        "--output-dir",
+        output_dir,
+    ]
+
+    if focus_areas:
+        cmd.extend(["--focus"] + focus_areas)
+
+    log_header = [
+        "🚀 Starting analysis...",
+        f"📁 Index: {index_file}",
+        f"📂 Output: {output_dir}",
+        f"🎯 Focus areas: {', '.join(focus_areas)}",
+        f"🔍 Web search: {'Enabled' if use_web_search else 'Disabled'}",
+    ]
 
+    try:
+        # Create output directory
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        run = AnalysisRun(cmd, output_dir, log_header)
+    except Exception as e:
+        st.error(f"❌ Analysis failed: {str(e)}")
+        return
 
+    session_state = st.session_state
+    session_state.analysis_run = run
+    session_state.analysis_in_progress = True
+    # Rerun so the start button is redrawn disabled while the run is going
+    st.rerun()
+
+
+def show_analysis_log(run: AnalysisRun) -> None:
+    """Display the run description and the stages reached so far."""
+    with st.expander("📝 Analysis Log", expanded=True):
+        for line in run.log_header:
+            st.write(line)
+        st.write("---")
+        st.write("⏳ Running analysis (this may take several minutes)...")
+        for _, _, msg in ANALYSIS_STAGES[: run.stage]:
+            st.write(f"• {msg}")
+
+
+@st.fragment(run_every=1.0)
+def show_analysis_progress() -> None:
+    """Poll the running analysis once a second, rerunning only this section."""
+    session_state = st.session_state
+    run: AnalysisRun = session_state.analysis_run
+    if run.finished:
+        # Rerun the whole page to show the result and re-enable the controls
+        session_state.analysis_in_progress = False
+        st.rerun()
+
+    if run.stage:
+        _, prog, msg = ANALYSIS_STAGES[run.stage - 1]
+    else:
+        prog, msg = 10, "🤖 Initializing AI agents..."
+    st.progress(prog)
+    st.text(msg)
+    st.metric("Time Elapsed", f"{run.elapsed:.1f}s")
+    show_analysis_log(run)
+
+
+def show_analysis_result(run: AnalysisRun) -> None:
+    """Display the outcome of a finished analysis run."""
+    show_analysis_log(run)
+
+    if run.returncode == 0:
+        st.success(f"✅ Analysis complete! Results saved to {run.output_dir}", icon="✅")
+        st.write(f"✓ Analysis completed in {run.elapsed:.1f} seconds")
+        st.write(f"✓ Output directory: {run.output_dir}")
+
+        # Show generated files
+        files = list(Path(run.output_dir).glob("*"))
+        if files:
+            st.write(f"✓ Generated {len(files)} file(s):")
+            for file in files:
+                st.write(f"  • {file.name}")
+
+        # Update session state; list the new reports right away
+        scan_outputs.clear()
+        st.session_state.analysis_complete = True
+        st.balloons()
+    else:
+        st.error(f"❌ Analysis failed with exit code {run.returncode}")
+        st.error("Error output:")
+        st.code(run.output_tail())
+
+
+@st.fragment
 def show_previous_analyses(output_dir: str) -> None:
-    """Display list of previous analysis results."""
+    """Display list of previous analysis results.
+
+    Runs as a fragment, so its download and view buttons rerun only this list
+    rather than the whole page.
+    """
     st.subheader("📊 Previous Analyses")
 
     output_path = Path(output_dir)
-    if not output_path.exists():
-        st.info("No previous analyses found.")
-        return
 
-    # Find analysis files
-    word_reports = list(output_path.glob("*.docx"))
-    html_dashboards = list(output_path.glob("*.html"))
-    text_reports = list(output_path.glob("*analysis*.txt"))
+    # Find analysis files, most recent first
+    word_reports, html_dashboards, text_reports = scan_outputs(output_dir)
 
     if not any([word_reports, html_dashboards, text_reports]):
         st.info("No previous analyses found.")
@@ -309,36 +393,32 @@ def show_previous_analyses(output_dir: str) -> None:
     # Display files
     if word_reports:
         st.markdown("**📄 Word Reports:**")
-        for report in sorted(word_reports, key=lambda x: x.stat().st_mtime, reverse=True):
+        for name, mtime, _ in word_reports:
             col1, col2, col3 = st.columns([3, 2, 2])
             with col1:
-                st.text(f"📄 {report.name}")
+                st.text(f"📄 {name}")
             with col2:
-                mtime = report.stat().st_mtime
-                st.caption(time.strftime("%Y-%m-%d %H:%M", time.localtime(mtime)))
+                st.caption(format_mtime(mtime))
             with col3:
-                with open(report, "rb") as f:
-                    st.download_button(
-                        "⬇️ Download",
-                        data=f,
-                        file_name=report.name,
-                        mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                        key=f"download_word_{report.name}",
-                    )
+                st.download_button(
+                    "⬇️ Download",
+                    data=read_output_bytes(str(output_path / name), mtime),
+                    file_name=name,
+                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                    key=f"download_word_{name}",
+                )
 
     if html_dashboards:
         st.markdown("**🌐 HTML Dashboards:**")
-        for dashboard in sorted(
-            html_dashboards, key=lambda x: x.stat().st_mtime, reverse=True
-        ):
+        for name, mtime, _ in html_dashboards:
             col1, col2, col3 = st.columns([3, 2, 2])
             with col1:
-                st.text(f"🌐 {dashboard.name}")
+                st.text(f"🌐 {name}")
             with col2:
-                mtime = dashboard.stat().st_mtime
-                st.caption(time.strftime("%Y-%m-%d %H:%M", time.localtime(mtime)))
+                st.caption(format_mtime(mtime))
             with col3:
-                if st.button("👁️ View", key=f"view_dashboard_{dashboard.name}"):
-                    st.session_state.selected_dashboard = str(dashboard)
-                    st.session_state.page = "📊 View Results"
-                    st.rerun()
+                if st.button("👁️ View", key=f"view_dashboard_{name}"):
+                    session_state = st.session_state
+                    session_state.selected_dashboard = str(output_path / name)
+                    session_state.page = "📊 View Results"
+                    st.rerun(scope="app")
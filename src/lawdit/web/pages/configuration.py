@@ -1,13 +1,25 @@
 """Configuration page for API keys and settings."""
 
 import os
+import re
+import stat
+import tempfile
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Tuple
 
 import streamlit as st
-from dotenv import load_dotenv, set_key
 
-from lawdit.config import get_settings
+# Model choices offered on the API Keys tab; the first is the default
+VISION_MODELS = ("gpt-5-nano", "gpt-4-vision-preview", "gpt-4o")
+ANALYSIS_MODELS = (
+    "claude-sonnet-4-5-20250929",
+    "claude-opus-4-5-20250514",
+    "gpt-4o",
+    "gpt-4-turbo",
+)
+
+# "export " prefix (if any) and key of a KEY=value line in a .env file
+_ENV_KEY_RE = re.compile(r"^\s*(export\s+)?([A-Za-z_][A-Za-z0-9_.]*)\s*=")
 
 
 def show() -> None:
@@ -15,12 +27,16 @@ def show() -> None:
     st.header("⚙️ Configuration")
     st.markdown("Configure your API keys, credentials, and processing settings.")
 
-    # Load existing .env if available
+    # Load existing .env if available, once per session; save_to_env resets the flag
     env_path = Path(".env")
-    if env_path.exists():
+    if env_path.exists() and not st.session_state.get("_env_loaded"):
+        from dotenv import load_dotenv
+
         load_dotenv(env_path)
+        st.session_state._env_loaded = True
 
-    # Create tabs for different configuration sections
+    # Create tabs for different configuration sections. Each tab body is a
+    # fragment, so editing a widget reruns only that tab, not the whole page.
     tab1, tab2, tab3 = st.tabs(["🔑 API Keys", "📁 Google Drive", "⚡ Processing Settings"])
 
     with tab1:
@@ -47,6 +63,7 @@ def show() -> None:
             st.warning(f"⚠️ {issue}")
 
 
+@st.fragment
 def show_api_configuration(env_path: Path) -> None:
     """Show API keys configuration section."""
     st.subheader("API Keys")
@@ -78,7 +95,7 @@ def show_api_configuration(env_path: Path) -> None:
     with col1:
         vision_model = st.selectbox(
             "Vision Model (for page analysis)",
-            options=["gpt-5-nano", "gpt-4-vision-preview", "gpt-4o"],
+            options=VISION_MODELS,
             index=0,
             help="Model used for analyzing document pages. gpt-5-nano is most cost-effective.",
         )
@@ -86,12 +103,7 @@ def show_api_configuration(env_path: Path) -> None:
     with col2:
         analysis_model = st.selectbox(
             "Analysis Model (for legal analysis)",
-            options=[
-                "claude-sonnet-4-5-20250929",
-                "claude-opus-4-5-20250514",
-                "gpt-4o",
-                "gpt-4-turbo",
-            ],
+            options=ANALYSIS_MODELS,
             index=0,
             help="Model used for legal risk analysis. Claude Sonnet recommended.",
         )
@@ -109,6 +121,7 @@ def show_api_configuration(env_path: Path) -> None:
         st.rerun()
 
 
+@st.fragment
 def show_google_configuration(env_path: Path) -> None:
     """Show Google Drive configuration section."""
     st.subheader("Google Drive Settings")
@@ -137,6 +150,7 @@ def show_google_configuration(env_path: Path) -> None:
         save_path.parent.mkdir(parents=True, exist_ok=True)
         with open(save_path, "wb") as f:
             f.write(uploaded_file.getbuffer())
+        _validate.clear()
         st.success(f"✅ Credentials saved to {credentials_path}")
 
     # Show current credentials path
@@ -180,11 +194,21 @@ def show_google_configuration(env_path: Path) -> None:
         st.rerun()
 
 
+@st.fragment
 def show_processing_configuration(env_path: Path) -> None:
     """Show processing settings configuration section."""
     st.subheader("Processing Settings")
     st.markdown("Configure document processing and performance settings.")
 
+    (
+        pdf_dpi_default,
+        max_parallel_default,
+        max_requests_default,
+        max_tokens_default,
+        working_dir_default,
+        output_dir_default,
+    ) = _load_processing_env()
+
     col1, col2 = st.columns(2)
 
     with col1:
@@ -194,7 +218,7 @@ def show_processing_configuration(env_path: Path) -> None:
             "PDF Image Quality (DPI)",
             min_value=72,
             max_value=600,
-            value=int(os.getenv("PDF_DPI", "200")),
+            value=pdf_dpi_default,
             step=50,
             help="Higher DPI = better quality but higher cost. 150-200 recommended.",
         )
@@ -217,7 +241,7 @@ def show_processing_configuration(env_path: Path) -> None:
             "Maximum Parallel Processes",
             min_value=1,
             max_value=16,
-            value=int(os.getenv("MAX_PARALLEL_PROCESSES", "4")),
+            value=max_parallel_default,
             step=1,
             help="Number of documents to process simultaneously. Higher = faster but more memory.",
         )
@@ -226,7 +250,7 @@ def show_processing_configuration(env_path: Path) -> None:
             "Max API Requests per Minute",
             min_value=10,
             max_value=500,
-            value=int(os.getenv("OPENAI_MAX_REQUESTS_PER_MINUTE", "60")),
+            value=max_requests_default,
             step=10,
             help="Rate limit for API calls. Adjust based on your API tier.",
         )
@@ -235,7 +259,7 @@ def show_processing_configuration(env_path: Path) -> None:
             "Max Tokens per Minute",
             min_value=10000,
             max_value=500000,
-            value=int(os.getenv("OPENAI_MAX_TOKENS_PER_MINUTE", "90000")),
+            value=max_tokens_default,
             step=10000,
             help="Token rate limit. Adjust based on your API tier.",
         )
@@ -248,14 +272,14 @@ def show_processing_configuration(env_path: Path) -> None:
     with col1:
         working_dir = st.text_input(
             "Working Directory",
-            value=os.getenv("WORKING_DIR", "./data_room_processing"),
+            value=working_dir_default,
             help="Directory for intermediate processing files",
         )
 
     with col2:
         output_dir = st.text_input(
             "Output Directory",
-            value=os.getenv("OUTPUT_DIR", "./outputs"),
+            value=output_dir_default,
             help="Directory for final reports and deliverables",
         )
 
@@ -274,39 +298,114 @@ def show_processing_configuration(env_path: Path) -> None:
         st.rerun()
 
 
-def save_to_env(env_path: Path, updates: Dict[str, str]) -> None:
-    """Save configuration to .env file."""
-    # Create .env if it doesn't exist
-    if not env_path.exists():
-        env_path.touch()
+@st.cache_data(ttl=5)
+def _load_processing_env() -> Tuple[int, int, int, int, str, str]:
+    """Read the processing settings' current values, cached across reruns.
+
+    Returns:
+        (PDF DPI, parallel processes, requests per minute, tokens per minute,
+        working directory, output directory)
+    """
+    return (
+        int(os.getenv("PDF_DPI", "200")),
+        int(os.getenv("MAX_PARALLEL_PROCESSES", "4")),
+        int(os.getenv("OPENAI_MAX_REQUESTS_PER_MINUTE", "60")),
+        int(os.getenv("OPENAI_MAX_TOKENS_PER_MINUTE", "90000")),
+        os.getenv("WORKING_DIR", "./data_room_processing"),
+        os.getenv("OUTPUT_DIR", "./outputs"),
+    )
 
-    # Update each key
-    for key, value in updates.items():
-        set_key(env_path, key, value)
 
-    # Reload environment
+def save_to_env(env_path: Path, updates: Dict[str, str]) -> None:
+    """Save configuration to .env file.
+
+    The file is read and rewritten once for all keys, rather than once per
+    key as ``dotenv.set_key`` does. Comments, blank lines and other keys are
+    kept; updated keys are rewritten in place (keeping an ``export`` prefix)
+    and new keys are appended.
+
+    Like ``set_key``, the file is swapped in from a uniquely named temporary
+    file, which keeps the mode of an existing file and is 0600 otherwise, as
+    the file holds API keys.
+    """
+    from dotenv import load_dotenv
+
+    try:
+        lines = env_path.read_text(encoding="utf-8").splitlines()
+        original_mode = stat.S_IMODE(env_path.stat().st_mode)
+    except FileNotFoundError:
+        lines = []
+        original_mode = None
+    written = set()
+
+    # Values are single-quoted, matching set_key's default quote mode
+    def entry(key: str, export: str = "") -> str:
+        value = updates[key].replace("\\", "\\\\").replace("'", "\\'")
+        return f"{export}{key}='{value}'"
+
+    for i, line in enumerate(lines):
+        match = _ENV_KEY_RE.match(line)
+        if match and match.group(2) in updates:
+            lines[i] = entry(match.group(2), match.group(1) or "")
+            written.add(match.group(2))
+    lines.extend(entry(key) for key in updates if key not in written)
+
+    tmp = tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=env_path.parent, prefix=".env.", suffix=".tmp", delete=False
+    )
+    try:
+        with tmp:
+            tmp.write("\n".join(lines) + "\n")
+        if original_mode is not None:
+            os.chmod(tmp.name, original_mode)
+        os.replace(tmp.name, env_path)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
+
+    # Reload environment and re-check it on the next render
     load_dotenv(env_path, override=True)
+    st.session_state._env_loaded = False
+    _validate.clear()
+    _load_processing_env.clear()
 
 
 def validate_configuration() -> Dict[str, any]:
     """Validate current configuration."""
+    valid, issues = _validate(
+        bool(os.getenv("OPENAI_API_KEY")),
+        bool(os.getenv("TAVILY_API_KEY")),
+        os.getenv("GOOGLE_CREDENTIALS_PATH", "./google-credentials.json"),
+        bool(os.getenv("GOOGLE_DRIVE_FOLDER_ID")),
+    )
+    return {"valid": valid, "issues": list(issues)}
+
+
+@st.cache_data(ttl=2)
+def _validate(
+    has_openai_key: bool, has_tavily_key: bool, creds_path: str, has_folder_id: bool
+) -> Tuple[bool, Tuple[str, ...]]:
+    """Check a configuration snapshot, caching the result across reruns.
+
+    Only whether each key is set is passed in, so API keys never become part
+    of the cache key.
+    """
     issues = []
 
     # Check OpenAI API key
-    if not os.getenv("OPENAI_API_KEY"):
+    if not has_openai_key:
         issues.append("OpenAI API key is not configured")
 
     # Check Tavily API key
-    if not os.getenv("TAVILY_API_KEY"):
+    if not has_tavily_key:
         issues.append("Tavily API key is not configured")
 
     # Check Google credentials
-    creds_path = os.getenv("GOOGLE_CREDENTIALS_PATH", "./google-credentials.json")
     if not Path(creds_path).exists():
         issues.append(f"Google credentials file not found at {creds_path}")
 
     # Check Google Drive folder ID
-    if not os.getenv("GOOGLE_DRIVE_FOLDER_ID"):
+    if not has_folder_id:
         issues.append("Google Drive folder ID is not configured")
 
-    return {"valid": len(issues) == 0, "issues": issues}
+    return len(issues) == 0, tuple(issues)
@@ -3,11 +3,11 @@
 import os
 import time
 from pathlib import Path
-from typing import Optional
 
 import streamlit as st
 
 from lawdit.config import get_settings
+from lawdit.indexer._log import configure_logging
 from lawdit.indexer.data_room_indexer import DataRoomIndexer
 
 
@@ -133,6 +133,9 @@ def run_indexing(
             st.write(f"✓ Output: {output_path}")
             st.write(f"✓ Working directory: {working_dir}")
 
+        # Indexer progress goes to the server console through a background listener
+        configure_logging()
+
         try:
             indexer = DataRoomIndexer(
                 google_credentials_path=os.getenv(
@@ -140,6 +143,17 @@ def run_indexing(
                 ),
                 openai_api_key=os.getenv("OPENAI_API_KEY", ""),
                 working_dir=working_dir,
+                # MAX_PARALLEL_PROCESSES bounds vision requests per document; documents
+                # stay at the CLI default of one at a time so the two don't multiply
+                max_workers=int(os.getenv("MAX_PARALLEL_PROCESSES", "4")),
+                cache_enabled=not force_reprocess,
+                pdf_backend=os.getenv("PDF_BACKEND", "pdf2image"),
+                image_format=os.getenv("PAGE_IMAGE_FORMAT", "png"),
+                jpeg_quality=int(os.getenv("JPEG_QUALITY", "85")),
+                png_encoder=os.getenv("PNG_ENCODER", "pillow"),
+                page_batch_size=int(os.getenv("VISION_PAGE_BATCH_SIZE", "1")),
+                render_workers=int(os.getenv("PDF_RENDER_WORKERS", "1")),
+                http2=os.getenv("OPENAI_HTTP2", "").lower() in ("1", "true", "yes"),
             )
             with log_container:
                 st.write("✓ Indexer initialized successfully")
@@ -3,10 +3,11 @@
 import os
 import time
 from pathlib import Path
-from typing import List
 
 import streamlit as st
 
+from lawdit.web.outputs import read_output_bytes
+
 
 def show() -> None:
     """Display reports page."""
@@ -76,15 +77,14 @@ def show_word_reports(output_dir: Path) -> None:
 
             with col3:
                 st.markdown("<br>", unsafe_allow_html=True)
-                with open(report, "rb") as f:
-                    st.download_button(
-                        "⬇️ Download",
-                        data=f,
-                        file_name=report.name,
-                        mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                        key=f"download_word_{report.name}",
-                        use_container_width=True,
-                    )
+                st.download_button(
+                    "⬇️ Download",
+                    data=read_output_bytes(str(report), mtime),
+                    file_name=report.name,
+                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                    key=f"download_word_{report.name}",
+                    use_container_width=True,
+                )
 
             st.markdown("---")
 
@@ -132,15 +132,14 @@ def show_html_dashboards(output_dir: Path) -> None:
                     st.rerun()
 
                 # Download button
-                with open(dashboard, "rb") as f:
-                    st.download_button(
-                        "⬇️ Download",
-                        data=f,
-                        file_name=dashboard.name,
-                        mime="text/html",
-                        key=f"download_html_{dashboard.name}",
-                        use_container_width=True,
-                    )
+                st.download_button(
+                    "⬇️ Download",
+                    data=read_output_bytes(str(dashboard), mtime),
+                    file_name=dashboard.name,
+                    mime="text/html",
+                    key=f"download_html_{dashboard.name}",
+                    use_container_width=True,
+                )
 
             st.markdown("---")
 
@@ -1,9 +1,8 @@
 """Results visualization page for viewing analysis results."""
 
-import json
 import re
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List
 
 import streamlit as st
 import streamlit.components.v1 as components
@@ -332,10 +332,12 @@ class TestMainFunction:
             mock_agent = Mock()
             mock_create_agent.return_value = mock_agent
             mock_run_analysis.return_value = {}
+            mock_init_store.return_value = index_content
 
             main()
 
-            # Verify index content was passed to run_analysis
+            # Verify the index text returned by the store was passed to run_analysis
+            mock_init_store.assert_called_once_with(str(index_path), tmpdir)
             call_kwargs = mock_run_analysis.call_args[1]
             assert call_kwargs["data_room_index"] == index_content
 
@@ -410,3 +412,41 @@ class TestMainArgumentParsing:
         """Test default focus is 'all'."""
         # The default focus is ["all"]
         pass
+
+    def test_parser_is_built_once(self):
+        """Test that the argument parser is cached between calls."""
+        from lawdit.agents.cli import _build_parser
+
+        assert _build_parser() is _build_parser()
+
+    def test_parser_defaults(self):
+        """Test the parser's default values."""
+        from lawdit.agents.cli import _build_parser
+
+        args = _build_parser().parse_args(["--index", "index.txt"])
+
+        assert args.working_dir == "./data_room_processing"
+        assert args.output_dir == "./outputs"
+        assert args.focus == ["all"]
+        assert args.no_deep_agents is False
+
+
+class TestBanner:
+    """Tests for the shared status banner helper."""
+
+    def test_banner_layout(self, capsys):
+        """Test that the banner frames the title and lists the lines."""
+        from lawdit.agents._log import banner
+
+        banner("TITLE", ["Line 1", "Line 2"])
+
+        out = capsys.readouterr().out
+        assert out == "\n".join(["=" * 70, "TITLE", "=" * 70, "", "Line 1", "Line 2"]) + "\n\n"
+
+    def test_banner_leading_blank(self, capsys):
+        """Test that leading_blank emits an empty line first."""
+        from lawdit.agents._log import banner
+
+        banner("TITLE", leading_blank=True)
+
+        assert capsys.readouterr().out.startswith("\n" + "=" * 70)
@@ -39,6 +39,7 @@ class TestSettings:
             # Check default processing values
             assert settings.pdf_dpi == 200
             assert settings.max_parallel_processes == 4
+            assert settings.cache_enabled is True
 
             # Check default model configuration
             assert settings.vision_model == "gpt-5-nano"
@@ -114,7 +115,7 @@ class TestSettings:
                 Settings()
 
     def test_settings_creates_directories(self):
-        """Test that Settings automatically creates working and output directories."""
+        """Test that ensure_dirs creates the working and output directories."""
         with tempfile.TemporaryDirectory() as tmpdir:
             work_dir = os.path.join(tmpdir, "work")
             output_dir = os.path.join(tmpdir, "output")
@@ -132,6 +133,11 @@ class TestSettings:
             with patch.dict(os.environ, env_vars):
                 settings = Settings()
 
+                # Constructing settings has no filesystem side effects
+                assert not os.path.exists(work_dir)
+
+                settings.ensure_dirs()
+
                 # Verify directories were created
                 assert os.path.exists(work_dir)
                 assert os.path.exists(output_dir)
@@ -189,6 +195,19 @@ class TestGetSettings:
             # Should be the same object
             assert settings1 is settings2
 
+    def test_get_settings_creates_directories(self):
+        """Test that get_settings ensures the configured directories exist."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            work_dir = os.path.join(tmpdir, "work")
+            env_vars = {"OPENAI_API_KEY": "test-key", "WORKING_DIR": work_dir}
+
+            with patch.dict(os.environ, env_vars):
+                import lawdit.config
+                lawdit.config.settings = None
+
+                get_settings()
+                assert os.path.isdir(work_dir)
+
 
 class TestReloadSettings:
     """Tests for the reload_settings() function."""
@@ -31,8 +31,18 @@ class TestDataRoomIndexerInitialization:
 
             # Verify components were initialized
             mock_drive.assert_called_once_with("/path/to/creds.json")
-            mock_pdf.assert_called_once_with(dpi=200)
-            mock_vision.assert_called_once_with("test-key")
+            mock_pdf.assert_called_once_with(
+                dpi=200,
+                backend="pdf2image",
+                image_format="png",
+                jpeg_quality=85,
+                max_side=None,
+                render_workers=1,
+                png_encoder="pillow",
+            )
+            mock_vision.assert_called_once_with(
+                "test-key", cache_dir=str(Path(working_dir) / "vision_cache"), http2=False
+            )
 
             # Verify working directory was created
             assert Path(working_dir).exists()
@@ -72,9 +82,9 @@ class TestDataRoomIndexerProcessDocument:
 
             mock_pdf = Mock()
             mock_pdf_class.return_value = mock_pdf
-            mock_pdf.extract_pages_as_images.return_value = [
-                "/path/to/page_0001.png",
-                "/path/to/page_0002.png",
+            mock_pdf.iter_pages.return_value = [
+                ("/path/to/page_0001.png", b"page-1"),
+                ("/path/to/page_0002.png", b"page-2"),
             ]
 
             mock_vision = Mock()
@@ -99,7 +109,7 @@ class TestDataRoomIndexerProcessDocument:
             mock_drive.download_file.assert_called_once()
 
             # Verify PDF processing was called
-            mock_pdf.extract_pages_as_images.assert_called_once()
+            mock_pdf.iter_pages.assert_called_once()
 
             # Verify vision summarization was called for each page
             assert mock_vision.summarize_page_image.call_count == 2
@@ -116,6 +126,85 @@ class TestDataRoomIndexerProcessDocument:
             assert result["document_summary"] == "Overall document summary"
             assert len(result["pages"]) == 2
 
+    @patch("lawdit.indexer.data_room_indexer.GoogleDriveClient")
+    @patch("lawdit.indexer.data_room_indexer.PDFProcessor")
+    @patch("lawdit.indexer.data_room_indexer.VisionSummarizer")
+    def test_process_pages_concurrently_preserves_order(
+        self, mock_vision_class, mock_pdf_class, mock_drive_class
+    ):
+        """Test that concurrent page summaries are returned in page order."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mock_drive = Mock()
+            mock_drive_class.return_value = mock_drive
+            mock_drive.download_file.return_value = True
+
+            image_paths = [f"/path/to/page_{i:04d}.png" for i in range(1, 9)]
+            mock_pdf = Mock()
+            mock_pdf_class.return_value = mock_pdf
+            mock_pdf.iter_pages.return_value = [
+                (path, f"page-{i}".encode()) for i, path in enumerate(image_paths, start=1)
+            ]
+
+            mock_vision = Mock()
+            mock_vision_class.return_value = mock_vision
+            mock_vision.summarize_page_image.side_effect = (
+                lambda image, page_num: f"Summary {page_num} of {image.decode()}"
+            )
+            mock_vision.summarize_document_from_pages.return_value = "Document summary"
+
+            indexer = DataRoomIndexer(
+                google_credentials_path="/path/to/creds.json", working_dir=tmpdir, max_workers=3
+            )
+
+            result = indexer.process_document(
+                file_id="file123", file_name="test.pdf", mime_type="application/pdf"
+            )
+
+            assert [p["page_num"] for p in result["pages"]] == list(range(1, 9))
+            for page, path in zip(result["pages"], image_paths):
+                assert page["image_path"] == path
+                assert page["summary"] == f"Summary {page['page_num']} of page-{page['page_num']}"
+
+    @patch("lawdit.indexer.data_room_indexer.GoogleDriveClient")
+    @patch("lawdit.indexer.data_room_indexer.PDFProcessor")
+    @patch("lawdit.indexer.data_room_indexer.VisionSummarizer")
+    def test_process_pages_in_batches(self, mock_vision_class, mock_pdf_class, mock_drive_class):
+        """Test that pages are sent to the summarizer in batches when configured."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mock_drive = Mock()
+            mock_drive_class.return_value = mock_drive
+            mock_drive.download_file.return_value = True
+
+            image_paths = [f"/path/to/page_{i:04d}.png" for i in range(1, 6)]
+            mock_pdf = Mock()
+            mock_pdf_class.return_value = mock_pdf
+            mock_pdf.iter_pages.return_value = [
+                (path, f"page-{i}".encode()) for i, path in enumerate(image_paths, start=1)
+            ]
+
+            mock_vision = Mock()
+            mock_vision_class.return_value = mock_vision
+            mock_vision.summarize_page_batch.side_effect = lambda images, start: [
+                f"Summary {start + i}" for i in range(len(images))
+            ]
+            mock_vision.summarize_document_from_pages.return_value = "Document summary"
+
+            indexer = DataRoomIndexer(
+                google_credentials_path="/path/to/creds.json",
+                working_dir=tmpdir,
+                page_batch_size=2,
+            )
+
+            result = indexer.process_document(
+                file_id="file123", file_name="test.pdf", mime_type="application/pdf"
+            )
+
+            mock_vision.summarize_page_image.assert_not_called()
+            assert mock_vision.summarize_page_batch.call_count == 3
+            assert [p["summary"] for p in result["pages"]] == [
+                f"Summary {i}" for i in range(1, 6)
+            ]
+
     @patch("lawdit.indexer.data_room_indexer.GoogleDriveClient")
     @patch("lawdit.indexer.data_room_indexer.PDFProcessor")
     @patch("lawdit.indexer.data_room_indexer.VisionSummarizer")
@@ -129,7 +218,7 @@ class TestDataRoomIndexerProcessDocument:
 
             mock_pdf = Mock()
             mock_pdf_class.return_value = mock_pdf
-            mock_pdf.extract_pages_as_images.return_value = ["/path/to/page_0001.png"]
+            mock_pdf.iter_pages.return_value = [("/path/to/page_0001.png", b"page-1")]
 
             mock_vision = Mock()
             mock_vision_class.return_value = mock_vision
@@ -171,7 +260,7 @@ class TestDataRoomIndexerProcessDocument:
 
             mock_pdf = Mock()
             mock_pdf_class.return_value = mock_pdf
-            mock_pdf.extract_pages_as_images.return_value = ["/path/to/page_0001.png"]
+            mock_pdf.iter_pages.return_value = [("/path/to/page_0001.png", b"page-1")]
 
             mock_vision = Mock()
             mock_vision_class.return_value = mock_vision
@@ -208,8 +297,10 @@ class TestDataRoomIndexerProcessDocument:
                 file_id="file123", file_name="video.mp4", mime_type="video/mp4"
             )
 
-            # Should return None for unsupported types
+            # Should return None for unsupported types without creating a directory
             assert result is None
+            assert not indexer._document_dir("file123", "video.mp4").exists()
+            mock_drive_class.return_value.download_file.assert_not_called()
 
     @patch("lawdit.indexer.data_room_indexer.GoogleDriveClient")
     @patch("lawdit.indexer.data_room_indexer.PDFProcessor")
@@ -248,7 +339,7 @@ class TestDataRoomIndexerProcessDocument:
 
             mock_pdf = Mock()
             mock_pdf_class.return_value = mock_pdf
-            mock_pdf.extract_pages_as_images.return_value = []  # Empty list indicates failure
+            mock_pdf.iter_pages.return_value = []  # No pages indicates failure
 
             indexer = DataRoomIndexer(
                 google_credentials_path="/path/to/creds.json", working_dir=tmpdir
@@ -276,7 +367,7 @@ class TestDataRoomIndexerProcessDocument:
 
             mock_pdf = Mock()
             mock_pdf_class.return_value = mock_pdf
-            mock_pdf.extract_pages_as_images.return_value = ["/path/to/page_0001.png"]
+            mock_pdf.iter_pages.return_value = [("/path/to/page_0001.png", b"page-1")]
 
             mock_vision = Mock()
             mock_vision_class.return_value = mock_vision
@@ -292,7 +383,7 @@ class TestDataRoomIndexerProcessDocument:
             )
 
             # Verify JSON file was created
-            expected_dir = Path(tmpdir) / "test_document.pdf"
+            expected_dir = Path(tmpdir) / "test_document.pdf-file123"
             json_file = expected_dir / "document_record.json"
 
             assert json_file.exists()
@@ -304,6 +395,31 @@ class TestDataRoomIndexerProcessDocument:
             assert saved_data["doc_id"] == "file123"
             assert saved_data["file_name"] == "test document.pdf"
 
+            # Image paths are kept on the returned record but not in the JSON
+            assert saved_data["pages"] == [{"page_num": 1, "summary": "Page summary"}]
+            assert result["pages"][0]["image_path"] == "/path/to/page_0001.png"
+
+
+    @patch("lawdit.indexer.data_room_indexer.GoogleDriveClient")
+    @patch("lawdit.indexer.data_room_indexer.PDFProcessor")
+    @patch("lawdit.indexer.data_room_indexer.VisionSummarizer")
+    def test_document_dir_is_safe_and_unique(
+        self, mock_vision_class, mock_pdf_class, mock_drive_class
+    ):
+        """Test that unsafe or overlong file names map to distinct safe directories."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            indexer = DataRoomIndexer(
+                google_credentials_path="/path/to/creds.json", working_dir=tmpdir
+            )
+
+            doc_dir = indexer._document_dir("abcdefghijkl", "Q1: résumé/notes\\v2.pdf")
+            assert doc_dir.parent == Path(tmpdir)
+            assert doc_dir.name == "Q1_r_sum_notes_v2.pdf-abcdefgh"
+
+            long_a = indexer._document_dir("id-aaaaaa", "x" * 300 + "a.pdf")
+            long_b = indexer._document_dir("id-bbbbbb", "x" * 300 + "b.pdf")
+            assert len(long_a.name) <= 130
+            assert long_a != long_b
 
 class TestDataRoomIndexerBuildDataRoomIndex:
     """Tests for build_data_room_index method."""
@@ -327,7 +443,7 @@ class TestDataRoomIndexerBuildDataRoomIndex:
 
             mock_pdf = Mock()
             mock_pdf_class.return_value = mock_pdf
-            mock_pdf.extract_pages_as_images.return_value = ["/path/to/page_0001.png"]
+            mock_pdf.iter_pages.return_value = [("/path/to/page_0001.png", b"page-1")]
 
             mock_vision = Mock()
             mock_vision_class.return_value = mock_vision
@@ -376,7 +492,7 @@ class TestDataRoomIndexerBuildDataRoomIndex:
 
             mock_pdf = Mock()
             mock_pdf_class.return_value = mock_pdf
-            mock_pdf.extract_pages_as_images.return_value = ["/path/to/page_0001.png"]
+            mock_pdf.iter_pages.return_value = [("/path/to/page_0001.png", b"page-1")]
 
             mock_vision = Mock()
             mock_vision_class.return_value = mock_vision
@@ -447,7 +563,7 @@ class TestDataRoomIndexerBuildDataRoomIndex:
 
             mock_pdf = Mock()
             mock_pdf_class.return_value = mock_pdf
-            mock_pdf.extract_pages_as_images.return_value = ["/path/to/page_0001.png"]
+            mock_pdf.iter_pages.return_value = [("/path/to/page_0001.png", b"page-1")]
 
             mock_vision = Mock()
             mock_vision_class.return_value = mock_vision
@@ -470,3 +586,297 @@ class TestDataRoomIndexerBuildDataRoomIndex:
             assert "file3" in index_text
             assert "doc3.pdf" in index_text
             assert "file2" not in index_text  # Failed document should be skipped
+
+    @patch("lawdit.indexer.data_room_indexer.GoogleDriveClient")
+    @patch("lawdit.indexer.data_room_indexer.PDFProcessor")
+    @patch("lawdit.indexer.data_room_indexer.VisionSummarizer")
+    def test_build_data_room_index_parallel_keeps_listing_order(
+        self, mock_vision_class, mock_pdf_class, mock_drive_class
+    ):
+        """Test that documents processed concurrently are indexed in listing order."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mock_drive = Mock()
+            mock_drive_class.return_value = mock_drive
+            mock_drive.list_folder_contents.return_value = [
+                {"id": f"file{i}", "name": f"doc{i}.pdf", "mimeType": "application/pdf"}
+                for i in range(1, 6)
+            ]
+            mock_drive.download_file.side_effect = lambda file_id, path: file_id != "file3"
+
+            mock_pdf = Mock()
+            mock_pdf_class.return_value = mock_pdf
+            mock_pdf.iter_pages.return_value = [("/path/to/page_0001.png", b"page-1")]
+
+            mock_vision = Mock()
+            mock_vision_class.return_value = mock_vision
+            mock_vision.summarize_page_image.return_value = "Page summary"
+            mock_vision.summarize_document_from_pages.side_effect = (
+                lambda pages, name: f"Summary of {name}"
+            )
+
+            indexer = DataRoomIndexer(
+                google_credentials_path="/path/to/creds.json",
+                working_dir=tmpdir,
+                max_document_workers=3,
+            )
+
+            index_text = indexer.build_data_room_index(folder_id="folder123")
+
+            assert mock_drive.download_file.call_count == 5
+            assert "file3" not in index_text
+            positions = [index_text.index(f"**file{i}**") for i in (1, 2, 4, 5)]
+            assert positions == sorted(positions)
+
+    @patch("lawdit.indexer.data_room_indexer.GoogleDriveClient")
+    @patch("lawdit.indexer.data_room_indexer.PDFProcessor")
+    @patch("lawdit.indexer.data_room_indexer.VisionSummarizer")
+    def test_build_data_room_index_skips_unchanged_documents(
+        self, mock_vision_class, mock_pdf_class, mock_drive_class
+    ):
+        """Test that a second run only reprocesses files whose fingerprint changed."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            files = [
+                {
+                    "id": "file1",
+                    "name": "doc1.pdf",
+                    "mimeType": "application/pdf",
+                    "md5Checksum": "aaa",
+                    "modifiedTime": "2024-01-01T00:00:00Z",
+                },
+                {
+                    "id": "file2",
+                    "name": "doc2.pdf",
+                    "mimeType": "application/pdf",
+                    "md5Checksum": "bbb",
+                    "modifiedTime": "2024-01-01T00:00:00Z",
+                },
+            ]
+            mock_drive = Mock()
+            mock_drive_class.return_value = mock_drive
+            mock_drive.list_folder_contents.return_value = files
+            mock_drive.download_file.return_value = True
+
+            mock_pdf = Mock()
+            mock_pdf_class.return_value = mock_pdf
+            mock_pdf.iter_pages.return_value = [("/path/to/page_0001.png", b"page-1")]
+
+            mock_vision = Mock()
+            mock_vision_class.return_value = mock_vision
+            mock_vision.summarize_page_image.return_value = "Page summary"
+            mock_vision.summarize_document_from_pages.side_effect = (
+                lambda pages, name: f"Summary of {name}"
+            )
+
+            indexer = DataRoomIndexer(
+                google_credentials_path="/path/to/creds.json", working_dir=tmpdir
+            )
+            indexer.build_data_room_index(folder_id="folder123")
+            assert mock_drive.download_file.call_count == 2
+            assert (Path(tmpdir) / "index_manifest.json").exists()
+
+            # Second run: only doc2 changed
+            files[1] = {**files[1], "md5Checksum": "ccc"}
+            mock_drive.download_file.reset_mock()
+            index_text = indexer.build_data_room_index(folder_id="folder123")
+
+            mock_drive.download_file.assert_called_once()
+            assert mock_drive.download_file.call_args[0][0] == "file2"
+            assert "Summary of doc1.pdf" in index_text
+            assert "Summary of doc2.pdf" in index_text
+
+            # Disabling the cache reprocesses everything
+            indexer.cache_enabled = False
+            mock_drive.download_file.reset_mock()
+            indexer.build_data_room_index(folder_id="folder123")
+            assert mock_drive.download_file.call_count == 2
+
+    @patch("lawdit.indexer.data_room_indexer.GoogleDriveClient")
+    @patch("lawdit.indexer.data_room_indexer.PDFProcessor")
+    @patch("lawdit.indexer.data_room_indexer.VisionSummarizer")
+    def test_build_data_room_index_retries_failed_summaries(
+        self, mock_vision_class, mock_pdf_class, mock_drive_class
+    ):
+        """Test that documents with failed vision requests are not cached."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mock_drive = Mock()
+            mock_drive_class.return_value = mock_drive
+            mock_drive.list_folder_contents.return_value = [
+                {"id": "file1", "name": "doc1.pdf", "mimeType": "application/pdf", "version": "1"},
+                {"id": "file2", "name": "doc2.pdf", "mimeType": "application/pdf", "version": "1"},
+            ]
+            mock_drive.download_file.return_value = True
+
+            mock_pdf = Mock()
+            mock_pdf_class.return_value = mock_pdf
+            mock_pdf.iter_pages.return_value = [("/path/to/page_0001.png", b"page-1")]
+
+            mock_vision = Mock()
+            mock_vision_class.return_value = mock_vision
+            mock_vision.summarize_page_image.return_value = "Page summary"
+            mock_vision.summarize_document_from_pages.side_effect = lambda pages, name: (
+                "Error summarizing document doc2.pdf" if name == "doc2.pdf" else "Summary"
+            )
+
+            indexer = DataRoomIndexer(
+                google_credentials_path="/path/to/creds.json", working_dir=tmpdir
+            )
+            indexer.build_data_room_index(folder_id="folder123")
+
+            manifest = json.loads((Path(tmpdir) / "index_manifest.json").read_text())
+            assert list(manifest) == ["file1"]
+
+            mock_drive.download_file.reset_mock()
+            indexer.build_data_room_index(folder_id="folder123")
+
+            mock_drive.download_file.assert_called_once()
+            assert mock_drive.download_file.call_args[0][0] == "file2"
+
+    @patch("lawdit.indexer.data_room_indexer.GoogleDriveClient")
+    @patch("lawdit.indexer.data_room_indexer.PDFProcessor")
+    @patch("lawdit.indexer.data_room_indexer.VisionSummarizer")
+    def test_build_data_room_index_empty_listing_keeps_cache(
+        self, mock_vision_class, mock_pdf_class, mock_drive_class
+    ):
+        """Test that an empty folder listing leaves the manifest and records index alone."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mock_drive = Mock()
+            mock_drive_class.return_value = mock_drive
+            mock_drive.list_folder_contents.return_value = []
+
+            manifest_path = Path(tmpdir) / "index_manifest.json"
+            records_path = Path(tmpdir) / "index.jsonl"
+            manifest_path.write_text('{"file1": {}}')
+            records_path.write_text('{"doc_id": "file1"}\n')
+
+            indexer = DataRoomIndexer(
+                google_credentials_path="/path/to/creds.json", working_dir=tmpdir
+            )
+            indexer.build_data_room_index(folder_id="folder123")
+
+            assert manifest_path.read_text() == '{"file1": {}}'
+            assert records_path.read_text() == '{"doc_id": "file1"}\n'
+
+    @patch("lawdit.indexer.data_room_indexer.GoogleDriveClient")
+    @patch("lawdit.indexer.data_room_indexer.PDFProcessor")
+    @patch("lawdit.indexer.data_room_indexer.VisionSummarizer")
+    def test_build_data_room_index_without_returning_text(
+        self, mock_vision_class, mock_pdf_class, mock_drive_class
+    ):
+        """Test that return_text=False streams the index and returns its path."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mock_drive = Mock()
+            mock_drive_class.return_value = mock_drive
+            mock_drive.list_folder_contents.return_value = [
+                {"id": "file1", "name": "doc1.pdf", "mimeType": "application/pdf"},
+                {"id": "file2", "name": "doc2.pdf", "mimeType": "application/pdf"},
+            ]
+            mock_drive.download_file.return_value = True
+
+            mock_pdf = Mock()
+            mock_pdf_class.return_value = mock_pdf
+            mock_pdf.iter_pages.return_value = [("/path/to/page_0001.png", b"page-1")]
+
+            mock_vision = Mock()
+            mock_vision_class.return_value = mock_vision
+            mock_vision.summarize_page_image.return_value = "Page summary"
+            mock_vision.summarize_document_from_pages.side_effect = (
+                lambda pages, name: f"Summary of {name}"
+            )
+
+            indexer = DataRoomIndexer(
+                google_credentials_path="/path/to/creds.json", working_dir=tmpdir
+            )
+
+            output_path = Path(tmpdir) / "index.txt"
+            result = indexer.build_data_room_index(
+                folder_id="folder123", output_path=str(output_path), return_text=False
+            )
+
+            assert result == str(output_path)
+            assert output_path.read_text() == (
+                "# Data Room Index\n"
+                "\n- **file1**: doc1.pdf\n  Summary: Summary of doc1.pdf\n"
+                "\n- **file2**: doc2.pdf\n  Summary: Summary of doc2.pdf\n"
+            )
+
+    @patch("lawdit.indexer.data_room_indexer.GoogleDriveClient")
+    @patch("lawdit.indexer.data_room_indexer.PDFProcessor")
+    @patch("lawdit.indexer.data_room_indexer.VisionSummarizer")
+    def test_build_data_room_index_writes_utf8(
+        self, mock_vision_class, mock_pdf_class, mock_drive_class
+    ):
+        """Test that the index file is UTF-8 with LF newlines regardless of platform."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mock_drive = Mock()
+            mock_drive_class.return_value = mock_drive
+            mock_drive.list_folder_contents.return_value = [
+                {"id": "file1", "name": "Société.pdf", "mimeType": "application/pdf"},
+            ]
+            mock_drive.download_file.return_value = True
+
+            mock_pdf = Mock()
+            mock_pdf_class.return_value = mock_pdf
+            mock_pdf.iter_pages.return_value = [("/path/to/page_0001.png", b"page-1")]
+
+            mock_vision = Mock()
+            mock_vision_class.return_value = mock_vision
+            mock_vision.summarize_page_image.return_value = "Page summary"
+            mock_vision.summarize_document_from_pages.return_value = "Loan of €5m – secured"
+
+            indexer = DataRoomIndexer(
+                google_credentials_path="/path/to/creds.json", working_dir=tmpdir
+            )
+
+            output_path = Path(tmpdir) / "index.txt"
+            indexer.build_data_room_index(folder_id="folder123", output_path=str(output_path))
+
+            content = output_path.read_bytes()
+            assert b"\r\n" not in content
+            assert content.decode("utf-8") == (
+                "# Data Room Index\n"
+                "\n- **file1**: Société.pdf\n  Summary: Loan of €5m – secured\n"
+            )
+
+    @patch("lawdit.indexer.data_room_indexer.GoogleDriveClient")
+    @patch("lawdit.indexer.data_room_indexer.PDFProcessor")
+    @patch("lawdit.indexer.data_room_indexer.VisionSummarizer")
+    def test_build_data_room_index_writes_records_index(
+        self, mock_vision_class, mock_pdf_class, mock_drive_class
+    ):
+        """Test that every record is merged into index.jsonl, including reused ones."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            files = [
+                {"id": "file1", "name": "doc1.pdf", "mimeType": "application/pdf", "md5Checksum": "a"},
+                {"id": "file2", "name": "doc2.pdf", "mimeType": "application/pdf", "md5Checksum": "b"},
+            ]
+            mock_drive = Mock()
+            mock_drive_class.return_value = mock_drive
+            mock_drive.list_folder_contents.return_value = files
+            mock_drive.download_file.return_value = True
+
+            mock_pdf = Mock()
+            mock_pdf_class.return_value = mock_pdf
+            mock_pdf.iter_pages.return_value = [("/path/to/page_0001.png", b"page-1")]
+
+            mock_vision = Mock()
+            mock_vision_class.return_value = mock_vision
+            mock_vision.summarize_page_image.return_value = "Page summary"
+            mock_vision.summarize_document_from_pages.side_effect = (
+                lambda pages, name: f"Summary of {name}"
+            )
+
+            indexer = DataRoomIndexer(
+                google_credentials_path="/path/to/creds.json", working_dir=tmpdir
+            )
+            indexer.build_data_room_index(folder_id="folder123")
+            # Second run reuses doc1 from its saved record
+            files[1] = {**files[1], "md5Checksum": "c"}
+            indexer.build_data_room_index(folder_id="folder123")
+
+            lines = (Path(tmpdir) / "index.jsonl").read_text().splitlines()
+            records = [json.loads(line) for line in lines]
+
+            assert [r["doc_id"] for r in records] == ["file1", "file2"]
+            assert records[0]["record_dir"] == "doc1.pdf-file1"
+            assert records[0]["pages"] == [{"page_num": 1, "summary": "Page summary"}]
+            assert records[1]["document_summary"] == "Summary of doc2.pdf"
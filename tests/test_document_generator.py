@@ -295,6 +295,20 @@ class TestWordDocumentGeneratorSave:
             # Verify document was saved
             mock_doc.save.assert_called_once_with(output_path)
 
+    def test_save_to_stream(self):
+        """Test that save writes a valid package to a binary stream."""
+        import io
+        import zipfile
+
+        generator = WordDocumentGenerator()
+        generator.add_executive_summary("Summary")
+
+        buffer = io.BytesIO()
+        generator.save(buffer)
+
+        buffer.seek(0)
+        assert "word/document.xml" in zipfile.ZipFile(buffer).namelist()
+
 
 class TestDashboardGeneratorInitialization:
     """Tests for DashboardGenerator initialization."""
@@ -369,6 +383,37 @@ class TestDashboardGeneratorAddRisk:
         assert len(generator.risks) == 1
         assert len(generator.categories) == 0
 
+    def test_add_risk_renders_card(self):
+        """Test that the risk card is rendered when the risk is added."""
+        generator = DashboardGenerator()
+
+        generator.add_risk({"title": "Risk 1", "category": "Contracts", "severity": "High"})
+
+        assert len(generator._cards) == 1
+        assert "Risk 1" in generator._cards[0]
+        assert 'class="risk-card high"' in generator._cards[0]
+
+    def test_add_risks_bulk(self):
+        """Test adding several risks in one call."""
+        generator = DashboardGenerator()
+
+        generator.add_risk({"title": "Risk 0", "category": "Contracts", "severity": "Low"})
+        generator.add_risks(
+            risk
+            for risk in [
+                {"title": "Risk 1", "category": "Contracts", "severity": "High"},
+                {"title": "Risk 2", "category": "Regulatory", "severity": "Medium"},
+                {"title": "Risk 3", "severity": "Low"},
+            ]
+        )
+
+        assert len(generator.risks) == 4
+        assert len(generator._cards) == 4
+        assert generator.categories == ["Contracts", "Regulatory"]
+        assert "Risk 3" in generator._generate_risk_cards()
+        assert generator._count_by_severity("Low") == 2
+        assert generator._count_by_severity("High") == 1
+
 
 class TestDashboardGeneratorCountBySeverity:
     """Tests for _count_by_severity method."""
@@ -433,6 +478,38 @@ class TestDashboardGeneratorGenerateRiskCards:
         assert "Critical" in html
         assert "System vulnerability found" in html
 
+    def test_generate_risk_cards_escapes_fields(self):
+        """Test that risk text cannot inject markup into the dashboard."""
+        generator = DashboardGenerator()
+
+        generator.add_risk(
+            {
+                "title": "<script>alert(1)</script>",
+                "category": 'IP "Assignment"',
+                "severity": "High",
+                "description": "Fees < $5k & waived",
+            }
+        )
+        html = generator._generate_risk_cards()
+
+        assert "<script>" not in html
+        assert "&lt;script&gt;alert(1)&lt;/script&gt;" in html
+        assert 'data-category="IP &quot;Assignment&quot;"' in html
+        assert "Fees &lt; $5k &amp; waived" in html
+        assert '<option value="IP &quot;Assignment&quot;">' in generator.generate_html()
+
+    def test_generate_risk_cards_non_string_fields(self):
+        """Test that None and non-string fields render instead of raising."""
+        generator = DashboardGenerator()
+
+        generator.add_risk({"title": None, "category": 7, "severity": None, "description": 42})
+        html = generator.generate_html()
+
+        assert "Untitled Risk" in html
+        assert 'data-category="7"' in html
+        assert "Unknown" in html
+        assert '<div class="risk-description">42</div>' in html
+
     def test_generate_risk_cards_multiple_risks(self):
         """Test generating cards for multiple risks."""
         generator = DashboardGenerator()
@@ -484,6 +561,21 @@ class TestDashboardGeneratorRisksToJson:
         assert len(parsed) == 2
         assert parsed[0]["title"] == "Risk 1"
 
+    def test_risks_to_json_cannot_close_script(self):
+        """Test that risk text embedded in the page script cannot end the script."""
+        generator = DashboardGenerator()
+
+        description = "</script><script>alert(1)</script> & more"
+        generator.add_risk({"title": "Risk 1", "description": description})
+
+        json_str = generator._risks_to_json()
+
+        assert "<" not in json_str
+        assert ">" not in json_str
+        assert "&" not in json_str
+        assert json.loads(json_str)[0]["description"] == description
+        assert "<script>alert(1)" not in generator.generate_html()
+
 
 class TestDashboardGeneratorGenerateHtml:
     """Tests for generate_html method."""
@@ -617,3 +709,22 @@ class TestDashboardGeneratorSave:
             assert "émojis 🔒" in content
             assert "Sécurité" in content
             assert "café" in content
+
+    def test_save_matches_generate_html(self):
+        """Test that the streamed file matches the HTML built in memory."""
+        generator = DashboardGenerator()
+
+        generator.add_risks(
+            [
+                {"title": "Risk 1", "category": "Tax", "severity": "Critical"},
+                {"title": "Risk 2", "category": "IP", "severity": "Low"},
+            ]
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_path = os.path.join(tmpdir, "dashboard.html")
+
+            generator.save(output_path)
+
+            with open(output_path, "r", encoding="utf-8") as f:
+                assert f.read() == generator.generate_html()
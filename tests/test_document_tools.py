@@ -13,7 +13,14 @@ import pytest
 from PIL import Image
 
 from lawdit.tools.document_tools import (
+    WEB_FETCH_MAX_BYTES,
     DocumentStore,
+    _html_to_text,
+    _http_session,
+    _iter_record_files,
+    _page_data,
+    _page_preview,
+    _tavily_client,
     get_document,
     get_document_pages,
     get_document_store,
@@ -23,6 +30,16 @@ from lawdit.tools.document_tools import (
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_client_caches():
+    """Give every test fresh Tavily clients and a fresh HTTP session."""
+    _tavily_client.cache_clear()
+    _http_session.cache_clear()
+    yield
+    _tavily_client.cache_clear()
+    _http_session.cache_clear()
+
+
 class TestDocumentStoreInitialization:
     """Tests for DocumentStore initialization."""
 
@@ -89,6 +106,55 @@ class TestDocumentStoreLoadDocuments:
             assert "doc123" in store.documents
             assert store.documents["doc123"]["file_name"] == "test.pdf"
             assert store.documents["doc123"]["_dir_path"] == str(doc_dir)
+            assert store.documents["doc123"]["_page_summaries"] == {
+                1: "Page 1 summary",
+                2: "Page 2 summary",
+            }
+
+    def test_load_documents_from_records_index(self):
+        """Test that the merged index.jsonl is loaded instead of per-document files."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            records = [
+                {"doc_id": f"doc{i}", "file_name": f"doc{i}.pdf", "record_dir": f"dir{i}"}
+                for i in range(3)
+            ]
+            (Path(tmpdir) / "index.jsonl").write_text(
+                "".join(json.dumps(record) + "\n" for record in records)
+            )
+
+            index_path = Path(tmpdir) / "index.txt"
+            index_path.write_text("# Data Room Index")
+
+            with patch.object(Path, "glob") as mock_glob:
+                store = DocumentStore(str(index_path), working_dir=tmpdir)
+            mock_glob.assert_not_called()
+
+            assert list(store.documents) == ["doc0", "doc1", "doc2"]
+            assert store.documents["doc1"]["_dir_path"] == str(Path(tmpdir) / "dir1")
+            assert "record_dir" not in store.documents["doc1"]
+
+    def test_load_documents_migrates_to_records_index(self):
+        """Test that a legacy working directory gets a merged index on first load."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            doc_dir = Path(tmpdir) / "test_document"
+            doc_dir.mkdir()
+            record = {"doc_id": "doc123", "file_name": "test.pdf", "pages": []}
+            with open(doc_dir / "document_record.json", "w") as f:
+                json.dump(record, f)
+
+            index_path = Path(tmpdir) / "index.txt"
+            index_path.write_text("# Data Room Index")
+
+            DocumentStore(str(index_path), working_dir=tmpdir)
+
+            lines = (Path(tmpdir) / "index.jsonl").read_text().splitlines()
+            assert [json.loads(line) for line in lines] == [
+                {**record, "record_dir": "test_document"}
+            ]
+
+            # The next store loads the same documents from the merged index
+            store = DocumentStore(str(index_path), working_dir=tmpdir)
+            assert store.documents["doc123"]["_dir_path"] == str(doc_dir)
 
     def test_load_multiple_documents(self):
         """Test loading multiple document records."""
@@ -140,6 +206,18 @@ class TestDocumentStoreLoadDocuments:
             # Should handle error gracefully
             assert len(store.documents) == 0
 
+    def test_iter_record_files_skips_non_document_entries(self):
+        """Test that only directories holding a document record are yielded."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / "doc_a").mkdir()
+            (Path(tmpdir) / "doc_a" / "document_record.json").write_text("{}")
+            (Path(tmpdir) / "no_record").mkdir()
+            (Path(tmpdir) / "index.txt").write_text("# Data Room Index")
+
+            record_files = list(_iter_record_files(Path(tmpdir)))
+
+            assert record_files == [os.path.join(tmpdir, "doc_a", "document_record.json")]
+
 
 class TestDocumentStoreGetDocumentSummary:
     """Tests for get_document_summary method."""
@@ -180,6 +258,10 @@ class TestDocumentStoreGetDocumentSummary:
             assert "Page 1: Title page" in summary
             assert "Page 2: Terms and conditions" in summary
 
+            # The formatted summary is built once and reused
+            store.documents["doc123"]["pages"] = []
+            assert store.get_document_summary("doc123") is summary
+
     def test_get_document_summary_not_found(self):
         """Test retrieval of non-existent document."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -193,6 +275,42 @@ class TestDocumentStoreGetDocumentSummary:
             assert "not found" in summary
 
 
+class TestPagePreview:
+    """Tests for the page preview helper."""
+
+    @pytest.mark.parametrize("size", [0, 1, 74, 75, 76, 300_001])
+    def test_page_preview_matches_full_encoding(self, size):
+        """Test that the preview and computed length match a full encode."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "page.png"
+            data = os.urandom(size)
+            path.write_bytes(data)
+
+            preview, length = _page_preview(path)
+
+        encoded = base64.b64encode(data)
+        assert preview == encoded[:100]
+        assert length == len(encoded)
+
+    def test_page_preview_missing_file(self):
+        """Test that a missing page yields None."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            assert _page_preview(Path(tmpdir) / "page.png") is None
+
+    @pytest.mark.parametrize("size", [0, 1, 300_001])
+    def test_page_data_matches_full_encoding(self, size):
+        """Test that the mapped full encode matches base64 of the file."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "page.png"
+            data = os.urandom(size)
+            path.write_bytes(data)
+
+            encoded, length = _page_data(path)
+
+        assert encoded == base64.b64encode(data)
+        assert length == len(encoded)
+
+
 class TestDocumentStoreGetDocumentPages:
     """Tests for get_document_pages method."""
 
@@ -239,6 +357,156 @@ class TestDocumentStoreGetDocumentPages:
             assert "Page 1 content" in result
             assert "Page 2 content" in result
 
+    def test_get_document_pages_preview_from_page_file(self):
+        """Test that a page file's preview and encoded length match a full encode."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pages_dir = Path(tmpdir) / "test_doc" / "pages"
+            pages_dir.mkdir(parents=True)
+            page_file = pages_dir / "page_0001.png"
+            Image.new("RGB", (200, 200), color="red").save(page_file, "PNG", compress_level=0)
+
+            record = {
+                "doc_id": "doc123",
+                "file_name": "test.pdf",
+                "mime_type": "application/pdf",
+                "total_pages": 1,
+                "document_summary": "Test document",
+                "pages": [{"page_num": 1, "summary": "Page 1 content"}],
+            }
+            with open(Path(tmpdir) / "test_doc" / "document_record.json", "w") as f:
+                json.dump(record, f)
+
+            index_path = Path(tmpdir) / "index.txt"
+            index_path.write_text("# Data Room Index")
+            store = DocumentStore(str(index_path), working_dir=tmpdir)
+
+            expected = base64.b64encode(page_file.read_bytes()).decode("ascii")
+            result = store.get_document_pages("doc123", [1])
+
+            assert f"first 100 chars): {expected[:100]}..." in result
+            assert f"[Full image data: {len(expected)} characters]" in result
+
+            full = store.get_document_pages("doc123", [1], preview_only=False)
+
+            assert f"Image (base64): {expected}\n" in full
+            assert "first 100 chars" not in full
+
+    def test_get_document_pages_from_pre_encoded_blob(self):
+        """Test that pages indexed into the base64 blob are served from it."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pages_dir = Path(tmpdir) / "test_doc" / "pages"
+            pages_dir.mkdir(parents=True)
+            encoded = [b"QUFB" * 30, b"QkJC" * 40]
+            (pages_dir / "pages.b64").write_bytes(b"".join(encoded))
+            (pages_dir / "pages_b64_index.json").write_text(
+                json.dumps({"1": [0, 120], "2": [120, 160]})
+            )
+
+            record = {
+                "doc_id": "doc123",
+                "file_name": "test.pdf",
+                "mime_type": "application/pdf",
+                "total_pages": 2,
+                "document_summary": "Test document",
+                "pages": [
+                    {"page_num": 1, "summary": "Page 1 content"},
+                    {"page_num": 2, "summary": "Page 2 content"},
+                ],
+            }
+            with open(Path(tmpdir) / "test_doc" / "document_record.json", "w") as f:
+                json.dump(record, f)
+
+            index_path = Path(tmpdir) / "index.txt"
+            index_path.write_text("# Data Room Index")
+            store = DocumentStore(str(index_path), working_dir=tmpdir)
+
+            result = store.get_document_pages("doc123", [2, 1, 3])
+
+            assert f"{'QkJC' * 25}..." in result
+            assert "[Full image data: 160 characters]" in result
+            assert f"{'QUFB' * 25}..." in result
+            assert "[Full image data: 120 characters]" in result
+            assert "Page 3: Not found" in result
+
+            full = store.get_document_pages("doc123", [2, 1], preview_only=False)
+
+            assert f"Image (base64): {'QkJC' * 40}\n" in full
+            assert f"Image (base64): {'QUFB' * 30}\n" in full
+
+            # Closing unmaps the blob; it is mapped again on the next request
+            mapped = store._page_blobs["doc123"][0]
+            store.close()
+
+            assert mapped.closed
+            assert store._page_blobs == {}
+            assert f"{'QUFB' * 25}..." in store.get_document_pages("doc123", [1])
+            store.close()
+
+    def test_get_document_pages_jpeg_pages(self):
+        """Test that pages indexed as JPEG are found alongside missing ones."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pages_dir = Path(tmpdir) / "test_doc" / "pages"
+            pages_dir.mkdir(parents=True)
+            page_file = pages_dir / "page_0001.jpg"
+            Image.new("RGB", (10, 10), color="red").save(page_file, "JPEG")
+            (pages_dir / "notes.txt").write_text("not a page")
+
+            record = {
+                "doc_id": "doc123",
+                "file_name": "test.pdf",
+                "mime_type": "application/pdf",
+                "total_pages": 2,
+                "document_summary": "Test document",
+                "pages": [],
+            }
+            with open(Path(tmpdir) / "test_doc" / "document_record.json", "w") as f:
+                json.dump(record, f)
+
+            index_path = Path(tmpdir) / "index.txt"
+            index_path.write_text("# Data Room Index")
+            store = DocumentStore(str(index_path), working_dir=tmpdir)
+
+            expected = base64.b64encode(page_file.read_bytes())
+            result = store.get_document_pages("doc123", [1, 2])
+
+            assert f"[Full image data: {len(expected)} characters]" in result
+            assert "Page 2: Not found" in result
+
+    def test_get_document_pages_reads_files_in_requested_order(self):
+        """Test that pages read concurrently from disk are reported in request order."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pages_dir = Path(tmpdir) / "test_doc" / "pages"
+            pages_dir.mkdir(parents=True)
+            sizes = {}
+            for page_num in range(1, 5):
+                page_file = pages_dir / f"page_{page_num:04d}.png"
+                Image.new("RGB", (page_num * 10, 10), color="red").save(page_file, "PNG")
+                sizes[page_num] = len(base64.b64encode(page_file.read_bytes()))
+
+            record = {
+                "doc_id": "doc123",
+                "file_name": "test.pdf",
+                "mime_type": "application/pdf",
+                "total_pages": 4,
+                "document_summary": "Test document",
+                "pages": [],
+            }
+            with open(Path(tmpdir) / "test_doc" / "document_record.json", "w") as f:
+                json.dump(record, f)
+
+            index_path = Path(tmpdir) / "index.txt"
+            index_path.write_text("# Data Room Index")
+            store = DocumentStore(str(index_path), working_dir=tmpdir)
+
+            result = store.get_document_pages("doc123", [4, 2, 3])
+
+            reported = [
+                int(line.split(": ")[1].split()[0])
+                for line in result.splitlines()
+                if line.startswith("[Full image data")
+            ]
+            assert reported == [sizes[4], sizes[2], sizes[3]]
+
     def test_get_document_pages_not_found(self):
         """Test retrieval of pages from non-existent document."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -289,6 +557,11 @@ class TestDocumentStoreGetDocumentPages:
             # Should handle missing page gracefully
             assert "Page 2: Not found" in result
 
+            sections = list(store._iter_document_pages("doc123", [1, 2]))
+            assert sections[:2] == ["Document: test.pdf", "Requested pages: [1, 2]\n"]
+            assert sections[3] == "\nPage 2: Not found"
+            assert "\n".join(sections) == result
+
 
 class TestGlobalDocumentStore:
     """Tests for global document store functions."""
@@ -306,6 +579,41 @@ class TestGlobalDocumentStore:
             assert isinstance(store, DocumentStore)
             assert store.index_path == index_path
 
+    def test_initialize_document_store_returns_index_text(self):
+        """Test that initialization returns the index contents."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            index_path = Path(tmpdir) / "index.txt"
+            index_path.write_text("# Data Room Index\n- **doc1**: contract.pdf", encoding="utf-8")
+
+            index_text = initialize_document_store(str(index_path), working_dir=tmpdir)
+
+            assert index_text == "# Data Room Index\n- **doc1**: contract.pdf"
+
+    def test_initialize_document_store_closes_previous_store(self):
+        """Test that re-initializing unmaps the page blobs of the replaced store."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            index_path = Path(tmpdir) / "index.txt"
+            index_path.write_text("# Data Room Index")
+
+            initialize_document_store(str(index_path), working_dir=tmpdir)
+            previous = get_document_store()
+
+            with patch.object(previous, "close") as mock_close:
+                initialize_document_store(str(index_path), working_dir=tmpdir)
+
+            mock_close.assert_called_once_with()
+            assert get_document_store() is not previous
+
+    def test_read_index_empty_file(self):
+        """Test reading an empty index file."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            index_path = Path(tmpdir) / "index.txt"
+            index_path.write_text("")
+
+            store = DocumentStore(str(index_path), working_dir=tmpdir)
+
+            assert store.read_index() == ""
+
     def test_get_document_store_not_initialized(self):
         """Test getting document store before initialization."""
         # Reset global store
@@ -469,31 +777,58 @@ class TestInternetSearchTool:
         assert call_args[1]["max_results"] == 3
 
 
+class TestHtmlToText:
+    """Tests for web_fetch's HTML text extraction."""
+
+    HTML = (
+        "<html><head><style>p { color: red; }</style>"
+        "<script>var x = '<p>hidden</p>';</script></head>"
+        "<body><h1>Title</h1>\n<p>Fish &amp; chips</p></body></html>"
+    )
+
+    @patch("lawdit.tools.document_tools.HTMLParser", None)
+    def test_regex_fallback(self):
+        """Test that scripts, styles and tags are stripped without selectolax."""
+        assert _html_to_text(self.HTML) == "Title Fish & chips"
+
+    def test_selectolax_parser(self):
+        """Test that selectolax is used when installed."""
+        pytest.importorskip("selectolax")
+
+        assert _html_to_text(self.HTML) == "Title Fish & chips"
+
+
 class TestWebFetchTool:
     """Tests for web_fetch tool."""
 
-    @patch("lawdit.tools.document_tools.requests.get")
-    def test_web_fetch_success(self, mock_get):
+    @patch("lawdit.tools.document_tools.requests.Session")
+    def test_web_fetch_success(self, mock_session):
         """Test successful web page fetch."""
+        mock_get = mock_session.return_value.get
         mock_response = Mock()
-        mock_response.text = "<html><body><p>Test content here</p></body></html>"
+        mock_response.raw.read.return_value = b"<html><body><p>Test content here</p></body></html>"
+        mock_response.encoding = "utf-8"
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
 
         result = web_fetch.invoke({"url": "https://example.com/article"})
 
-        # Verify request was made
+        # Verify request was made and the body read was bounded
         mock_get.assert_called_once()
+        assert mock_get.call_args.kwargs["stream"] is True
+        mock_response.raw.read.assert_called_once_with(WEB_FETCH_MAX_BYTES, decode_content=True)
+        mock_response.close.assert_called_once()
 
         # Verify content was extracted
         assert "Test content here" in result
         assert "https://example.com/article" in result
 
-    @patch("lawdit.tools.document_tools.requests.get")
-    def test_web_fetch_timeout(self, mock_get):
+    @patch("lawdit.tools.document_tools.requests.Session")
+    def test_web_fetch_timeout(self, mock_session):
         """Test handling of request timeout."""
         import requests
 
+        mock_get = mock_session.return_value.get
         mock_get.side_effect = requests.exceptions.Timeout()
 
         result = web_fetch.invoke({"url": "https://example.com/slow"})
@@ -501,11 +836,12 @@ class TestWebFetchTool:
         assert "Error" in result
         assert "timed out" in result
 
-    @patch("lawdit.tools.document_tools.requests.get")
-    def test_web_fetch_request_error(self, mock_get):
+    @patch("lawdit.tools.document_tools.requests.Session")
+    def test_web_fetch_request_error(self, mock_session):
         """Test handling of request errors."""
         import requests
 
+        mock_get = mock_session.return_value.get
         mock_get.side_effect = requests.exceptions.RequestException("Connection failed")
 
         result = web_fetch.invoke({"url": "https://example.com/error"})
@@ -514,11 +850,11 @@ class TestWebFetchTool:
 
     @patch.dict(os.environ, {"TAVILY_API_KEY": "test-api-key"})
     @patch("lawdit.tools.document_tools.TavilyClient")
-    @patch("lawdit.tools.document_tools.requests.get")
-    def test_web_fetch_with_tavily_extract(self, mock_get, mock_tavily):
+    @patch("lawdit.tools.document_tools.requests.Session")
+    def test_web_fetch_with_tavily_extract(self, mock_session, mock_tavily):
         """Test web fetch using Tavily extract."""
+        mock_get = mock_session.return_value.get
         mock_response = Mock()
-        mock_response.text = "<html><body>Content</body></html>"
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
 
@@ -533,5 +869,20 @@ class TestWebFetchTool:
         # Verify Tavily extract was attempted
         mock_client.extract.assert_called_once()
 
-        # Verify Tavily content was used
+        # Verify Tavily content was used without reading the page body
         assert "Extracted content from Tavily" in result
+        mock_response.raw.read.assert_not_called()
+
+    @patch.dict(os.environ, {"TAVILY_API_KEY": "test-api-key"})
+    @patch("lawdit.tools.document_tools.TavilyClient")
+    @patch("lawdit.tools.document_tools.requests.Session")
+    def test_web_fetch_reuses_session_and_client(self, mock_session, mock_tavily):
+        """Test that repeated fetches share one HTTP session and Tavily client."""
+        mock_tavily.return_value.extract.return_value = {"results": [{"raw_content": "Text"}]}
+
+        web_fetch.invoke({"url": "https://example.com/a"})
+        web_fetch.invoke({"url": "https://example.com/b"})
+
+        mock_session.assert_called_once()
+        mock_tavily.assert_called_once_with(api_key="test-api-key")
+        assert mock_session.return_value.get.call_count == 2
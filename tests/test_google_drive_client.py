@@ -4,11 +4,13 @@ Tests for Google Drive client
 
 import io
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, Mock, mock_open, patch
 
 import pytest
 
-from lawdit.indexer.google_drive_client import GoogleDriveClient
+from lawdit.indexer.google_drive_client import DOWNLOAD_CHUNK_SIZE, GoogleDriveClient
 
 
 class TestGoogleDriveClientInitialization:
@@ -96,8 +98,13 @@ class TestGoogleDriveClientListFolderContents:
         # Verify API call was made correctly
         mock_service.files.return_value.list.assert_called_once_with(
             q="'folder123' in parents and trashed=false",
-            fields="nextPageToken, files(id, name, mimeType, size)",
+            fields=(
+                "nextPageToken, "
+                "files(id, name, mimeType, size, md5Checksum, modifiedTime, version)"
+            ),
             pageSize=1000,
+            supportsAllDrives=True,
+            includeItemsFromAllDrives=True,
         )
 
         # Verify results
@@ -179,6 +186,74 @@ class TestGoogleDriveClientListFolderContents:
         assert files == []
 
 
+class TestGoogleDriveClientListFoldersContentsBatched:
+    """Tests for list_folders_contents_batched method."""
+
+    @patch("lawdit.indexer.google_drive_client.service_account")
+    @patch("lawdit.indexer.google_drive_client.build")
+    def test_batched_listing_paginates_per_folder(self, mock_build, mock_service_account):
+        """Test that folders are listed in shared batches until every page is fetched."""
+        mock_service = Mock()
+        mock_build.return_value = mock_service
+        mock_service.files.return_value.list.side_effect = lambda **params: params
+
+        responses = {
+            ("folderA", None): {"files": [{"id": "a1"}], "nextPageToken": "tokA"},
+            ("folderB", None): {"files": [{"id": "b1"}]},
+            ("folderA", "tokA"): {"files": [{"id": "a2"}]},
+        }
+        batches = []
+
+        def new_batch(callback):
+            batch = Mock()
+            calls = []
+            batch.add.side_effect = lambda request, request_id: calls.append((request, request_id))
+
+            def execute():
+                batches.append([request_id for _, request_id in calls])
+                for request, request_id in calls:
+                    key = (request_id, request.get("pageToken"))
+                    callback(request_id, responses[key], None)
+
+            batch.execute.side_effect = execute
+            return batch
+
+        mock_service.new_batch_http_request.side_effect = new_batch
+
+        client = GoogleDriveClient(credentials_path="/path/to/creds.json")
+        results = client.list_folders_contents_batched(["folderA", "folderB"])
+
+        assert batches == [["folderA", "folderB"], ["folderA"]]
+        assert results == {
+            "folderA": [{"id": "a1"}, {"id": "a2"}],
+            "folderB": [{"id": "b1"}],
+        }
+
+    @patch("lawdit.indexer.google_drive_client.service_account")
+    @patch("lawdit.indexer.google_drive_client.build")
+    def test_batched_listing_records_failed_folder_as_empty(
+        self, mock_build, mock_service_account
+    ):
+        """Test that a failed call only affects its own folder."""
+        mock_service = Mock()
+        mock_build.return_value = mock_service
+
+        def new_batch(callback):
+            batch = Mock()
+            batch.execute.side_effect = lambda: (
+                callback("folderA", {"files": [{"id": "a1"}]}, None),
+                callback("folderB", None, Exception("Forbidden")),
+            )
+            return batch
+
+        mock_service.new_batch_http_request.side_effect = new_batch
+
+        client = GoogleDriveClient(credentials_path="/path/to/creds.json")
+        results = client.list_folders_contents_batched(["folderA", "folderB"])
+
+        assert results == {"folderA": [{"id": "a1"}], "folderB": []}
+
+
 class TestGoogleDriveClientDownloadFile:
     """Tests for download_file method."""
 
@@ -221,6 +296,51 @@ class TestGoogleDriveClientDownloadFile:
         # Verify download was successful
         assert result is True
 
+    @patch("lawdit.indexer.google_drive_client.service_account")
+    @patch("lawdit.indexer.google_drive_client.build")
+    @patch("lawdit.indexer.google_drive_client.MediaIoBaseDownload")
+    @patch("builtins.open", new_callable=mock_open)
+    def test_download_file_uses_large_chunks(
+        self, mock_file, mock_download, mock_build, mock_service_account
+    ):
+        """Test that downloads request large chunks to cut HTTP round-trips."""
+        mock_service = Mock()
+        mock_build.return_value = mock_service
+        mock_request = mock_service.files.return_value.get_media.return_value
+
+        mock_download.return_value.next_chunk.return_value = (None, True)
+
+        client = GoogleDriveClient(credentials_path="/path/to/creds.json")
+        assert client.download_file("file123", "/tmp/out.pdf") is True
+
+        mock_download.assert_called_once_with(
+            mock_file.return_value, mock_request, chunksize=DOWNLOAD_CHUNK_SIZE
+        )
+        assert DOWNLOAD_CHUNK_SIZE == 16 * 1024 * 1024
+
+    @patch("lawdit.indexer.google_drive_client.service_account")
+    @patch("lawdit.indexer.google_drive_client.build")
+    @patch("lawdit.indexer.google_drive_client.MediaIoBaseDownload")
+    @patch("builtins.open", new_callable=mock_open)
+    def test_download_chunk_size_is_configurable(
+        self, mock_file, mock_download, mock_build, mock_service_account
+    ):
+        """Test that the download chunk size can be set per client."""
+        mock_service = Mock()
+        mock_build.return_value = mock_service
+        mock_request = mock_service.files.return_value.export_media.return_value
+
+        mock_download.return_value.next_chunk.return_value = (None, True)
+
+        client = GoogleDriveClient(
+            credentials_path="/path/to/creds.json", download_chunk_size=1024 * 1024
+        )
+        assert client.export_as_pdf("file123", "/tmp/out.pdf") is True
+
+        mock_download.assert_called_once_with(
+            mock_file.return_value, mock_request, chunksize=1024 * 1024
+        )
+
     @patch("lawdit.indexer.google_drive_client.service_account")
     @patch("lawdit.indexer.google_drive_client.build")
     def test_download_file_api_error(self, mock_build, mock_service_account):
@@ -239,6 +359,45 @@ class TestGoogleDriveClientDownloadFile:
         assert result is False
 
 
+    @patch("lawdit.indexer.google_drive_client.service_account")
+    @patch("lawdit.indexer.google_drive_client.build")
+    @patch("lawdit.indexer.google_drive_client.MediaIoBaseDownload")
+    def test_download_file_uses_a_connection_per_thread(
+        self, mock_download, mock_build, mock_service_account
+    ):
+        """Test that concurrent downloads each run on their thread's own connection."""
+        mock_service = Mock()
+        mock_build.return_value = mock_service
+        mock_service.files.return_value.get_media.side_effect = lambda fileId: Mock(
+            file_id=fileId
+        )
+
+        started = threading.Barrier(2)
+
+        def next_chunk():
+            started.wait(timeout=5)
+            return None, True
+
+        mock_download.return_value.next_chunk.side_effect = next_chunk
+
+        client = GoogleDriveClient(credentials_path="/path/to/creds.json")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                results = list(
+                    pool.map(
+                        client.download_file,
+                        ["fileA", "fileB"],
+                        [f"{tmpdir}/a.pdf", f"{tmpdir}/b.pdf"],
+                    )
+                )
+
+        # Both downloads were in flight at once, each with its own connection
+        assert results == [True, True]
+        requests = [call.args[1] for call in mock_download.call_args_list]
+        assert {request.file_id for request in requests} == {"fileA", "fileB"}
+        assert requests[0].http is not requests[1].http
+
 class TestGoogleDriveClientExportAsPdf:
     """Tests for export_as_pdf method."""
 
@@ -2,6 +2,9 @@
 Tests for the data room indexer
 """
 
+import logging
+from logging.handlers import QueueHandler
+
 import pytest
 
 
@@ -10,8 +13,90 @@ def test_placeholder():
     assert True
 
 
+def test_top_level_lazy_exports():
+    """Test that the indexer classes are re-exported lazily from lawdit."""
+    import lawdit
+    from lawdit.indexer.data_room_indexer import DataRoomIndexer
+
+    assert lawdit.DataRoomIndexer is DataRoomIndexer
+    assert "VisionSummarizer" in dir(lawdit)
+
+    with pytest.raises(AttributeError):
+        lawdit.NotAThing
+
+
+def test_configure_logging_installs_one_queue_handler(monkeypatch):
+    """Test that repeated configure_logging calls reuse one queue listener."""
+    from lawdit.indexer import _log
+
+    monkeypatch.setattr(_log, "_listener", None)
+    logger = logging.getLogger(_log.LOGGER_NAME)
+    monkeypatch.setattr(logger, "handlers", [])
+    monkeypatch.setattr(logger, "propagate", True)
+    monkeypatch.setattr(logger, "level", logging.NOTSET)
+
+    _log.configure_logging()
+    listener = _log._listener
+    _log.configure_logging(logging.DEBUG)
+
+    try:
+        assert _log._listener is listener
+        assert [type(h) for h in logger.handlers] == [QueueHandler]
+        assert logger.level == logging.DEBUG
+        assert logger.propagate is False
+    finally:
+        _log._stop_listener()
+
+
 # TODO: Add comprehensive tests for:
 # - GoogleDriveClient
 # - PDFProcessor
 # - VisionSummarizer
 # - DataRoomIndexer
+
+
+@pytest.fixture
+def indexer_cli_env(monkeypatch, tmp_path):
+    """Run the indexing CLI from an empty directory with fresh settings."""
+    import lawdit.config
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(lawdit.config, "settings", None)
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    credentials = tmp_path / "creds.json"
+    credentials.write_text("{}")
+    monkeypatch.setattr("sys.argv", ["lawdit-index", "-c", str(credentials), "-f", "folder"])
+    return monkeypatch
+
+
+def test_indexer_cli_defaults_come_from_settings(indexer_cli_env):
+    """Test that CLI defaults follow the environment through Settings."""
+    from unittest.mock import patch
+
+    from lawdit.indexer import cli
+
+    indexer_cli_env.setenv("CACHE_ENABLED", "false")
+    indexer_cli_env.setenv("JPEG_QUALITY", "70")
+    indexer_cli_env.setenv("MAX_PARALLEL_PROCESSES", "6")
+
+    with patch("lawdit.indexer.cli.DataRoomIndexer") as mock_indexer:
+        cli.main()
+
+    kwargs = mock_indexer.call_args.kwargs
+    assert kwargs["cache_enabled"] is False
+    assert kwargs["jpeg_quality"] == 70
+    assert kwargs["max_workers"] == 6
+    assert kwargs["openai_api_key"] == "test-key"
+
+
+def test_indexer_cli_rejects_malformed_settings(indexer_cli_env, capsys):
+    """Test that a malformed environment value exits with a message, not a traceback."""
+    from lawdit.indexer import cli
+
+    indexer_cli_env.setenv("PDF_RENDER_WORKERS", "many")
+
+    with pytest.raises(SystemExit) as excinfo:
+        cli.main()
+
+    assert excinfo.value.code == 1
+    assert "pdf_render_workers" in capsys.readouterr().out
@@ -407,3 +407,26 @@ class TestRunAnalysis:
         assert "contracts" in request_content
         assert "regulatory" in request_content
         assert "litigation" in request_content
+
+
+class TestSubagentConfigCopies:
+    """Tests that subagent factories return independent copies."""
+
+    def test_document_analyst_returns_fresh_copy(self):
+        """Test that mutating one config does not leak into the next."""
+        first = create_document_analyst_subagent()
+        first["tools"].clear()
+        first["model"] = "other-model"
+
+        second = create_document_analyst_subagent()
+
+        assert len(second["tools"]) == 4
+        assert second["model"] == "claude-sonnet-4-5-20250929"
+
+    def test_deliverable_creator_returns_fresh_copy(self):
+        """Test that the tools list is not shared between calls."""
+        first = create_deliverable_creator_subagent()
+        second = create_deliverable_creator_subagent()
+
+        assert first == second
+        assert first["tools"] is not second["tools"]
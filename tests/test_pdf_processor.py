@@ -3,15 +3,24 @@ Tests for PDF processor
 """
 
 import base64
+import io
+import json
+import mmap
 import os
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import ANY, MagicMock, Mock, patch
 
 import pytest
 from PIL import Image
 
-from lawdit.indexer.pdf_processor import PDFProcessor
+from lawdit.indexer.pdf_processor import (
+    PAGES_B64_BLOB,
+    PAGES_B64_INDEX,
+    PNG_COMPRESS_LEVEL,
+    PDFProcessor,
+)
 
 
 class TestPDFProcessorInitialization:
@@ -37,6 +46,29 @@ class TestPDFProcessorInitialization:
         processor = PDFProcessor(dpi=600)
         assert processor.dpi == 600
 
+    def test_init_invalid_backend(self):
+        """Test that an unknown rasterizer backend is rejected."""
+        with pytest.raises(ValueError):
+            PDFProcessor(backend="ghostscript")
+
+
+def fake_render(*sizes, color="white"):
+    """Build a convert_from_path stand-in that writes one PNG per page size.
+
+    Like pdf2image with paths_only=True, it writes the pages into
+    output_folder and returns their paths in page order.
+    """
+
+    def render(pdf_path, dpi, fmt, output_folder, paths_only, first_page=1, last_page=None):
+        paths = []
+        for page_num, size in enumerate(sizes, start=1):
+            path = os.path.join(output_folder, f"render-{page_num:04d}.png")
+            Image.new("RGB", (size, size), color=color).save(path, "PNG")
+            paths.append(path)
+        return paths
+
+    return render
+
 
 class TestPDFProcessorExtractPagesAsImages:
     """Tests for extract_pages_as_images method."""
@@ -44,9 +76,7 @@ class TestPDFProcessorExtractPagesAsImages:
     @patch("lawdit.indexer.pdf_processor.pdf2image.convert_from_path")
     def test_extract_pages_single_page(self, mock_convert):
         """Test extracting a single page from PDF."""
-        # Create a mock PIL image
-        mock_image = Mock(spec=Image.Image)
-        mock_convert.return_value = [mock_image]
+        mock_convert.side_effect = fake_render(10)
 
         processor = PDFProcessor(dpi=200)
 
@@ -59,23 +89,24 @@ class TestPDFProcessorExtractPagesAsImages:
 
             image_paths = processor.extract_pages_as_images(pdf_path, output_dir)
 
-            # Verify convert_from_path was called correctly
-            mock_convert.assert_called_once_with(pdf_path, dpi=200, fmt="png")
-
-            # Verify image was saved
-            mock_image.save.assert_called_once()
+            # Verify convert_from_path rendered to disk rather than into memory
+            mock_convert.assert_called_once_with(
+                pdf_path, dpi=200, fmt="png", output_folder=ANY, paths_only=True
+            )
 
             # Verify correct number of images and path format
             assert len(image_paths) == 1
             assert "page_0001.png" in image_paths[0]
             assert output_dir in image_paths[0]
+            assert os.path.exists(image_paths[0])
+
+            # Verify the scratch render directory was removed
+            assert os.listdir(output_dir) == ["page_0001.png"]
 
     @patch("lawdit.indexer.pdf_processor.pdf2image.convert_from_path")
     def test_extract_pages_multiple_pages(self, mock_convert):
         """Test extracting multiple pages from PDF."""
-        # Create mock PIL images for 3 pages
-        mock_images = [Mock(spec=Image.Image) for _ in range(3)]
-        mock_convert.return_value = mock_images
+        mock_convert.side_effect = fake_render(10, 11, 12)
 
         processor = PDFProcessor(dpi=150)
 
@@ -88,11 +119,7 @@ class TestPDFProcessorExtractPagesAsImages:
             image_paths = processor.extract_pages_as_images(pdf_path, output_dir)
 
             # Verify convert_from_path was called with correct DPI
-            mock_convert.assert_called_once_with(pdf_path, dpi=150, fmt="png")
-
-            # Verify all images were saved
-            for mock_image in mock_images:
-                mock_image.save.assert_called_once()
+            assert mock_convert.call_args.kwargs["dpi"] == 150
 
             # Verify correct number of images and proper numbering
             assert len(image_paths) == 3
@@ -100,11 +127,15 @@ class TestPDFProcessorExtractPagesAsImages:
             assert "page_0002.png" in image_paths[1]
             assert "page_0003.png" in image_paths[2]
 
+            # Verify every page landed in page order
+            for size, image_path in zip((10, 11, 12), image_paths):
+                with Image.open(image_path) as saved:
+                    assert saved.size == (size, size)
+
     @patch("lawdit.indexer.pdf_processor.pdf2image.convert_from_path")
     def test_extract_pages_creates_output_directory(self, mock_convert):
         """Test that extract_pages_as_images creates output directory if it doesn't exist."""
-        mock_image = Mock(spec=Image.Image)
-        mock_convert.return_value = [mock_image]
+        mock_convert.side_effect = fake_render(10)
 
         processor = PDFProcessor()
 
@@ -144,8 +175,7 @@ class TestPDFProcessorExtractPagesAsImages:
     @patch("lawdit.indexer.pdf_processor.pdf2image.convert_from_path")
     def test_extract_pages_with_high_dpi(self, mock_convert):
         """Test extracting pages with high DPI setting."""
-        mock_image = Mock(spec=Image.Image)
-        mock_convert.return_value = [mock_image]
+        mock_convert.side_effect = fake_render(10)
 
         processor = PDFProcessor(dpi=600)
 
@@ -158,13 +188,12 @@ class TestPDFProcessorExtractPagesAsImages:
             processor.extract_pages_as_images(pdf_path, output_dir)
 
             # Verify high DPI was used
-            mock_convert.assert_called_once_with(pdf_path, dpi=600, fmt="png")
+            assert mock_convert.call_args.kwargs["dpi"] == 600
 
     @patch("lawdit.indexer.pdf_processor.pdf2image.convert_from_path")
     def test_extract_pages_saves_as_png(self, mock_convert):
         """Test that pages are saved in PNG format."""
-        mock_image = Mock(spec=Image.Image)
-        mock_convert.return_value = [mock_image]
+        mock_convert.side_effect = fake_render(10)
 
         processor = PDFProcessor()
 
@@ -174,19 +203,18 @@ class TestPDFProcessorExtractPagesAsImages:
 
             Path(pdf_path).touch()
 
-            processor.extract_pages_as_images(pdf_path, output_dir)
+            image_paths = processor.extract_pages_as_images(pdf_path, output_dir)
 
             # Verify image was saved as PNG
-            save_call_args = mock_image.save.call_args
-            assert save_call_args[0][0].endswith(".png")
-            assert save_call_args[0][1] == "PNG"
+            assert image_paths[0].endswith(".png")
+            with Image.open(image_paths[0]) as saved:
+                assert saved.format == "PNG"
 
     @patch("lawdit.indexer.pdf_processor.pdf2image.convert_from_path")
     def test_extract_pages_many_pages_numbering(self, mock_convert):
         """Test that page numbering works correctly for many pages."""
-        # Create 1500 mock images to test 4-digit zero-padding
-        mock_images = [Mock(spec=Image.Image) for _ in range(1500)]
-        mock_convert.return_value = mock_images
+        # Render 1500 pages to test 4-digit zero-padding
+        mock_convert.side_effect = fake_render(*[1] * 1500)
 
         processor = PDFProcessor()
 
@@ -205,6 +233,225 @@ class TestPDFProcessorExtractPagesAsImages:
             assert "page_1000.png" in image_paths[999]
             assert "page_1500.png" in image_paths[1499]
 
+    def test_extract_pages_with_pymupdf_backend(self):
+        """Test that the PyMuPDF backend renders each page in-process."""
+        pages = [MagicMock() for _ in range(2)]
+        mock_doc = MagicMock()
+        mock_doc.__enter__.return_value = mock_doc
+        mock_doc.__iter__.return_value = iter(pages)
+        mock_fitz = Mock()
+        mock_fitz.open.return_value = mock_doc
+
+        processor = PDFProcessor(dpi=150, backend="pymupdf")
+
+        with tempfile.TemporaryDirectory() as tmpdir, patch.dict(
+            "sys.modules", {"fitz": mock_fitz}
+        ), patch("lawdit.indexer.pdf_processor.pdf2image.convert_from_path") as mock_convert:
+            pdf_path = os.path.join(tmpdir, "test.pdf")
+            output_dir = os.path.join(tmpdir, "output")
+
+            image_paths = processor.extract_pages_as_images(pdf_path, output_dir)
+
+            mock_convert.assert_not_called()
+            mock_fitz.open.assert_called_once_with(pdf_path)
+            for page, image_path in zip(pages, image_paths):
+                page.get_pixmap.assert_called_once_with(dpi=150, alpha=False)
+                page.get_pixmap.return_value.save.assert_called_once_with(image_path)
+
+            assert len(image_paths) == 2
+            assert image_paths[1].endswith("page_0002.png")
+
+    def test_extract_pages_with_pypdfium2_backend(self):
+        """Test that the pypdfium2 backend renders pages in-process and closes them."""
+        pages = [MagicMock() for _ in range(3)]
+        for page in pages:
+            page.render.return_value.to_pil.return_value = Image.new("RGB", (10, 10))
+        mock_doc = MagicMock()
+        mock_doc.__len__.return_value = 3
+        mock_doc.__getitem__.side_effect = pages.__getitem__
+        mock_pdfium = Mock()
+        mock_pdfium.PdfDocument.return_value = mock_doc
+
+        processor = PDFProcessor(dpi=144, backend="pypdfium2")
+
+        with tempfile.TemporaryDirectory() as tmpdir, patch.dict(
+            "sys.modules", {"pypdfium2": mock_pdfium}
+        ), patch("lawdit.indexer.pdf_processor.pdf2image.convert_from_path") as mock_convert:
+            pdf_path = os.path.join(tmpdir, "test.pdf")
+            output_dir = os.path.join(tmpdir, "output")
+
+            image_paths = processor.extract_pages_as_images(pdf_path, output_dir)
+            pages_bytes = [b for _, b in processor.iter_pages(pdf_path, output_dir)]
+
+            mock_convert.assert_not_called()
+            mock_pdfium.PdfDocument.assert_called_with(pdf_path)
+            for page in pages:
+                page.render.assert_called_with(scale=2.0)
+                assert page.close.call_count == 2
+            assert mock_doc.close.call_count == 2
+            assert len(image_paths) == 3
+            assert all(b.startswith(b"\x89PNG") for b in pages_bytes)
+
+    @patch("lawdit.indexer.pdf_processor.pdf2image.convert_from_path")
+    def test_extract_pages_as_jpeg_with_max_side(self, mock_convert):
+        """Test that JPEG output downscales pages and writes .jpg files."""
+        mock_convert.side_effect = fake_render(2200)
+
+        processor = PDFProcessor(image_format="jpeg", jpeg_quality=80, max_side=1024)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pdf_path = os.path.join(tmpdir, "test.pdf")
+            output_dir = os.path.join(tmpdir, "output")
+
+            image_paths = processor.extract_pages_as_images(pdf_path, output_dir)
+
+            assert image_paths[0].endswith("page_0001.jpg")
+            with Image.open(image_paths[0]) as saved:
+                assert saved.format == "JPEG"
+                assert max(saved.size) == 1024
+
+    def test_init_invalid_image_format(self):
+        """Test that an unknown page image format is rejected."""
+        with pytest.raises(ValueError):
+            PDFProcessor(image_format="gif")
+
+    def test_init_invalid_png_encoder(self):
+        """Test that an unknown PNG encoder is rejected."""
+        with pytest.raises(ValueError):
+            PDFProcessor(png_encoder="libpng")
+
+    @patch("lawdit.indexer.pdf_processor.pdf2image.convert_from_path")
+    def test_extract_pages_with_pyvips_encoder(self, mock_convert):
+        """Test that downscaled PNG pages are encoded by libvips when selected."""
+        mock_convert.side_effect = fake_render(2200)
+        mock_pyvips = Mock()
+        mock_pyvips.Image.new_from_memory.return_value.pngsave_buffer.return_value = b"vips"
+
+        processor = PDFProcessor(max_side=1024, png_encoder="pyvips")
+
+        with tempfile.TemporaryDirectory() as tmpdir, patch.dict(
+            "sys.modules", {"pyvips": mock_pyvips}
+        ):
+            output_dir = os.path.join(tmpdir, "output")
+
+            image_paths = processor.extract_pages_as_images("test.pdf", output_dir)
+
+            assert Path(image_paths[0]).read_bytes() == b"vips"
+            args = mock_pyvips.Image.new_from_memory.call_args[0]
+            assert args[1:] == (1024, 1024, 3, "uchar")
+            assert len(args[0]) == 1024 * 1024 * 3
+            mock_pyvips.Image.new_from_memory.return_value.pngsave_buffer.assert_called_once_with(
+                compression=PNG_COMPRESS_LEVEL
+            )
+
+
+class TestPDFProcessorIterPages:
+    """Tests for iter_pages method."""
+
+    @patch("lawdit.indexer.pdf_processor.pdf2image.convert_from_path")
+    def test_iter_pages_yields_bytes_matching_saved_files(self, mock_convert):
+        """Test that each page is written to disk and yielded as the same bytes."""
+        mock_convert.side_effect = fake_render(20, 21)
+
+        processor = PDFProcessor()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_dir = os.path.join(tmpdir, "pages")
+            pages = list(processor.iter_pages(os.path.join(tmpdir, "test.pdf"), output_dir))
+
+            assert [os.path.basename(path) for path, _ in pages] == [
+                "page_0001.png",
+                "page_0002.png",
+            ]
+            for path, image_bytes in pages:
+                assert image_bytes.startswith(b"\x89PNG")
+                assert Path(path).read_bytes() == image_bytes
+
+            # Every page is also pre-encoded into the base64 blob
+            blob = (Path(output_dir) / PAGES_B64_BLOB).read_bytes()
+            offsets = json.loads((Path(output_dir) / PAGES_B64_INDEX).read_text())
+            for page_num, (_, image_bytes) in enumerate(pages, start=1):
+                offset, length = offsets[str(page_num)]
+                assert blob[offset : offset + length] == base64.b64encode(image_bytes)
+
+    @patch("lawdit.indexer.pdf_processor.pdf2image.convert_from_path")
+    def test_iter_pages_replaces_blob_without_truncating(self, mock_convert):
+        """Test that re-indexing leaves a mapping of the previous blob readable."""
+        renders = iter([fake_render(20, 21), fake_render(30)])
+        mock_convert.side_effect = lambda *args, **kwargs: next(renders)(*args, **kwargs)
+
+        processor = PDFProcessor()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pdf_path = os.path.join(tmpdir, "test.pdf")
+            blob_path = Path(tmpdir) / PAGES_B64_BLOB
+            list(processor.iter_pages(pdf_path, tmpdir))
+            old_blob = blob_path.read_bytes()
+
+            with (
+                open(blob_path, "rb") as f,
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+            ):
+                pages = list(processor.iter_pages(pdf_path, tmpdir))
+
+                assert mapped[:] == old_blob
+
+            assert blob_path.read_bytes() == base64.b64encode(pages[0][1])
+            assert json.loads((Path(tmpdir) / PAGES_B64_INDEX).read_text()) == {
+                "1": [0, len(blob_path.read_bytes())]
+            }
+            assert sorted(os.listdir(tmpdir)) == [
+                "page_0001.png",
+                "page_0002.png",
+                PAGES_B64_BLOB,
+                PAGES_B64_INDEX,
+            ]
+
+    @patch("lawdit.indexer.pdf_processor.pdf2image.convert_from_path")
+    def test_iter_pages_propagates_errors(self, mock_convert):
+        """Test that rendering errors reach the caller instead of ending the iteration."""
+        mock_convert.side_effect = Exception("PDF conversion failed")
+
+        processor = PDFProcessor()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with pytest.raises(Exception, match="PDF conversion failed"):
+                list(processor.iter_pages(os.path.join(tmpdir, "test.pdf"), tmpdir))
+
+    def test_iter_pages_renders_ranges_in_worker_pool(self):
+        """Test that render workers split the PDF into ranges and keep page order."""
+
+        def render(pdf_path, dpi, fmt, output_folder, paths_only, first_page, last_page):
+            sizes = range(first_page, last_page + 1)
+            return fake_render(*sizes)(pdf_path, dpi, fmt, output_folder, paths_only)
+
+        processor = PDFProcessor(render_workers=2)
+        pool_contexts = []
+
+        def thread_pool(max_workers, mp_context):
+            pool_contexts.append(mp_context.get_start_method())
+            return ThreadPoolExecutor(max_workers)
+
+        with tempfile.TemporaryDirectory() as tmpdir, patch(
+            "lawdit.indexer.pdf_processor.ProcessPoolExecutor", thread_pool
+        ), patch(
+            "lawdit.indexer.pdf_processor.pdf2image.pdfinfo_from_path",
+            return_value={"Pages": 6},
+        ), patch(
+            "lawdit.indexer.pdf_processor.pdf2image.convert_from_path", side_effect=render
+        ) as mock_convert:
+            pages = list(processor.iter_pages(os.path.join(tmpdir, "test.pdf"), tmpdir))
+            processor.close()
+
+        ranges = sorted(
+            (c.kwargs["first_page"], c.kwargs["last_page"]) for c in mock_convert.call_args_list
+        )
+        assert ranges == [(1, 4), (5, 6)]
+        sizes = [Image.open(io.BytesIO(image_bytes)).size[0] for _, image_bytes in pages]
+        assert sizes == [1, 2, 3, 4, 5, 6]
+        assert pool_contexts == ["spawn"]
+        assert processor._render_pool is None
+
 
 class TestPDFProcessorImageToBase64:
     """Tests for image_to_base64 method."""
@@ -255,7 +502,7 @@ class TestPDFProcessorImageToBase64:
             base64_string = processor.image_to_base64(tmpfile_path)
 
             # Empty file should produce empty base64 or handle gracefully
-            assert isinstance(base64_string, str)
+            assert base64_string == ""
 
         finally:
             os.unlink(tmpfile_path)
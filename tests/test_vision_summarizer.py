@@ -7,6 +7,8 @@ import os
 import tempfile
 from unittest.mock import MagicMock, Mock, patch
 
+import httpx
+import openai
 import pytest
 from PIL import Image
 
@@ -25,7 +27,7 @@ class TestVisionSummarizerInitialization:
         summarizer = VisionSummarizer(api_key="test-api-key-123")
 
         # Verify OpenAI client was initialized with the key
-        mock_openai.assert_called_once_with(api_key="test-api-key-123")
+        mock_openai.assert_called_once_with(api_key="test-api-key-123", max_retries=0)
 
         assert summarizer.client == mock_client
         assert summarizer.model == "gpt-5-nano"
@@ -40,7 +42,7 @@ class TestVisionSummarizerInitialization:
         summarizer = VisionSummarizer()
 
         # Verify OpenAI client was initialized with env key
-        mock_openai.assert_called_once_with(api_key="env-api-key")
+        mock_openai.assert_called_once_with(api_key="env-api-key", max_retries=0)
 
     @patch("lawdit.indexer.vision_summarizer.OpenAI")
     def test_init_without_api_key(self, mock_openai):
@@ -52,9 +54,28 @@ class TestVisionSummarizerInitialization:
             summarizer = VisionSummarizer()
 
             # Should pass None when no key is provided
-            mock_openai.assert_called_once_with(api_key=None)
+            mock_openai.assert_called_once_with(api_key=None, max_retries=0)
 
 
+    @patch("lawdit.indexer.vision_summarizer.DefaultHttpxClient")
+    @patch("lawdit.indexer.vision_summarizer.OpenAI")
+    def test_init_with_http2(self, mock_openai, mock_http_client):
+        """Test that http2=True gives the OpenAI client an HTTP/2 connection pool."""
+        VisionSummarizer(api_key="test-key", http2=True)
+
+        mock_http_client.assert_called_once_with(http2=True)
+        mock_openai.assert_called_once_with(
+            api_key="test-key", max_retries=0, http_client=mock_http_client.return_value
+        )
+
+    @patch("lawdit.indexer.vision_summarizer.OpenAI")
+    def test_context_manager_closes_client(self, mock_openai):
+        """Test that leaving the context closes the HTTP connection pool."""
+        with VisionSummarizer(api_key="test-key") as summarizer:
+            assert summarizer.client is mock_openai.return_value
+
+        mock_openai.return_value.close.assert_called_once()
+
 class TestVisionSummarizerSummarizePageImage:
     """Tests for summarize_page_image method."""
 
@@ -206,6 +227,215 @@ class TestVisionSummarizerSummarizePageImage:
         assert "Error processing page 1" in summary
 
 
+    @patch("lawdit.indexer.vision_summarizer.OpenAI")
+    def test_summarize_page_image_jpeg_media_type(self, mock_openai):
+        """Test that JPEG page images are sent with an image/jpeg data URL."""
+        mock_client = Mock()
+        mock_openai.return_value = mock_client
+
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.content = "Summary"
+        mock_client.chat.completions.create.return_value = mock_response
+
+        summarizer = VisionSummarizer(api_key="test-key")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            image_path = os.path.join(tmpdir, "page_0001.jpg")
+            Image.new("RGB", (10, 10), color="white").save(image_path, "JPEG")
+
+            summarizer.summarize_page_image(image_path, page_number=1)
+
+            messages = mock_client.chat.completions.create.call_args[1]["messages"]
+            url = messages[0]["content"][1]["image_url"]["url"]
+            assert url.startswith("data:image/jpeg;base64,")
+
+    @patch("lawdit.indexer.vision_summarizer.OpenAI")
+    def test_summarize_page_image_from_bytes(self, mock_openai):
+        """Test that in-memory image bytes are sent without touching the filesystem."""
+        mock_client = Mock()
+        mock_openai.return_value = mock_client
+
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.content = "Summary"
+        mock_client.chat.completions.create.return_value = mock_response
+
+        summarizer = VisionSummarizer(api_key="test-key")
+        image_bytes = b"\x89PNG\r\n\x1a\nfake-png-data"
+
+        with patch("builtins.open") as mock_file:
+            summary = summarizer.summarize_page_image(image_bytes, page_number=3)
+            mock_file.assert_not_called()
+
+        assert summary == "Summary"
+        messages = mock_client.chat.completions.create.call_args[1]["messages"]
+        url = messages[0]["content"][1]["image_url"]["url"]
+        assert url == "data:image/png;base64," + base64.b64encode(image_bytes).decode()
+
+class TestVisionSummarizerSummarizePageBatch:
+    """Tests for summarize_page_batch method."""
+
+    def _make_pages(self, tmpdir, count):
+        paths = []
+        for i in range(count):
+            path = os.path.join(tmpdir, f"page_{i + 1:04d}.png")
+            Image.new("RGB", (10, 10), color=(i, i, i)).save(path, "PNG")
+            paths.append(path)
+        return paths
+
+    @patch("lawdit.indexer.vision_summarizer.OpenAI")
+    def test_summarize_page_batch_single_request(self, mock_openai):
+        """Test that a batch of pages is summarized with one API call."""
+        mock_client = Mock()
+        mock_openai.return_value = mock_client
+
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.content = (
+            '{"pages": [{"n": 6, "summary": "Six"}, {"n": 5, "summary": "Five"},'
+            ' {"n": 7, "summary": "Seven"}]}'
+        )
+        mock_client.chat.completions.create.return_value = mock_response
+
+        summarizer = VisionSummarizer(api_key="test-key")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = self._make_pages(tmpdir, 3)
+            summaries = summarizer.summarize_page_batch(paths, start_page_num=5)
+
+        assert summaries == ["Five", "Six", "Seven"]
+        assert mock_client.chat.completions.create.call_count == 1
+
+        call_kwargs = mock_client.chat.completions.create.call_args[1]
+        assert call_kwargs["response_format"] == {"type": "json_object"}
+        content = call_kwargs["messages"][0]["content"]
+        assert "pages 5, 6, 7" in content[0]["text"]
+        assert sum(part["type"] == "image_url" for part in content) == 3
+
+    @patch("lawdit.indexer.vision_summarizer.OpenAI")
+    def test_summarize_page_batch_falls_back_per_page(self, mock_openai):
+        """Test that pages missing from the batch response are summarized individually."""
+        mock_client = Mock()
+        mock_openai.return_value = mock_client
+
+        batch_response = Mock()
+        batch_response.choices = [Mock()]
+        batch_response.choices[0].message.content = '{"pages": [{"n": 1, "summary": "One"}]}'
+        single_response = Mock()
+        single_response.choices = [Mock()]
+        single_response.choices[0].message.content = "Two"
+        mock_client.chat.completions.create.side_effect = [batch_response, single_response]
+
+        summarizer = VisionSummarizer(api_key="test-key")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = self._make_pages(tmpdir, 2)
+            summaries = summarizer.summarize_page_batch(paths, start_page_num=1)
+
+        assert summaries == ["One", "Two"]
+        assert mock_client.chat.completions.create.call_count == 2
+
+
+class TestVisionSummarizerRetries:
+    """Tests for retrying transient API errors."""
+
+    @staticmethod
+    def _rate_limit_error(retry_after=None):
+        headers = {"retry-after": retry_after} if retry_after else {}
+        response = httpx.Response(
+            429, headers=headers, request=httpx.Request("POST", "https://api.openai.com")
+        )
+        return openai.RateLimitError("Rate limited", response=response, body=None)
+
+    @patch("lawdit.indexer.vision_summarizer.time.sleep")
+    @patch("lawdit.indexer.vision_summarizer.OpenAI")
+    def test_retries_rate_limit_with_retry_after(self, mock_openai, mock_sleep):
+        """Test that a 429 is retried after the server-provided delay."""
+        mock_client = Mock()
+        mock_openai.return_value = mock_client
+
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.content = "Summary"
+        mock_client.chat.completions.create.side_effect = [
+            self._rate_limit_error(retry_after="2"),
+            mock_response,
+        ]
+
+        summarizer = VisionSummarizer(api_key="test-key")
+        summary = summarizer.summarize_page_image(b"\x89PNG fake", page_number=1)
+
+        assert summary == "Summary"
+        assert mock_client.chat.completions.create.call_count == 2
+        mock_sleep.assert_called_once_with(2.0)
+
+    @patch("lawdit.indexer.vision_summarizer.time.sleep")
+    @patch("lawdit.indexer.vision_summarizer.OpenAI")
+    def test_gives_up_after_max_retries(self, mock_openai, mock_sleep):
+        """Test that persistent transient errors end in the usual error summary."""
+        mock_client = Mock()
+        mock_openai.return_value = mock_client
+        mock_client.chat.completions.create.side_effect = self._rate_limit_error()
+
+        summarizer = VisionSummarizer(api_key="test-key")
+        summarizer.max_retries = 2
+        summary = summarizer.summarize_page_image(b"\x89PNG fake", page_number=4)
+
+        assert "Error processing page 4" in summary
+        assert mock_client.chat.completions.create.call_count == 3
+        assert mock_sleep.call_count == 2
+        for call in mock_sleep.call_args_list:
+            assert 0 <= call[0][0] <= 30
+
+class TestVisionSummarizerCache:
+    """Tests for the content-hash page summary cache."""
+
+    @patch("lawdit.indexer.vision_summarizer.OpenAI")
+    def test_cache_hit_skips_api_call(self, mock_openai):
+        """Test that an identical page image is only sent to the API once."""
+        mock_client = Mock()
+        mock_openai.return_value = mock_client
+
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.content = "Cached summary"
+        mock_client.chat.completions.create.return_value = mock_response
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            summarizer = VisionSummarizer(api_key="test-key", cache_dir=tmpdir)
+
+            image_path = os.path.join(tmpdir, "page.png")
+            Image.new("RGB", (10, 10), color="white").save(image_path, "PNG")
+
+            first = summarizer.summarize_page_image(image_path, page_number=1)
+            second = summarizer.summarize_page_image(image_path, page_number=1)
+
+            assert first == second == "Cached summary"
+            assert mock_client.chat.completions.create.call_count == 1
+
+            # A different page number is a different prompt, so it is not a hit
+            summarizer.summarize_page_image(image_path, page_number=2)
+            assert mock_client.chat.completions.create.call_count == 2
+
+    @patch("lawdit.indexer.vision_summarizer.OpenAI")
+    def test_errors_are_not_cached(self, mock_openai):
+        """Test that failed API calls are retried on the next run."""
+        mock_client = Mock()
+        mock_openai.return_value = mock_client
+        mock_client.chat.completions.create.side_effect = Exception("API Error")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            summarizer = VisionSummarizer(api_key="test-key", cache_dir=tmpdir)
+
+            image_path = os.path.join(tmpdir, "page.png")
+            Image.new("RGB", (10, 10), color="white").save(image_path, "PNG")
+
+            summarizer.summarize_page_image(image_path, page_number=1)
+            summarizer.summarize_page_image(image_path, page_number=1)
+
+            assert mock_client.chat.completions.create.call_count == 2
+
 class TestVisionSummarizerSummarizeDocumentFromPages:
     """Tests for summarize_document_from_pages method."""
 